@@ -0,0 +1,76 @@
+import argparse
+import json
+import sys
+from core.analyzer import BACKENDS
+from core.batch import BatchStats, iter_pdf_paths, run_batch
+from core.limits import add_limit_arguments, limits_from_args
+from core.metrics import to_prometheus
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Scan many PDFs with a worker pool and write one JSONL result line per document"
+    )
+    parser.add_argument("inputs", nargs="+", help="PDF files, directories (scanned recursively) or glob patterns")
+    parser.add_argument("-o", "--output", help="JSONL output file (default: stdout)")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: CPU count)")
+    parser.add_argument("--timeout", type=float, default=None, help="per-document timeout in seconds")
+    parser.add_argument("--backend", choices=sorted(BACKENDS), default="pdfminer",
+                        help="character extraction backend (default: pdfminer)")
+    parser.add_argument("--cache", metavar="DIR", default=None,
+                        help="result cache directory shared by all workers (default: no cache)")
+    parser.add_argument("--font-cache", metavar="PATH", default=None,
+                        help="SQLite font-report cache shared by all workers (default: no cache)")
+    parser.add_argument("--triage", type=float, nargs="?", const=70, default=None, metavar="THRESHOLD",
+                        help="early-exit mode: only decide whether the score reaches THRESHOLD (default 70)")
+    parser.add_argument("--sample", type=int, nargs="?", const=50, default=None, metavar="PAGES",
+                        help="analyze first/last pages plus PAGES stratified random pages (default 50), "
+                             "escalating to a full scan when the sample looks suspicious")
+    parser.add_argument("--page-cache", metavar="PATH", default=None,
+                        help="SQLite per-page character cache shared by all workers (default: no cache)")
+    parser.add_argument("--profile", action="store_true",
+                        help="add per-stage timing and memory metrics to each record")
+    parser.add_argument("--prometheus", metavar="PATH", default=None,
+                        help="with --profile, also write every document's stage metrics in Prometheus text format")
+    add_limit_arguments(parser)
+    args = parser.parse_args()
+
+    paths = iter_pdf_paths(args.inputs)
+    if not paths:
+        print("❌ No PDF files found.", file=sys.stderr)
+        exit(1)
+    print(f"📄 Scanning {len(paths)} PDF(s)...", file=sys.stderr)
+
+    out = open(args.output, "w", encoding="utf-8") if args.output else sys.stdout
+    stats = BatchStats()
+    profiled = []
+    try:
+        for record in run_batch(paths, workers=args.workers, timeout=args.timeout,
+                                cache_dir=args.cache, font_cache_path=args.font_cache,
+                                page_cache_path=args.page_cache,
+                                backend=args.backend, triage=args.triage, sample=args.sample,
+                                profile=args.profile or None, limits=limits_from_args(args)):
+            stats.add(record)
+            if "metrics" in record:
+                profiled.append(({"document": record["path"], "backend": args.backend}, record["metrics"]))
+            out.write(json.dumps(record, ensure_ascii=False) + "\n")
+            out.flush()
+            if record["status"] != "ok":
+                print(f"⚠️  {record['status']}: {record['path']} ({record['error']})", file=sys.stderr)
+    finally:
+        if out is not sys.stdout:
+            out.close()
+
+    # ---------------------------
+    # Throughput Summary
+    # ---------------------------
+    totals = stats.as_dict()
+    print("\n===== BATCH SUMMARY =====", file=sys.stderr)
+    print(f"Documents: {totals['documents']}  Failures: {totals['failures']}  Statuses: {totals['statuses']}", file=sys.stderr)
+    if args.cache:
+        print(f"Cache hits: {totals['cache_hits']}", file=sys.stderr)
+    print(f"Characters: {totals['characters']}  Elapsed: {totals['elapsed_s']}s", file=sys.stderr)
+    print(f"Throughput: {totals['docs_per_s']} docs/s, {totals['chars_per_s']} chars/s", file=sys.stderr)
+    if args.prometheus and profiled:
+        with open(args.prometheus, "w", encoding="utf-8") as f:
+            f.write(to_prometheus(profiled))
+        print(f"Prometheus metrics: {args.prometheus}", file=sys.stderr)
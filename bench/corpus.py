@@ -0,0 +1,166 @@
+# bench/corpus.py
+"""
+Deterministic synthetic PDF corpus built from the bundled fonts/ TTFs.
+
+    python -m bench.corpus [out_dir] [--seed N]
+
+Documents vary page count, glyph density (lines per page) and the rate
+of injected zero-width / directional marks; every byte depends only on
+the seed, so the same corpus can be rebuilt on any machine and compared
+across commits. A manifest.json next to the PDFs records each
+document's parameters, injected-mark count and sha256.
+"""
+import argparse
+import glob
+import hashlib
+import itertools
+import json
+import os
+import random
+import tempfile
+from typing import List, Dict, Any, Tuple
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+FONT_DIR = os.path.join(ROOT, "fonts")
+DEFAULT_CORPUS_DIR = os.path.join(tempfile.gettempdir(), "stego-sniffer-corpus")
+
+# Default grid: every combination becomes one document
+PAGE_COUNTS = (1, 8, 32)
+LINES_PER_PAGE = (10, 40)
+INJECTION_RATES = (0.0, 0.002, 0.02)
+
+# Invisible characters to inject, when the font maps them
+INJECTED = (
+    "\u200b",  # zero width space
+    "\u200c",  # zero width non-joiner
+    "\u200d",  # zero width joiner
+    "\u200e",  # left-to-right mark
+    "\u200f",  # right-to-left mark
+    "\u202a",  # left-to-right embedding
+    "\u202b",  # right-to-left embedding
+    "\u202c",  # pop directional formatting
+)
+
+WORDS_PER_LINE = 9
+FONT_SIZE = 11
+
+def bundled_fonts() -> List[str]:
+    """Distinct TTF programs under fonts/ (duplicates by content are dropped)."""
+    seen, fonts = set(), []
+    for path in sorted(glob.glob(os.path.join(FONT_DIR, "**", "*.ttf"), recursive=True)):
+        with open(path, "rb") as f:
+            digest = hashlib.sha256(f.read()).hexdigest()
+        if digest not in seen:
+            seen.add(digest)
+            fonts.append(path)
+    return fonts
+
+def _alphabet(font_path: str) -> Dict[str, List[str]]:
+    """Arabic letters, Latin letters and injectable marks the font can draw."""
+    from fontTools.ttLib import TTFont
+
+    cmap = TTFont(font_path, lazy=True).getBestCmap()
+    return {
+        "arabic": [chr(c) for c in range(0x0621, 0x064B) if c in cmap],
+        "latin": [chr(c) for c in range(0x61, 0x7B) if c in cmap],
+        "marks": [ch for ch in INJECTED if ord(ch) in cmap],
+    }
+
+def _line(rng: random.Random, alphabet: Dict[str, List[str]], rate: float) -> Tuple[str, int]:
+    """One line of mixed-script words with marks injected after ~rate of the glyphs."""
+    out, injected = [], 0
+    for _ in range(WORDS_PER_LINE):
+        script = alphabet["arabic"] if rng.random() < 0.7 or not alphabet["latin"] else alphabet["latin"]
+        for _ in range(rng.randint(2, 7)):
+            out.append(rng.choice(script))
+            if alphabet["marks"] and rng.random() < rate:
+                out.append(rng.choice(alphabet["marks"]))
+                injected += 1
+        out.append(" ")
+    return "".join(out).rstrip(), injected
+
+def build_pdf(path: str, font_path: str, pages: int, lines: int, rate: float, seed: int) -> Dict[str, Any]:
+    """Write one synthetic PDF and return its manifest entry."""
+    import fitz  # PyMuPDF
+
+    rng = random.Random(f"{seed}:{os.path.basename(font_path)}:{pages}:{lines}:{rate}")
+    alphabet = _alphabet(font_path)
+    doc = fitz.open()
+    injected = 0
+    for _ in range(pages):
+        page = doc.new_page()
+        page.insert_font(fontname="F0", fontfile=font_path)
+        step = (page.rect.height - 100) / lines
+        for i in range(lines):
+            text, n = _line(rng, alphabet, rate)
+            injected += n
+            page.insert_text((50, 60 + i * step), text, fontname="F0", fontsize=FONT_SIZE)
+    doc.set_metadata({})
+    doc.save(path, garbage=3, deflate=True, no_new_id=True)
+    doc.close()
+    with open(path, "rb") as f:
+        digest = hashlib.sha256(f.read()).hexdigest()
+    return {
+        "name": os.path.basename(path),
+        "font": os.path.relpath(font_path, ROOT),
+        "pages": pages,
+        "lines_per_page": lines,
+        "injection_rate": rate,
+        "injected": injected,
+        "sha256": digest,
+    }
+
+def generate_corpus(
+    out_dir: str = DEFAULT_CORPUS_DIR,
+    seed: int = 0,
+    page_counts=PAGE_COUNTS,
+    lines_per_page=LINES_PER_PAGE,
+    injection_rates=INJECTION_RATES,
+) -> List[Dict[str, Any]]:
+    """Build the full grid into out_dir (skipping up-to-date files) and write manifest.json."""
+    os.makedirs(out_dir, exist_ok=True)
+    manifest_path = os.path.join(out_dir, "manifest.json")
+    previous = {}
+    if os.path.isfile(manifest_path):
+        with open(manifest_path, encoding="utf-8") as f:
+            previous = {d["name"]: d for d in json.load(f)["documents"]}
+
+    documents = []
+    fonts = bundled_fonts()
+    for font_path, pages, lines, rate in itertools.product(fonts, page_counts, lines_per_page, injection_rates):
+        stem = os.path.splitext(os.path.basename(font_path))[0]
+        name = f"{stem}-p{pages}-l{lines}-r{rate:g}-s{seed}.pdf"
+        path = os.path.join(out_dir, name)
+        entry = previous.get(name)
+        if entry is not None and os.path.isfile(path):
+            with open(path, "rb") as f:
+                if hashlib.sha256(f.read()).hexdigest() == entry["sha256"]:
+                    documents.append(entry)
+                    continue
+        documents.append(build_pdf(path, font_path, pages, lines, rate, seed))
+
+    with open(manifest_path, "w", encoding="utf-8") as f:
+        json.dump({"seed": seed, "documents": documents}, f, indent=2)
+    return documents
+
+def corpus_digest(documents: List[Dict[str, Any]]) -> str:
+    """Identity of a corpus: hash of its documents' hashes."""
+    h = hashlib.sha256()
+    for d in sorted(documents, key=lambda d: d["name"]):
+        h.update(d["sha256"].encode())
+    return h.hexdigest()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("out_dir", nargs="?", default=DEFAULT_CORPUS_DIR)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    documents = generate_corpus(args.out_dir, args.seed)
+    print(json.dumps({
+        "out_dir": args.out_dir,
+        "documents": len(documents),
+        "pages": sum(d["pages"] for d in documents),
+        "injected": sum(d["injected"] for d in documents),
+        "corpus_sha256": corpus_digest(documents),
+    }, indent=2))
@@ -0,0 +1,62 @@
+# bench/font_parse.py
+"""
+Per-font parse time of font_glyph_report() against the previous
+implementation (full TTFont load + getGlyphOrder + glyph-name scans).
+
+    python -m bench.font_parse [font.ttf ...] [--repeat N]
+"""
+import argparse
+import json
+import os
+import statistics
+import time
+from io import BytesIO
+
+from fontTools.ttLib import TTFont
+
+from core.analyzer import font_glyph_report
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_FONT = os.path.join(ROOT, "NotoNastaliqUrdu-Regular.ttf")
+
+def legacy_font_glyph_report(font_bytes: bytes):
+    """The pre-lazy parser: eager TTFont, full glyph order, name-prefix scans."""
+    font_obj = TTFont(BytesIO(font_bytes))
+    glyphs = font_obj.getGlyphOrder()
+    non_arabic = [g for g in glyphs if g.startswith("A") or g.startswith("B")]
+    arabic_like = [g for g in glyphs if "uni06" in g or "uniFB" in g]
+    return {
+        "glyph_count": len(glyphs),
+        "arabic_glyphs": len(arabic_like),
+        "latin_glyphs": len(non_arabic),
+    }
+
+def time_parser(parser, font_bytes: bytes, repeat: int) -> float:
+    """Median wall time of one parse, in milliseconds."""
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        parser(font_bytes)
+        samples.append((time.perf_counter() - started) * 1000)
+    return statistics.median(samples)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("fonts", nargs="*", default=[DEFAULT_FONT])
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    results = []
+    for path in args.fonts:
+        with open(path, "rb") as f:
+            font_bytes = f.read()
+        before = time_parser(legacy_font_glyph_report, font_bytes, args.repeat)
+        after = time_parser(font_glyph_report, font_bytes, args.repeat)
+        results.append({
+            "font": os.path.basename(path),
+            "bytes": len(font_bytes),
+            "before_ms": round(before, 3),
+            "after_ms": round(after, 3),
+            "speedup": round(before / after, 2) if after else None,
+        })
+    print(json.dumps(results, indent=2))
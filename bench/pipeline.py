@@ -0,0 +1,133 @@
+# bench/pipeline.py
+"""
+Per-stage timings of analyze_pdf() over the synthetic corpus, as a JSON
+baseline that can be compared across commits.
+
+    python -m bench.pipeline [--corpus DIR] [--backend B] [--repeat N]
+                             [--output baseline.json]
+                             [--compare baseline.json [--tolerance 0.2]]
+
+Stages: extraction (PdfDocument.chars), summary (quick_summary),
+suspicious (find_suspicious_characters), fonts (inspect_font_glyphs),
+risk (calculate_risk_score), revisions, and total (a fresh end-to-end
+analyze_pdf). Each is the median of --repeat runs on a fresh document
+session. --compare exits non-zero when a stage's corpus total is more
+than --tolerance slower than in the baseline.
+"""
+import argparse
+import json
+import platform
+import statistics
+import sys
+import time
+from typing import Dict, Any, List
+
+from bench.corpus import DEFAULT_CORPUS_DIR, corpus_digest, generate_corpus
+
+STAGES = ("extraction", "summary", "suspicious", "fonts", "risk", "revisions", "total")
+
+def time_document(path: str, backend: str, repeat: int) -> Dict[str, Any]:
+    """Median milliseconds per stage for one document."""
+    from core.analyzer import (
+        analyze_pdf, calculate_risk_score, find_suspicious_characters,
+        inspect_font_glyphs, quick_summary, revision_report,
+    )
+    from core.document import PdfDocument
+
+    samples: Dict[str, List[float]] = {stage: [] for stage in STAGES}
+    for _ in range(repeat):
+        with PdfDocument(path) as doc:
+            clock = time.perf_counter()
+
+            def lap(stage):
+                nonlocal clock
+                now = time.perf_counter()
+                samples[stage].append((now - clock) * 1000)
+                clock = now
+
+            table = doc.chars(backend)
+            lap("extraction")
+            summary = quick_summary(table)
+            lap("summary")
+            suspicious = find_suspicious_characters(table)
+            lap("suspicious")
+            fonts_report = inspect_font_glyphs(doc)
+            lap("fonts")
+            calculate_risk_score(table, suspicious, summary, fonts_report)
+            lap("risk")
+            revision_report(doc, suspicious)
+            lap("revisions")
+
+        started = time.perf_counter()
+        analyze_pdf(path, backend=backend)
+        samples["total"].append((time.perf_counter() - started) * 1000)
+
+    return {
+        "chars": len(table),
+        "suspicious": len(suspicious),
+        "stages_ms": {stage: round(statistics.median(v), 3) for stage, v in samples.items()},
+    }
+
+def run(corpus_dir: str, backend: str, repeat: int) -> Dict[str, Any]:
+    from core.analyzer import ANALYZER_VERSION
+
+    documents = generate_corpus(corpus_dir)
+    results = []
+    for d in documents:
+        timing = time_document(f"{corpus_dir}/{d['name']}", backend, repeat)
+        results.append({"name": d["name"], "pages": d["pages"], "injected": d["injected"], **timing})
+
+    totals = {stage: round(sum(r["stages_ms"][stage] for r in results), 3) for stage in STAGES}
+    chars = sum(r["chars"] for r in results)
+    return {
+        "analyzer_version": ANALYZER_VERSION,
+        "backend": backend,
+        "repeat": repeat,
+        "python": platform.python_version(),
+        "machine": f"{platform.system()} {platform.machine()}",
+        "corpus_sha256": corpus_digest(documents),
+        "totals_ms": totals,
+        "chars_per_s": round(chars / (totals["total"] / 1000), 1) if totals["total"] else 0.0,
+        "documents": results,
+    }
+
+def compare(current: Dict[str, Any], baseline: Dict[str, Any], tolerance: float) -> List[str]:
+    """Stages whose corpus total regressed by more than tolerance (as messages)."""
+    regressions = []
+    if current["corpus_sha256"] != baseline["corpus_sha256"]:
+        print("⚠️  corpus differs from the baseline's; timings are not comparable", file=sys.stderr)
+    for stage in STAGES:
+        before = baseline["totals_ms"].get(stage)
+        after = current["totals_ms"][stage]
+        if not before:
+            continue
+        ratio = after / before
+        print(f"  {stage:<11} {before:>10.1f} ms -> {after:>10.1f} ms  ({ratio:.2f}x)", file=sys.stderr)
+        if ratio > 1 + tolerance:
+            regressions.append(f"{stage} is {ratio:.2f}x the baseline")
+    return regressions
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--corpus", default=DEFAULT_CORPUS_DIR, help="corpus directory (built if missing)")
+    parser.add_argument("--backend", default="pdfminer")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--output", metavar="PATH", default=None, help="write the baseline JSON here")
+    parser.add_argument("--compare", metavar="PATH", default=None, help="baseline JSON to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.2,
+                        help="allowed slowdown per stage before --compare fails (default: 0.2)")
+    args = parser.parse_args()
+
+    report = run(args.corpus, args.backend, args.repeat)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+    print(json.dumps({k: v for k, v in report.items() if k != "documents"}, indent=2))
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)
+        regressions = compare(report, baseline, args.tolerance)
+        for regression in regressions:
+            print(f"❌ {regression}", file=sys.stderr)
+        sys.exit(1 if regressions else 0)
@@ -0,0 +1,83 @@
+# bench/startup.py
+"""
+Start-up cost of the analyzer CLI, measured with `python -X importtime`.
+
+    python -m bench.startup [pdf] [--repeat N] [--check]
+
+Reports the cumulative import time of core.analyzer, which heavy
+dependencies importing it pulls in, and the wall time of
+`python -m core.analyzer --summary-only` against the full analysis.
+--check exits non-zero when `import core.analyzer` loads a heavy
+dependency or --summary-only loads fontTools, so an eager import that
+creeps back in fails CI.
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_PDF = os.path.join(ROOT, "test.pdf")
+
+# Top-level packages that must only load in the stages that use them
+HEAVY = ("pdfminer", "fontTools", "fitz", "pymupdf", "matplotlib", "jinja2", "streamlit", "pandas")
+
+def import_profile(args) -> dict:
+    """{module: cumulative µs} from `python -X importtime <args>`."""
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", *args],
+        cwd=ROOT, capture_output=True, text=True,
+    )
+    modules = {}
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _self, cumulative, name = line[len("import time:"):].split("|")
+        modules[name.strip()] = int(cumulative)
+    return modules
+
+def heavy_modules(modules: dict) -> list:
+    return sorted({name.split(".")[0] for name in modules} & set(HEAVY))
+
+def wall_ms(args, repeat: int) -> float:
+    """Median wall time of a fresh interpreter running args, in milliseconds."""
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        subprocess.run([sys.executable, *args], cwd=ROOT, capture_output=True, check=True)
+        samples.append((time.perf_counter() - started) * 1000)
+    return statistics.median(samples)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("pdf", nargs="?", default=DEFAULT_PDF)
+    parser.add_argument("--backend", default="pdfminer")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--check", action="store_true",
+                        help="fail if heavy dependencies are imported eagerly")
+    args = parser.parse_args()
+
+    imported = import_profile(["-c", "import core.analyzer"])
+    summary_cmd = ["-m", "core.analyzer", args.pdf, "--backend", args.backend, "--summary-only"]
+    summary_imported = import_profile(summary_cmd)
+    report = {
+        "import_core_analyzer_ms": round(imported.get("core.analyzer", 0) / 1000, 1),
+        "import_heavy": heavy_modules(imported),
+        "summary_only_heavy": heavy_modules(summary_imported),
+        "summary_only_ms": round(wall_ms(summary_cmd, args.repeat), 1),
+        "full_ms": round(wall_ms(summary_cmd[:-1], args.repeat), 1),
+    }
+    print(json.dumps(report, indent=2))
+
+    if args.check:
+        failures = []
+        if report["import_heavy"]:
+            failures.append(f"`import core.analyzer` loads {', '.join(report['import_heavy'])}")
+        if "fontTools" in report["summary_only_heavy"]:
+            failures.append("--summary-only loads fontTools")
+        for failure in failures:
+            print(f"❌ {failure}", file=sys.stderr)
+        sys.exit(1 if failures else 0)
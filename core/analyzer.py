@@ -1,19 +1,31 @@
 # core/analyzer.py
-from pdfminer.high_level import extract_pages
-from pdfminer.layout import LTTextContainer, LTChar
-import unicodedata
-from typing import List, Dict, Any
+import re
+from collections import Counter
+from typing import List, Dict, Any, Iterator, Optional, Union
 
-def _unicode_name(ch: str) -> str:
-    """Return a safe Unicode name (empty string if undefined)."""
-    return unicodedata.name(ch, "")
+from core.chartable import CharTable, codepoint_name
+from core.document import PdfDocument
+from core.limits import check_document, check_fonts
+from core.metrics import NULL_PROFILER, resolve_profiler
+from core.unicode_flags import (
+    ARABIC, LATIN, RTL_MARK, SUSPICIOUS, ZERO_WIDTH,
+    code_flags, flag_indices, flags_for,
+)
+
+# Bump whenever extraction or scoring output changes (invalidates result caches)
+ANALYZER_VERSION = "8"
+
+# Detectors accept the columnar table or legacy per-character dicts
+Records = Union[CharTable, List[Dict[str, Any]]]
+
+def _pdfminer_pages(pdf_file, pages: Optional[range] = None) -> Iterator[CharTable]:
+    """Walk pdfminer's LTTextContainer/LTChar layout tree, one table per page."""
+    from pdfminer.high_level import extract_pages
+    from pdfminer.layout import LTTextContainer, LTChar
+
+    if isinstance(pdf_file, PdfDocument):
+        pdf_file = pdf_file.pdfminer_source()
 
-def iter_pdf_chars(pdf_file) -> List[Dict[str, Any]]:
-    """
-    Returns list of per-character records:
-      page, char, codepoint, name, fontname, size, x0,y0,x1,y1
-    pdf_file: path or file-like (BytesIO)
-    """
     # Reset file pointer if file-like
     if not isinstance(pdf_file, (str, bytes)):
         try:
@@ -21,12 +33,15 @@ def iter_pdf_chars(pdf_file) -> List[Dict[str, Any]]:
         except Exception:
             pass
 
-    pages = extract_pages(pdf_file)
-    records: List[Dict[str, Any]] = []
-    page_no = 0
+    if pages is None:
+        layouts = extract_pages(pdf_file)
+        page_numbers = iter(range(1, 1 << 31))
+    else:
+        layouts = extract_pages(pdf_file, page_numbers=pages)
+        page_numbers = (i + 1 for i in pages)
 
-    for layout in pages:
-        page_no += 1
+    for page_no, layout in zip(page_numbers, layouts):
+        table = CharTable()
         for element in layout:
             if isinstance(element, LTTextContainer):
                 for text_line in element:
@@ -44,176 +59,462 @@ def iter_pdf_chars(pdf_file) -> List[Dict[str, Any]]:
                             ch = obj.get_text()
                             # handle multi-char ligatures safely
                             for single in ch:
-                                rec = {
-                                    "page": page_no,
-                                    "char": single,
-                                    "codepoint": f"U+{ord(single):04X}",
-                                    "name": _unicode_name(single),
-                                    "fontname": getattr(obj, "fontname", ""),
-                                    "size": float(getattr(obj, "size", 0.0)),
-                                    "x0": float(obj.x0),
-                                    "y0": float(obj.y0),
-                                    "x1": float(obj.x1),
-                                    "y1": float(obj.y1),
-                                }
-                                records.append(rec)
-    return records
-
-def quick_summary(records: List[Dict[str, Any]]) -> Dict[str, Any]:
-    """Generate a compact summary for quick inspection."""
-    total = len(records)
-    zero_width = [r for r in records if "ZERO WIDTH" in r["name"]]
-    rtl_marks = [r for r in records if "RIGHT-TO-LEFT" in r["name"]]
+                                table.append(
+                                    page_no, single,
+                                    getattr(obj, "fontname", ""),
+                                    getattr(obj, "size", 0.0),
+                                    obj.x0, obj.y0, obj.x1, obj.y1,
+                                )
+        yield table
+
+def _rawdict_chars(fitz, page, flags: int) -> List[tuple]:
+    """
+    (char, fontname, size, bbox) for every char of page.get_text("rawdict").
+    Subset prefixes are switched on for this call only: the setting is
+    process-wide in PyMuPDF, so the caller's value is restored.
+    """
+    previous = fitz.TOOLS.set_subset_fontnames()
+    fitz.TOOLS.set_subset_fontnames(True)
+    try:
+        raw = page.get_text("rawdict", flags=flags, clip=fitz.INFINITE_RECT())
+    finally:
+        fitz.TOOLS.set_subset_fontnames(previous)
+    return [
+        (c["c"], span["font"], span["size"], c["bbox"])
+        for block in raw["blocks"]
+        for line in block.get("lines", [])
+        for span in line["spans"]
+        for c in span["chars"]
+    ]
+
+_BF_SECTION = re.compile(rb"begin(bfchar|bfrange)(.*?)end\1", re.S)
+_HEX = re.compile(rb"<([0-9A-Fa-f]*)>|\[|\]")
+
+def _fffd_codes(fitz_doc, page) -> set:
+    """
+    Character codes that a ToUnicode CMap of one of the page's fonts
+    maps to U+FFFD, i.e. glyphs whose text really is U+FFFD.
+    """
+    codes = set()
+    for font in page.get_fonts(full=True):
+        kind, ref = fitz_doc.xref_get_key(font[0], "ToUnicode")
+        if kind != "xref":
+            continue
+        cmap = fitz_doc.xref_stream(int(ref.split()[0])) or b""
+        for section, body in _BF_SECTION.findall(cmap):
+            tokens = [m.group(1) if m.group(1) is not None else m.group(0) for m in _HEX.finditer(body)]
+            if section == b"bfchar":
+                for src, dst in zip(tokens[0::2], tokens[1::2]):
+                    if dst.upper() == b"FFFD":
+                        codes.add(int(src, 16))
+                continue
+            i = 0
+            while i + 2 < len(tokens):
+                lo, hi = int(tokens[i], 16), int(tokens[i + 1], 16)
+                if tokens[i + 2] == b"[":
+                    end = tokens.index(b"]", i + 3)
+                    for offset, dst in enumerate(tokens[i + 3:end]):
+                        if dst.upper() == b"FFFD":
+                            codes.add(lo + offset)
+                    i = end + 1
+                    continue
+                dst = tokens[i + 2]
+                if len(dst) == 4 and int(dst, 16) <= 0xFFFD <= int(dst, 16) + hi - lo:
+                    codes.add(lo + 0xFFFD - int(dst, 16))
+                i += 3
+    return codes
+
+def _pymupdf_pages(pdf_file, pages: Optional[range] = None) -> Iterator[CharTable]:
+    """
+    Read per-char output of PyMuPDF's page.get_text("rawdict"), one table per page.
+    Coordinates are flipped to pdfminer's bottom-left origin, subset
+    prefixes are kept in font names, and text outside the mediabox is not
+    clipped, so records line up with the pdfminer backend.
+    """
+    import fitz  # PyMuPDF
 
-    mixed_scripts_hint = (
-        any((0x0600 <= ord(r["char"]) <= 0x06FF) for r in records)
-        and any(("LATIN" in r["name"]) for r in records)
-    )
+    doc = PdfDocument.open(pdf_file)
+    owned = doc is not pdf_file
+    # Ligatures are expanded (no TEXT_PRESERVE_LIGATURES), like pdfminer does
+    flags = fitz.TEXT_PRESERVE_WHITESPACE
 
-    fonts = {}
-    for r in records:
-        fonts[r["fontname"]] = fonts.get(r["fontname"], 0) + 1
+    try:
+        if pages is None:
+            pages = range(doc.fitz.page_count)
+        for index in pages:
+            if index >= doc.fitz.page_count:
+                break
+            page_no = index + 1
+            page = doc.fitz[index]
+            table = CharTable()
+            height = page.rect.height
+            chars = _rawdict_chars(fitz, page, flags)
+            texts = [c[0] for c in chars]
+            if "\ufffd" in texts:
+                # MuPDF reports glyphs without a Unicode mapping as U+FFFD
+                # where pdfminer yields U+0000, but also glyphs a ToUnicode
+                # CMap really maps to U+FFFD. When a font on the page has
+                # such a mapping, re-read the page with character codes for
+                # unknown glyphs and keep U+FFFD for the mapped codes.
+                real = _fffd_codes(doc.fitz, page)
+                codes = {}
+                if real:
+                    cids = _rawdict_chars(fitz, page, flags | fitz.TEXT_CID_FOR_UNKNOWN_UNICODE)
+                    codes = {tuple(bbox): ord(c[0]) for c, _, _, bbox in cids if c}
+                texts = [
+                    "\x00" if text == "\ufffd" and codes.get(tuple(bbox)) not in real else text
+                    for text, (_, _, _, bbox) in zip(texts, chars)
+                ]
+            for text, (_, fontname, size, (x0, top, x1, bottom)) in zip(texts, chars):
+                for single in text:
+                    table.append(
+                        page_no, single, fontname, size,
+                        x0, height - bottom, x1, height - top,
+                    )
+            yield table
+    finally:
+        if owned:
+            doc.close()
+
+# Character extraction backends selectable via iter_pdf_chars / analyze_pdf.
+# Each one is a generator yielding a CharTable per page.
+BACKENDS = {
+    "pdfminer": _pdfminer_pages,
+    "pymupdf": _pymupdf_pages,
+}
+
+def iter_pdf_pages(pdf_file, backend: str = "pdfminer", pages: Optional[range] = None) -> Iterator[CharTable]:
+    """
+    Lazily extract characters one page at a time (one CharTable per page,
+    empty for pages without text). Only the current page is held in memory.
+    pdf_file: path, file-like (BytesIO) or PdfDocument session
+    backend: "pdfminer" (layout analysis, default) or "pymupdf" (faster)
+    pages: optional range of 0-based page indices (default: all pages)
+    """
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown extraction backend: {backend!r} (choose from {', '.join(BACKENDS)})")
+    return BACKENDS[backend](pdf_file, pages)
+
+def extract_char_table(pdf_file, backend: str = "pdfminer", pages: Optional[range] = None) -> CharTable:
+    """Extract every character of the document (or a page range) into a single CharTable."""
+    table = CharTable()
+    for page_table in iter_pdf_pages(pdf_file, backend, pages):
+        table.extend(page_table)
+    return table
+
+def iter_pdf_chars(pdf_file, backend: str = "pdfminer", pages=None) -> Iterator[Dict[str, Any]]:
+    """
+    Yields per-character records page by page:
+      page, char, codepoint, name, fontname, size, x0,y0,x1,y1
+    Wrap in list() to materialise the whole document.
+    pages: optional sorted 0-based page indices, e.g. a
+      core.sampling.sample_page_indices() sample
+    """
+    for page_table in iter_pdf_pages(pdf_file, backend, pages):
+        yield from page_table
 
+def _summary_dict(total, zero_width, rtl_marks, font_counts, has_arabic, has_latin) -> Dict[str, Any]:
     return {
         "total_chars": total,
-        "zero_width_count": len(zero_width),
-        "rtl_marks_count": len(rtl_marks),
-        "fonts_used_top": sorted(fonts.items(), key=lambda x: -x[1])[:8],
-        "mixed_scripts_hint": mixed_scripts_hint,
+        "zero_width_count": zero_width,
+        "rtl_marks_count": rtl_marks,
+        "fonts_used_top": sorted(font_counts.items(), key=lambda x: -x[1])[:8],
+        "mixed_scripts_hint": has_arabic and has_latin,
     }
 
-def find_suspicious_characters(records: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
-    """Return list of suspicious or invisible characters with details."""
+def _summary_from_counts(total: int, code_counts: Dict[int, int], font_counts: Dict[str, int]) -> Dict[str, Any]:
+    """Build the quick_summary dict from codepoint and font histograms."""
+    # One flag lookup per distinct codepoint, not per glyph
+    flags = {code: code_flags(code) for code in code_counts}
+    return _summary_dict(
+        total,
+        sum(n for code, n in code_counts.items() if flags[code] & ZERO_WIDTH),
+        sum(n for code, n in code_counts.items() if flags[code] & RTL_MARK),
+        font_counts,
+        any(f & ARABIC for f in flags.values()),
+        any(f & LATIN for f in flags.values()),
+    )
+
+def quick_summary(records: Records) -> Dict[str, Any]:
+    """Generate a compact summary for quick inspection."""
+    return table_stats(records)["summary"]
+
+def _suspicious_from_flags(table: CharTable, flags: bytes) -> List[Dict[str, Any]]:
+    # Known zero-width / directional marks, bidi embeddings/overrides and
+    # general format (invisible) characters: see unicode_flags.SUSPICIOUS
     suspicious = []
-    for r in records:
-        ch = r["char"]
-        name = r["name"]
-        code = ord(ch)
-        cat = unicodedata.category(ch)
-
-        # Known zero-width / directional marks and format chars
-        if (
-            "ZERO WIDTH" in name
-            or "RIGHT-TO-LEFT" in name
-            or "LEFT-TO-RIGHT" in name
-            or (0x202A <= code <= 0x202E)  # bidi embeddings/overrides
-            or (cat == "Cf")               # general format (invisible) characters
-        ):
-            suspicious.append({
-                "page": r["page"],
-                "char": ch,
-                "codepoint": r["codepoint"],
-                "name": name,
-                "fontname": r["fontname"],
-                "position": (r["x0"], r["y0"])
-            })
+    for i in flag_indices(flags, SUSPICIOUS):
+        code = table.code[i]
+        suspicious.append({
+            "page": table.page[i],
+            "char": chr(code),
+            "codepoint": f"U+{code:04X}",
+            "name": codepoint_name(code),
+            "fontname": table.fonts[table.font[i]],
+            "position": (table.x0[i], table.y0[i])
+        })
     return suspicious
 
+def find_suspicious_characters(records: Records) -> List[Dict[str, Any]]:
+    """Return list of suspicious or invisible characters with details."""
+    return table_stats(records)["suspicious"]
+
+# -------------------------------------------------------------
+# Fused single-pass kernel
+# -------------------------------------------------------------
+def table_stats(records: Records) -> Dict[str, Any]:
+    """
+    Everything the character detectors need from one traversal:
+      summary (quick_summary), suspicious (find_suspicious_characters),
+      font_characters (summarize_font_characters), total_chars and
+      suspicious_count (calculate_risk_score inputs).
+    The glyphs are walked once, counting (font id, codepoint) pairs at C
+    speed; flags, font histograms and per-font character counts are then
+    derived per distinct pair. A second scan for hit positions only runs
+    when a suspicious codepoint is present.
+    """
+    table = CharTable.from_records(records)
+    pairs = Counter(zip(table.font, table.code))
+
+    font_counts: Dict[str, int] = {}
+    font_characters: Dict[str, Dict[str, int]] = {}
+    zero_width = rtl_marks = 0
+    present = 0
+    for (fid, code), n in pairs.items():
+        flags = code_flags(code)
+        present |= flags
+        if flags & ZERO_WIDTH:
+            zero_width += n
+        if flags & RTL_MARK:
+            rtl_marks += n
+        font = table.fonts[fid]
+        font_counts[font] = font_counts.get(font, 0) + n
+        chars = font_characters.get(font)
+        if chars is None:
+            chars = font_characters[font] = {}
+        chars[chr(code)] = n
+
+    suspicious = []
+    if present & SUSPICIOUS:
+        suspicious = _suspicious_from_flags(table, flags_for(table.code))
+
+    return {
+        "summary": _summary_dict(
+            len(table), zero_width, rtl_marks, font_counts,
+            bool(present & ARABIC), bool(present & LATIN),
+        ),
+        "suspicious": suspicious,
+        "font_characters": font_characters,
+        "total_chars": len(table),
+        "suspicious_count": len(suspicious),
+    }
+
 # -------------------------------------------------------------
 # Font-Glyph inspection using fontTools + PyMuPDF
 # -------------------------------------------------------------
-from fontTools.ttLib import TTFont
 from io import BytesIO
+import struct
+
+def _font_error_report(error) -> Dict[str, Any]:
+    return {
+        "glyph_count": None,
+        "arabic_glyphs": 0,
+        "latin_glyphs": 0,
+        "flag": f"error: {error}",
+    }
+
+# Unicode blocks used to classify a font's cmap coverage
+_ARABIC_RANGES = (
+    (0x0600, 0x06FF),  # Arabic
+    (0x0750, 0x077F),  # Arabic Supplement
+    (0x08A0, 0x08FF),  # Arabic Extended-A
+    (0xFB50, 0xFDFF),  # Arabic Presentation Forms-A
+    (0xFE70, 0xFEFF),  # Arabic Presentation Forms-B
+)
+_LATIN_RANGES = (
+    (0x0041, 0x005A),  # A-Z
+    (0x0061, 0x007A),  # a-z
+    (0x00C0, 0x024F),  # Latin-1 letters, Latin Extended-A/B
+    (0x1E00, 0x1EFF),  # Latin Extended Additional
+)
+
+def _cmap_subtable(cmap: bytes):
+    """Pick the best Unicode subtable from a raw cmap: (format, offset) or None."""
+    n_tables = struct.unpack_from(">H", cmap, 2)[0]
+    found = {}
+    for i in range(n_tables):
+        platform, encoding, offset = struct.unpack_from(">HHI", cmap, 4 + i * 8)
+        fmt = struct.unpack_from(">H", cmap, offset)[0]
+        found[(platform, encoding, fmt)] = offset
+    # Same preference order as fontTools' getBestCmap (full repertoire first)
+    for key in ((3, 10, 12), (0, 6, 12), (0, 4, 12), (3, 1, 4), (0, 3, 4), (0, 2, 4), (0, 1, 4), (0, 0, 4)):
+        if key in found:
+            return key[2], found[key]
+    return None
+
+def _cmap_glyph_ids(cmap: bytes, ranges) -> set:
+    """
+    Glyph ids mapped from codepoints inside `ranges`, decoded straight from
+    the raw cmap bytes (formats 4 and 12) without building glyph names.
+    """
+    gids = set()
+    best = _cmap_subtable(cmap)
+    if best is None:
+        return gids
+    fmt, offset = best
+
+    if fmt == 12:
+        n_groups = struct.unpack_from(">I", cmap, offset + 12)[0]
+        for i in range(n_groups):
+            start, end, start_gid = struct.unpack_from(">III", cmap, offset + 16 + i * 12)
+            for lo, hi in ranges:
+                for code in range(max(start, lo), min(end, hi) + 1):
+                    gids.add(start_gid + code - start)
+    else:
+        seg_count = struct.unpack_from(">H", cmap, offset + 6)[0] // 2
+        ends_at = offset + 14
+        starts_at = ends_at + seg_count * 2 + 2
+        deltas_at = starts_at + seg_count * 2
+        range_offsets_at = deltas_at + seg_count * 2
+        ends = struct.unpack_from(f">{seg_count}H", cmap, ends_at)
+        starts = struct.unpack_from(f">{seg_count}H", cmap, starts_at)
+        deltas = struct.unpack_from(f">{seg_count}H", cmap, deltas_at)
+        range_offsets = struct.unpack_from(f">{seg_count}H", cmap, range_offsets_at)
+        for seg in range(seg_count):
+            start, end, delta, range_offset = starts[seg], ends[seg], deltas[seg], range_offsets[seg]
+            for lo, hi in ranges:
+                for code in range(max(start, lo), min(end, hi) + 1):
+                    if range_offset == 0:
+                        gid = (code + delta) & 0xFFFF
+                    else:
+                        at = range_offsets_at + seg * 2 + range_offset + (code - start) * 2
+                        gid = struct.unpack_from(">H", cmap, at)[0]
+                        if gid:
+                            gid = (gid + delta) & 0xFFFF
+                    gids.add(gid)
+    gids.discard(0)  # .notdef
+    return gids
+
+def font_glyph_report(font_bytes: bytes) -> Dict[str, Any]:
+    """
+    Parse one embedded font program and classify its glyph table.
+    The font is opened lazily and only maxp (glyph count) and the raw cmap
+    are read; Arabic vs Latin coverage is the number of distinct glyph ids
+    mapped from each script's Unicode blocks (0 for fonts without a
+    Unicode cmap, e.g. symbol-encoded subsets).
+    Depends only on the font bytes, so reports can be cached by content hash.
+    """
+    from fontTools.ttLib import TTFont
+
+    try:
+        font_obj = TTFont(BytesIO(font_bytes), lazy=True)
+        glyph_count = font_obj["maxp"].numGlyphs
+
+        arabic_glyphs = latin_glyphs = 0
+        if "cmap" in font_obj.reader:
+            cmap = font_obj.reader["cmap"]
+            arabic_like = _cmap_glyph_ids(cmap, _ARABIC_RANGES)
+            latin_like = _cmap_glyph_ids(cmap, _LATIN_RANGES) - arabic_like
+
+            # Count specific glyph types
+            arabic_glyphs = len(arabic_like)
+            latin_glyphs = len(latin_like)
+
+        if glyph_count < 50:
+            flag = "very small glyph set"
+        elif latin_glyphs > arabic_glyphs:
+            flag = "latin-dominant glyph table"
+        else:
+            flag = ""
+
+        return {
+            "glyph_count": glyph_count,
+            "arabic_glyphs": arabic_glyphs,
+            "latin_glyphs": latin_glyphs,
+            "flag": flag,
+        }
+    except Exception as e:
+        return _font_error_report(e)
 
-def inspect_font_glyphs(pdf_path_or_file) -> List[Dict[str, Any]]:
+def inspect_font_glyphs(pdf_path_or_file, font_cache=None) -> List[Dict[str, Any]]:
     """
     Extract embedded fonts from the PDF, parse glyph order via fontTools,
     and flag any fonts whose glyph tables look abnormal.
+    One report per distinct font program (see PdfDocument.fonts).
+    font_cache: optional core.font_cache.FontReportCache; each unique font
+      program is then parsed once per corpus instead of once per PDF
     """
-    import fitz  # PyMuPDF
     font_reports = []
 
-    if isinstance(pdf_path_or_file, (str, bytes)):
-        doc = fitz.open(pdf_path_or_file)
-    else:
-        data = pdf_path_or_file.read()
-        pdf_path_or_file.seek(0)
-        doc = fitz.open(stream=data, filetype="pdf")
-
-    seen_fonts = set()
-    for page in doc:
-        for f in page.get_fonts(full=True):
-            font_name = f[3]
-            if font_name in seen_fonts:
-                continue
-            seen_fonts.add(font_name)
-
-            try:
-                # Use font xref (f[0]) for extraction
-                fontfile = doc.extract_font(f[0])
-                font_bytes = fontfile["file"] if isinstance(fontfile, dict) and "file" in fontfile else None
-                if not font_bytes:
-                    raise Exception("No font bytes found")
-                font_obj = TTFont(BytesIO(font_bytes))
-                glyphs = font_obj.getGlyphOrder()
-                glyph_count = len(glyphs)
-
-                # Heuristic checks
-                non_arabic = [g for g in glyphs if g.startswith("A") or g.startswith("B")]
-                arabic_like = [g for g in glyphs if "uni06" in g or "uniFB" in g]
-
-                # Count specific glyph types
-                arabic_glyphs = len(arabic_like)
-                latin_glyphs = len(non_arabic)
-
-                if glyph_count < 50:
-                    flag = "very small glyph set"
-                elif len(non_arabic) > len(arabic_like):
-                    flag = "latin-dominant glyph table"
-                else:
-                    flag = ""
-
-                font_reports.append({
-                    "font_name": font_name,
-                    "glyph_count": glyph_count,
-                    "arabic_glyphs": arabic_glyphs,
-                    "latin_glyphs": latin_glyphs,
-                    "flag": flag,
-                })
-            except Exception as e:
-                font_reports.append({
-                    "font_name": font_name,
-                    "glyph_count": None,
-                    "arabic_glyphs": 0,
-                    "latin_glyphs": 0,
-                    "flag": f"error: {e}",
-                })
-    doc.close()
+    doc = PdfDocument.open(pdf_path_or_file)
+    owned = doc is not pdf_path_or_file
+
+    for font in doc.fonts():
+        font_name = font["name"]
+        font_bytes = font["content"]
+
+        if not font_bytes:
+            report = _font_error_report("No font bytes found")
+        elif font_cache is not None:
+            key = f"{ANALYZER_VERSION}:{font['sha256']}"
+            report = font_cache.get(key)
+            if report is None:
+                report = font_glyph_report(font_bytes)
+                font_cache.put(key, report)
+        else:
+            report = font_glyph_report(font_bytes)
+
+        font_reports.append({"font_name": font_name, **report})
+    if owned:
+        doc.close()
     return font_reports
 
 # -------------------------------------------------------------
 # Font–Character Usage Summary
 # -------------------------------------------------------------
-def summarize_font_characters(records: List[Dict[str, Any]]) -> Dict[str, Dict[str, int]]:
+def summarize_font_characters(records: Records) -> Dict[str, Dict[str, int]]:
     """Returns {fontname: {char: count}} mapping."""
-    font_char_counts = {}
-    for r in records:
-        font = r["fontname"]
-        char = r["char"]
-        if font not in font_char_counts:
-            font_char_counts[font] = {}
-        font_char_counts[font][char] = font_char_counts[font].get(char, 0) + 1
-    return font_char_counts
+    return table_stats(records)["font_characters"]
 
 # -------------------------------------------------------------
 # Risk Scoring Algorithm
 # -------------------------------------------------------------
 def calculate_risk_score(
-    records: List[Dict[str, Any]], 
+    records: Records, 
     suspicious: List[Dict[str, Any]], 
     summary: Dict[str, Any],
-    fonts_report: List[Dict[str, Any]]
+    fonts_report: List[Dict[str, Any]],
+    sampling: Optional[Dict[str, Any]] = None,
 ) -> Dict[str, Any]:
     """
     Calculate a risk score (0-100) based on multiple factors.
     Returns dict with total_score, breakdown, and risk_level.
+    sampling: the "sampling" dict of a sampled analysis (core.sampling);
+      records then cover only the sampled pages
+    """
+    return _risk_from_counts(len(records), len(suspicious), summary, fonts_report, sampling)
+
+def _risk_from_counts(
+    total_chars: int,
+    susp_count: int,
+    summary: Dict[str, Any],
+    fonts_report: List[Dict[str, Any]],
+    sampling: Optional[Dict[str, Any]] = None,
+) -> Dict[str, Any]:
+    """
+    calculate_risk_score on aggregate counts (used by streaming callers).
+    For a page sample the density factor uses the sample's density as is,
+    while the zero-width and RTL counts are extrapolated to the whole
+    document by pages; those factors are then marked "estimated" and the
+    result carries the sample's coverage and confidence.
     """
     score = 0
     breakdown = {}
+    scale = 1.0
+    if sampling and sampling["pages_analyzed"] < sampling["page_count"]:
+        scale = sampling["page_count"] / max(1, sampling["pages_analyzed"])
     
     # Factor 1: Suspicious character density (0-30 points)
-    total_chars = len(records)
-    susp_count = len(suspicious)
     if total_chars > 0:
         susp_density = (susp_count / total_chars) * 100
         susp_score = min(30, susp_density * 3)  # Max 30 points
@@ -225,7 +526,7 @@ def calculate_risk_score(
         }
     
     # Factor 2: Zero-width character presence (0-20 points)
-    zw_count = summary.get("zero_width_count", 0)
+    zw_count = round(summary.get("zero_width_count", 0) * scale)
     if zw_count > 0:
         zw_score = min(20, zw_count * 5)  # 5 points per ZW char, max 20
         score += zw_score
@@ -233,9 +534,11 @@ def calculate_risk_score(
             "score": round(zw_score, 2),
             "count": zw_count
         }
+        if scale != 1.0:
+            breakdown["zero_width"]["estimated"] = True
     
     # Factor 3: RTL/Bidi marks abuse (0-15 points)
-    rtl_count = summary.get("rtl_marks_count", 0)
+    rtl_count = round(summary.get("rtl_marks_count", 0) * scale)
     if rtl_count > 0:
         rtl_score = min(15, rtl_count * 3)  # 3 points per RTL mark, max 15
         score += rtl_score
@@ -243,6 +546,8 @@ def calculate_risk_score(
             "score": round(rtl_score, 2),
             "count": rtl_count
         }
+        if scale != 1.0:
+            breakdown["rtl_marks"]["estimated"] = True
     
     # Factor 4: Mixed-script anomaly (0-15 points)
     if summary.get("mixed_scripts_hint", False):
@@ -279,40 +584,152 @@ def calculate_risk_score(
     else:
         risk_level = "MINIMAL"
     
-    return {
+    risk = {
         "total_score": total_score,
         "risk_level": risk_level,
         "breakdown": breakdown,
         "max_score": 100
     }
+    if sampling:
+        risk["sampling"] = {"coverage": sampling["coverage"], "confidence": sampling["confidence"]}
+    return risk
 
 # -------------------------------------------------------------
 # Main Analysis Function
 # -------------------------------------------------------------
-def analyze_pdf(pdf_file) -> Dict[str, Any]:
+def analyze_pdf(
+    pdf_file,
+    backend: str = "pdfminer",
+    streaming: bool = False,
+    workers: int = 1,
+    font_cache=None,
+    page_cache=None,
+    triage: Optional[float] = None,
+    profile=None,
+    limits=None,
+    sample: Optional[int] = None,
+) -> Dict[str, Any]:
     """
     Full PDF analysis with risk scoring.
-    Returns dict with summary, suspicious chars, fonts_report, risk_score, and font_characters.
+    Returns dict with summary, suspicious chars, fonts_report, risk_score,
+    font_characters and revisions (per incremental-update breakdown).
+    "characters" is a CharTable; index or iterate it for per-character dicts.
+    pdf_file: path, file-like or an open PdfDocument (shared with the caller's other stages)
+    backend: character extraction backend, see BACKENDS
+    streaming: analyze page by page with bounded memory (see core.streaming);
+      the result then has "characters" set to None
+    workers: processes for page-parallel extraction (see core.parallel);
+      results are identical to the serial path
+    font_cache: optional core.font_cache.FontReportCache shared across documents
+    page_cache: optional core.page_cache.PageCache; only pages whose content
+      streams or resources are not cached yet are extracted
+    triage: risk threshold; stop as soon as the score is proven to reach
+      it or to stay below it and return a partial result (see core.triage)
+    profile: True (or a core.metrics.Profiler to record into) adds a
+      "metrics" key with wall/CPU time, memory and item counts per stage
+    limits: optional core.limits.Limits; page, object, character and font
+      budgets are checked as the analysis goes and raise LimitExceeded
+      (run it through limited_analyze_pdf for timeouts and memory caps)
+    sample: analyze only the first/last pages plus this many stratified
+      random pages, escalating to a full scan when the sample looks
+      suspicious; the result reports coverage and confidence (see
+      core.sampling)
+    """
+    profiler = resolve_profiler(profile)
+    doc = PdfDocument.open(pdf_file)
+    owned = doc is not pdf_file
+    try:
+        if limits:
+            with profiler.stage("open"):
+                check_document(doc, limits)
+
+        if triage is not None:
+            from core.triage import triage_pdf
+            with profiler.stage("triage") as items:
+                check_fonts(doc, limits)
+                result = triage_pdf(doc, triage, backend, font_cache)
+                items["pages"] = result["triage"]["pages_analyzed"]
+                items["chars"] = result["summary"]["total_chars"]
+            if limits:
+                limits.check("max_chars", result["summary"]["total_chars"], "triage")
+        elif sample is not None:
+            from core.sampling import sampled_analyze_pdf
+            with profiler.stage("sampling") as items:
+                check_fonts(doc, limits)
+                result = sampled_analyze_pdf(doc, backend, font_cache, sample_pages=sample)
+                items["pages"] = result["sampling"]["pages_analyzed"]
+                items["chars"] = result["summary"]["total_chars"]
+            if limits:
+                limits.check("max_chars", result["summary"]["total_chars"], "sampling")
+        elif streaming:
+            from core.streaming import StreamingAnalysis
+            stream = StreamingAnalysis(doc, backend, font_cache, page_cache)
+            with profiler.stage("streaming") as items:
+                check_fonts(doc, limits)
+                for _ in stream:
+                    if limits:
+                        limits.check("max_chars", stream.total_chars, "streaming")
+                items["pages"] = stream.pages
+                items["chars"] = stream.total_chars
+            result = stream.result()
+        else:
+            result = _analyze_document(doc, backend, workers, font_cache, page_cache, profiler, limits)
+    finally:
+        if owned:
+            doc.close()
+
+    if profiler.enabled:
+        result["metrics"] = profiler.as_dict()
+    return result
+
+def _analyze_document(
+    doc: PdfDocument, backend: str, workers: int = 1, font_cache=None, page_cache=None,
+    profiler=NULL_PROFILER, limits=None, table: Optional[CharTable] = None, sampling=None,
+) -> Dict[str, Any]:
+    """
+    The analysis behind analyze_pdf() on an open session. table: characters
+    already extracted (e.g. a page sample, described by `sampling`).
     """
-    recs = iter_pdf_chars(pdf_file)
-    summary = quick_summary(recs)
-    suspicious = find_suspicious_characters(recs)
-    summary["suspicious_count"] = len(suspicious)
+    with profiler.stage("extraction") as items:
+        if table is not None:
+            recs = table
+        elif limits and limits.max_chars is not None:
+            recs = _chars_within(doc, backend, page_cache, limits)
+        else:
+            recs = doc.chars(backend, workers, page_cache)
+        items["chars"] = len(recs)
+        items["pages"] = recs.page[-1] if len(recs) else 0
+
+    # Summary, suspicious hits and font-character counts from one pass
+    with profiler.stage("stats") as items:
+        stats = table_stats(recs)
+        items["suspicious"] = stats["suspicious_count"]
+    summary = stats["summary"]
+    suspicious = stats["suspicious"]
+    summary["suspicious_count"] = stats["suspicious_count"]
 
     # Font glyph inspection
-    try:
-        fonts_report = inspect_font_glyphs(pdf_file)
-    except Exception as e:
-        fonts_report = [{"font_name": "N/A", "flag": f"font analysis failed: {e}"}]
+    with profiler.stage("fonts") as items:
+        check_fonts(doc, limits)
+        try:
+            fonts_report = inspect_font_glyphs(doc, font_cache)
+        except Exception as e:
+            fonts_report = [{"font_name": "N/A", "flag": f"font analysis failed: {e}"}]
+        items["fonts"] = len(fonts_report)
 
     summary["fonts_checked"] = len(fonts_report)
     summary["fonts_flags"] = [f["flag"] for f in fonts_report]
 
     # Character–font mapping
-    font_characters = summarize_font_characters(recs)
+    font_characters = stats["font_characters"]
 
     # Calculate risk score
-    risk_score = calculate_risk_score(recs, suspicious, summary, fonts_report)
+    with profiler.stage("risk"):
+        risk_score = _risk_from_counts(stats["total_chars"], stats["suspicious_count"], summary, fonts_report, sampling)
+
+    with profiler.stage("revisions") as items:
+        revisions = revision_report(doc, suspicious)
+        items["revisions"] = revisions.get("count", 0)
 
     return {
         "summary": summary,
@@ -320,17 +737,57 @@ def analyze_pdf(pdf_file) -> Dict[str, Any]:
         "suspicious": suspicious,
         "fonts_report": fonts_report,
         "risk_score": risk_score,
-        "font_characters": font_characters
+        "font_characters": font_characters,
+        "revisions": revisions,
     }
 
-if __name__ == "__main__":
-    import sys, json
-
-    if len(sys.argv) < 2:
-        print("Usage: python -m core.analyzer <path_to_pdf>")
-        sys.exit(1)
+def _chars_within(doc: PdfDocument, backend: str, page_cache, limits) -> CharTable:
+    """Page-by-page extraction that stops as soon as max_chars is exceeded."""
+    if page_cache is not None:
+        from core.page_cache import iter_cached_pages
+        pages = iter_cached_pages(doc, backend, page_cache)
+    else:
+        pages = iter_pdf_pages(doc, backend)
+    table = CharTable()
+    for page_table in pages:
+        table.extend(page_table)
+        limits.check("max_chars", len(table), "extraction")
+    doc.seed_chars(backend, table)
+    return table
+
+def revision_report(doc: PdfDocument, suspicious: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Per-revision breakdown of incremental updates (see core.revisions)."""
+    try:
+        return doc.revisions().report(suspicious)
+    except Exception as e:
+        return {"error": f"revision analysis failed: {e}"}
 
-    result = analyze_pdf(sys.argv[1])
+if __name__ == "__main__":
+    import argparse, json
+
+    parser = argparse.ArgumentParser(prog="python -m core.analyzer")
+    parser.add_argument("pdf", help="path to the PDF to analyze")
+    parser.add_argument("--backend", choices=sorted(BACKENDS), default="pdfminer",
+                        help="character extraction backend (default: pdfminer)")
+    parser.add_argument("--stream", action="store_true",
+                        help="analyze page by page with bounded memory")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="processes for page-parallel extraction (default: 1)")
+    parser.add_argument("--summary-only", action="store_true",
+                        help="print only the character summary (skips font, risk and revision analysis)")
+    args = parser.parse_args()
+
+    if args.summary_only:
+        # Character extraction only: fontTools and the revision scan never load
+        doc = PdfDocument(args.pdf)
+        stats = table_stats(doc.chars(args.backend, args.workers))
+        doc.close()
+        summary = stats["summary"]
+        summary["suspicious_count"] = stats["suspicious_count"]
+        print(json.dumps(summary, ensure_ascii=False, indent=2))
+        raise SystemExit(0)
+
+    result = analyze_pdf(args.pdf, backend=args.backend, streaming=args.stream, workers=args.workers)
     print(json.dumps(result["summary"], ensure_ascii=False, indent=2))
 
     # Print risk score
@@ -0,0 +1,261 @@
+# core/batch.py
+import glob
+import multiprocessing
+import os
+import time
+from multiprocessing.connection import wait
+from typing import List, Dict, Any, Iterable, Iterator, Optional
+
+def iter_pdf_paths(inputs: Iterable[str]) -> List[str]:
+    """
+    Expand files, directories (recursively) and glob patterns into a
+    sorted, de-duplicated list of PDF paths.
+    """
+    found = set()
+    for item in inputs:
+        if os.path.isdir(item):
+            for root, _dirs, files in os.walk(item):
+                for name in files:
+                    if name.lower().endswith(".pdf"):
+                        found.add(os.path.join(root, name))
+        elif os.path.isfile(item):
+            found.add(item)
+        else:
+            for match in glob.glob(item, recursive=True):
+                if os.path.isfile(match):
+                    found.add(match)
+    return sorted(found)
+
+def result_record(path: str, result: Dict[str, Any], seconds: float) -> Dict[str, Any]:
+    """JSON-serialisable line for one analysed document (no per-char records)."""
+    record = {"path": path, "status": "ok", "seconds": round(seconds, 4)}
+    record.update({k: v for k, v in result.items() if k != "characters"})
+    return record
+
+def failure_record(path: str, status: str, error: str, seconds: float) -> Dict[str, Any]:
+    return {"path": path, "status": status, "error": error, "seconds": round(seconds, 4)}
+
+def _worker_main(conn, options: Dict[str, Any]):
+    """Worker process: import the analyzer once, then analyse paths sent over conn."""
+    from core.analyzer import analyze_pdf
+    from core.warm import warm_up
+
+    warm_up(templates=False)
+
+    options = dict(options)
+    cache_dir = options.pop("cache_dir", None)
+    cache = None
+    if cache_dir:
+        from core.cache import ResultCache, cached_analyze_pdf
+        cache = ResultCache(cache_dir)
+
+    font_cache_path = options.pop("font_cache_path", None)
+    if font_cache_path:
+        from core.font_cache import FontReportCache
+        options["font_cache"] = FontReportCache(font_cache_path)
+
+    page_cache_path = options.pop("page_cache_path", None)
+    if page_cache_path:
+        from core.page_cache import PageCache
+        options["page_cache"] = PageCache(page_cache_path)
+
+    from core.limits import LimitExceeded, StageReporter, limit_record
+    from core.metrics import resolve_profiler
+    limits = options.get("limits")
+    if limits:
+        limits.apply_memory_limit()
+
+    # Signal readiness so import time is not charged to the first document
+    conn.send("ready")
+    while True:
+        try:
+            job = conn.recv()
+        except (EOFError, OSError):
+            break
+        if job is None:
+            break
+        # A job is a path, or (name, pdf bytes) for in-memory uploads
+        path, source = job if isinstance(job, tuple) else (job, job)
+        job_options = options
+        if limits and limits.stage_timeout is not None:
+            # Announce stages so the parent can enforce the per-stage timeout
+            job_options = {**options, "profile": StageReporter(conn, resolve_profiler(options.get("profile")))}
+        started = time.perf_counter()
+        try:
+            if cache is not None:
+                hits = cache.hits
+                result = cached_analyze_pdf(source, cache, **job_options)
+                record = result_record(path, result, time.perf_counter() - started)
+                record["cache_hit"] = cache.hits > hits
+            else:
+                result = analyze_pdf(source, **job_options)
+                record = result_record(path, result, time.perf_counter() - started)
+        except LimitExceeded as e:
+            record = limit_record(path, e, time.perf_counter() - started)
+        except MemoryError:
+            error = LimitExceeded("max_memory_mb", limits.max_memory_mb if limits else None)
+            record = limit_record(path, error, time.perf_counter() - started)
+        except Exception as e:
+            record = failure_record(path, "error", f"{type(e).__name__}: {e}", time.perf_counter() - started)
+        conn.send(record)
+
+class _Worker:
+    """One pool process with its own pipe, so a hung or crashed job is attributable."""
+
+    def __init__(self, options: Dict[str, Any]):
+        self.conn, child_conn = multiprocessing.Pipe()
+        self.process = multiprocessing.Process(target=_worker_main, args=(child_conn, options), daemon=True)
+        self.process.start()
+        child_conn.close()
+        self.ready = False
+        self.path: Optional[str] = None
+        self.started = 0.0
+        self.stage = None
+        self.stage_started = 0.0
+
+    def submit(self, path: str, data: Optional[bytes] = None):
+        """
+        Send one job. Raises EOFError or OSError (BrokenPipeError) when the
+        worker has died, during its start-up or since its last job.
+        """
+        if not self.ready:
+            # Blocks only for the worker's one-off import
+            self.conn.recv()
+            self.ready = True
+        self.conn.send(path if data is None else (path, data))
+        self.path = path
+        self.started = self.stage_started = time.monotonic()
+        self.stage = "open"
+
+    def receive(self):
+        """
+        Drain stage announcements and return the job's record, or None if it
+        has not arrived yet. Raises EOFError or OSError when the worker died.
+        """
+        while self.conn.poll():
+            message = self.conn.recv()
+            if isinstance(message, tuple):
+                self.stage, self.stage_started = message[1], time.monotonic()
+            else:
+                return message
+        return None
+
+    def kill(self):
+        self.process.kill()
+        self.process.join()
+        self.conn.close()
+
+    def stop(self):
+        try:
+            self.conn.send(None)
+        except (BrokenPipeError, OSError):
+            pass
+        self.process.join(timeout=5)
+        if self.process.is_alive():
+            self.kill()
+
+def run_batch(
+    paths: List[str],
+    workers: Optional[int] = None,
+    timeout: Optional[float] = None,
+    **options,
+) -> Iterator[Dict[str, Any]]:
+    """
+    Analyse many PDFs on a pool of warm worker processes and yield one
+    record per document as it completes.
+
+    A document that exceeds `timeout` seconds has its worker killed and is
+    reported with status "timeout"; a worker that dies (segfault, OOM kill)
+    is reported as "crash". Either way the worker is replaced and the rest
+    of the batch continues. limits=Limits(...) adds per-document budgets;
+    a document over one, including limits.stage_timeout for any single
+    stage, is reported with status "limit" and the budget that was hit.
+    Extra keyword options go to analyze_pdf;
+    cache_dir="..." serves repeated documents from a shared ResultCache and
+    font_cache_path="..." shares parsed font reports through SQLite and
+    page_cache_path="..." shares extracted pages the same way.
+    """
+    from core.limits import job_deadline, overrun_record
+
+    limits = options.get("limits")
+    workers = max(1, min(workers or os.cpu_count() or 1, len(paths) or 1))
+    pending = list(reversed(paths))
+    pool = [_Worker(options) for _ in range(workers)]
+
+    try:
+        while True:
+            for i, worker in enumerate(pool):
+                if worker.path is None and pending:
+                    path = pending.pop()
+                    try:
+                        worker.submit(path)
+                    except (EOFError, OSError):
+                        worker.kill()
+                        pool[i] = _Worker(options)
+                        yield failure_record(path, "crash", f"worker exited with code {worker.process.exitcode}", 0.0)
+            busy = [w for w in pool if w.path is not None]
+            if not busy:
+                if pending:  # every submit found its worker dead; retry on the replacements
+                    continue
+                break
+
+            wait_for = None
+            deadlines = [job_deadline(w.started, w.stage_started, timeout, limits)[0] for w in busy]
+            if any(d is not None for d in deadlines):
+                wait_for = max(0.0, min(d for d in deadlines if d is not None) - time.monotonic())
+            ready = wait([w.conn for w in busy] + [w.process.sentinel for w in busy], timeout=wait_for)
+
+            for i, worker in enumerate(pool):
+                if worker.path is None:
+                    continue
+                elapsed = time.monotonic() - worker.started
+                try:
+                    record = worker.receive()
+                except (EOFError, OSError):
+                    record = None
+                if record is not None:
+                    worker.path = None
+                    yield record
+                    continue
+                deadline, reason = job_deadline(worker.started, worker.stage_started, timeout, limits)
+                if worker.process.sentinel in ready or not worker.process.is_alive():
+                    worker.kill()
+                    pool[i] = _Worker(options)
+                    yield failure_record(worker.path, "crash", f"worker exited with code {worker.process.exitcode}", elapsed)
+                elif deadline is not None and time.monotonic() >= deadline:
+                    worker.kill()
+                    pool[i] = _Worker(options)
+                    yield overrun_record(worker.path, reason, timeout, limits, worker.stage, elapsed)
+    finally:
+        for worker in pool:
+            worker.stop()
+
+class BatchStats:
+    """Aggregate throughput counters for a batch run."""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.docs = 0
+        self.chars = 0
+        self.cache_hits = 0
+        self.statuses: Dict[str, int] = {}
+
+    def add(self, record: Dict[str, Any]):
+        self.docs += 1
+        self.statuses[record["status"]] = self.statuses.get(record["status"], 0) + 1
+        if record["status"] == "ok":
+            self.chars += record["summary"]["total_chars"]
+            self.cache_hits += bool(record.get("cache_hit"))
+
+    def as_dict(self) -> Dict[str, Any]:
+        elapsed = time.perf_counter() - self.started
+        return {
+            "documents": self.docs,
+            "characters": self.chars,
+            "failures": self.docs - self.statuses.get("ok", 0),
+            "cache_hits": self.cache_hits,
+            "statuses": self.statuses,
+            "elapsed_s": round(elapsed, 3),
+            "docs_per_s": round(self.docs / elapsed, 3) if elapsed else 0.0,
+            "chars_per_s": round(self.chars / elapsed, 1) if elapsed else 0.0,
+        }
@@ -0,0 +1,230 @@
+# core/cache.py
+import hashlib
+import json
+import os
+import stat
+import tempfile
+from typing import Dict, Any, Optional
+
+from core.analyzer import ANALYZER_VERSION, analyze_pdf
+from core.chartable import CharTable
+from core.document import PdfDocument
+from core.metrics import resolve_profiler
+
+DEFAULT_CACHE_DIR = os.environ.get(
+    "STEGO_SNIFFER_CACHE",
+    os.path.join(os.path.expanduser("~"), ".cache", "pdf-stego-sniffer", "results"),
+)
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024
+
+# analyze_pdf options that do not change the result (limits only ever
+# abort a run, and a hit does no work to bound)
+_NEUTRAL_OPTIONS = ("workers", "font_cache", "page_cache", "profile", "limits")
+
+_SUFFIX = ".entry"
+_LEGACY_SUFFIX = ".pkl"  # pickled entries from older versions; never loaded
+
+def _encode(result: Dict[str, Any]) -> bytes:
+    """
+    A result as one JSON line followed by its CharTables' to_bytes()
+    blobs. Tuples and tables are tagged so decoding restores them.
+    """
+    blobs = []
+
+    def tag(value):
+        if isinstance(value, CharTable):
+            blobs.append(value.to_bytes())
+            return {"__chartable__": len(blobs) - 1}
+        if isinstance(value, dict):
+            return {k: tag(v) for k, v in value.items()}
+        if isinstance(value, tuple):
+            return {"__tuple__": [tag(v) for v in value]}
+        if isinstance(value, list):
+            return [tag(v) for v in value]
+        return value
+
+    tagged = tag(result)
+    header = json.dumps({"result": tagged, "blobs": [len(b) for b in blobs]})
+    return b"".join([header.encode(), b"\n"] + blobs)
+
+def _decode(data: bytes) -> Dict[str, Any]:
+    """Inverse of _encode(); ValueError when the entry is malformed."""
+    end = data.index(b"\n")
+    header = json.loads(data[:end])
+    tables, offset = [], end + 1
+    for size in header["blobs"]:
+        tables.append(CharTable.from_bytes(data[offset:offset + size]))
+        offset += size
+    if offset != len(data):
+        raise ValueError("trailing bytes in cache entry")
+
+    def untag(value):
+        if isinstance(value, dict):
+            if value.keys() == {"__chartable__"}:
+                return tables[value["__chartable__"]]
+            if value.keys() == {"__tuple__"}:
+                return tuple(untag(v) for v in value["__tuple__"])
+            return {k: untag(v) for k, v in value.items()}
+        if isinstance(value, list):
+            return [untag(v) for v in value]
+        return value
+
+    return untag(header["result"])
+
+class ResultCache:
+    """
+    On-disk analyze_pdf result cache keyed by the SHA-256 of the PDF bytes,
+    ANALYZER_VERSION and the analysis options.
+
+    Entries are JSON plus raw CharTable columns (see _encode), never
+    pickles: the directory is created private (0700) and one that other
+    users can write to is refused, since a planted entry could report a
+    hostile PDF as clean. A hit refreshes the file's mtime, and once the
+    directory grows past max_bytes the least recently used entries are
+    evicted. Writes are atomic, so several processes can share a directory.
+    """
+
+    def __init__(self, directory: str = DEFAULT_CACHE_DIR, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        os.makedirs(directory, mode=0o700, exist_ok=True)
+        if os.stat(directory).st_mode & (stat.S_IWGRP | stat.S_IWOTH):
+            raise PermissionError(f"result cache directory {directory} is group- or world-writable")
+
+    @staticmethod
+    def key(pdf_sha256: str, **options) -> str:
+        # Options left at None (e.g. triage off) key like omitted ones
+        config = {k: v for k, v in options.items() if k not in _NEUTRAL_OPTIONS and v is not None}
+        payload = json.dumps([pdf_sha256, ANALYZER_VERSION, config], sort_keys=True)
+        return hashlib.sha256(payload.encode()).hexdigest()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, key + _SUFFIX)
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        result = self.peek(key)
+        if result is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return result
+
+    def peek(self, key: str) -> Optional[Dict[str, Any]]:
+        """get() without counting towards the hit/miss statistics."""
+        path = self._path(key)
+        try:
+            with open(path, "rb") as f:
+                result = _decode(f.read())
+            os.utime(path)  # mark as recently used
+        except (OSError, ValueError, KeyError, TypeError, IndexError):
+            return None
+        return result
+
+    def put(self, key: str, result: Dict[str, Any]) -> None:
+        data = _encode(result)
+        fd, tmp = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp, self._path(key))
+        except Exception:
+            if os.path.exists(tmp):
+                os.remove(tmp)
+            raise
+        self.evict()
+
+    def evict(self) -> None:
+        """Delete least recently used entries until the store fits max_bytes."""
+        entries = []
+        total = 0
+        for entry in os.scandir(self.directory):
+            if entry.name.endswith(_LEGACY_SUFFIX):
+                try:
+                    os.remove(entry.path)
+                except FileNotFoundError:
+                    pass
+                continue
+            if not entry.name.endswith(_SUFFIX):
+                continue
+            try:
+                st = entry.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((st.st_mtime, st.st_size, entry.path))
+            total += st.st_size
+        for _mtime, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            total -= size
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+        }
+
+_default_cache: Optional[ResultCache] = None
+
+def default_cache() -> ResultCache:
+    """Process-wide cache in DEFAULT_CACHE_DIR (or $STEGO_SNIFFER_CACHE)."""
+    global _default_cache
+    if _default_cache is None:
+        _default_cache = ResultCache()
+    return _default_cache
+
+def cached_analyze_pdf(pdf_file, cache: Optional[ResultCache] = None, **options) -> Dict[str, Any]:
+    """
+    analyze_pdf() that returns a stored result for byte-identical inputs.
+    A PDF that is an earlier cached document plus incremental updates only
+    has the pages those updates touched re-extracted.
+    """
+    cache = cache or default_cache()
+    profiler = resolve_profiler(options.pop("profile", None))
+    doc = PdfDocument.open(pdf_file)
+    owned = doc is not pdf_file
+    try:
+        with profiler.stage("cache_lookup") as items:
+            key = cache.key(doc.sha256(), **options)
+            result = cache.get(key)
+            items["hits"] = int(result is not None)
+        if result is None:
+            if not options.get("streaming"):
+                _seed_from_prior_revision(doc, cache, **options)
+            result = analyze_pdf(doc, profile=profiler, **options)
+            # Metrics describe this run, not later hits
+            cache.put(key, {k: v for k, v in result.items() if k != "metrics"})
+        elif profiler.enabled:
+            result["metrics"] = profiler.as_dict()
+        return result
+    finally:
+        if owned:
+            doc.close()
+
+def _seed_from_prior_revision(doc: PdfDocument, cache: ResultCache, **options) -> None:
+    """
+    Seed the session's characters from the newest earlier revision of an
+    incrementally updated PDF that is already in the cache. Any failure
+    (an unreadable revision prefix, say) leaves the session unseeded and
+    the analysis runs in full.
+    """
+    backend = options.get("backend", "pdfminer")
+    try:
+        history = doc.revisions()
+        for k in range(len(history) - 2, -1, -1):
+            prior = cache.peek(cache.key(history.sha256(k), **options))
+            if prior is not None and isinstance(prior.get("characters"), CharTable):
+                table = history.char_table(backend, k, prior["characters"])
+                break
+        else:
+            return
+    except Exception:
+        return
+    doc.seed_chars(backend, table)
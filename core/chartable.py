@@ -0,0 +1,166 @@
+# core/chartable.py
+import json
+import sys
+import unicodedata
+from array import array
+from bisect import bisect_left, bisect_right
+from functools import lru_cache
+from typing import List, Dict, Any, Iterator
+
+@lru_cache(maxsize=None)
+def codepoint_name(code: int) -> str:
+    """Unicode name for a codepoint, resolved once per distinct codepoint."""
+    return unicodedata.name(chr(code), "")
+
+class CharTable:
+    """
+    Columnar store of per-character records.
+
+    Each glyph costs a handful of machine words instead of a 10-key dict:
+    page/codepoint/font id are packed unsigned ints, geometry and size are
+    doubles, and font names are interned once in `fonts`. Unicode names
+    and the "U+XXXX" strings are derived on demand.
+
+    Indexing, slicing and iteration yield the legacy dict records
+    (page, char, codepoint, name, fontname, size, x0, y0, x1, y1) so
+    display code can keep treating it as a list of dicts.
+    """
+
+    COLUMNS = ("page", "code", "font", "size", "x0", "y0", "x1", "y1")
+
+    def __init__(self):
+        self.fonts: List[str] = []
+        self._font_ids: Dict[str, int] = {}
+        self.page = array("I")
+        self.code = array("I")
+        self.font = array("I")
+        self.size = array("d")
+        self.x0 = array("d")
+        self.y0 = array("d")
+        self.x1 = array("d")
+        self.y1 = array("d")
+
+    @classmethod
+    def from_records(cls, records) -> "CharTable":
+        """Build a table from dict records; tables are returned unchanged."""
+        if isinstance(records, cls):
+            return records
+        table = cls()
+        for r in records:
+            table.append(
+                r["page"], r["char"], r["fontname"], r["size"],
+                r["x0"], r["y0"], r["x1"], r["y1"],
+            )
+        return table
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "CharTable":
+        """Rebuild a table from to_bytes() output; ValueError when it is malformed."""
+        try:
+            end = data.index(b"\n")
+            header = json.loads(data[:end])
+            fonts, rows = list(header["fonts"]), int(header["rows"])
+        except (ValueError, KeyError, TypeError) as e:
+            raise ValueError(f"not a serialized CharTable: {e}") from None
+        if header.get("byteorder") != sys.byteorder or not all(isinstance(f, str) for f in fonts):
+            raise ValueError("not a serialized CharTable for this platform")
+        table = cls()
+        offset = end + 1
+        for column in cls.COLUMNS:
+            values = getattr(table, column)
+            size = rows * values.itemsize
+            if offset + size > len(data):
+                raise ValueError("truncated CharTable")
+            values.frombytes(data[offset:offset + size])
+            offset += size
+        if offset != len(data) or (rows and max(table.font) >= len(fonts)):
+            raise ValueError("inconsistent CharTable")
+        table.fonts = fonts
+        table._font_ids = {name: i for i, name in enumerate(fonts)}
+        return table
+
+    def to_bytes(self) -> bytes:
+        """
+        Cache serialization: a JSON header line (font names, row count,
+        byte order) followed by the raw bytes of each column in COLUMNS
+        order. Unlike pickle, loading it cannot run code.
+        """
+        header = json.dumps({"fonts": self.fonts, "rows": len(self), "byteorder": sys.byteorder})
+        return b"".join([header.encode(), b"\n"] + [getattr(self, c).tobytes() for c in self.COLUMNS])
+
+    def font_id(self, fontname: str) -> int:
+        """Intern a font name and return its id."""
+        fid = self._font_ids.get(fontname)
+        if fid is None:
+            fid = self._font_ids[fontname] = len(self.fonts)
+            self.fonts.append(fontname)
+        return fid
+
+    def append(self, page: int, char: str, fontname: str, size: float,
+               x0: float, y0: float, x1: float, y1: float) -> None:
+        self.page.append(page)
+        self.code.append(ord(char))
+        self.font.append(self.font_id(fontname))
+        self.size.append(size)
+        self.x0.append(x0)
+        self.y0.append(y0)
+        self.x1.append(x1)
+        self.y1.append(y1)
+
+    def extend(self, other: "CharTable") -> None:
+        """Append all rows of another table, re-mapping its font ids."""
+        remap = array("I", (self.font_id(name) for name in other.fonts))
+        self.page.extend(other.page)
+        self.code.extend(other.code)
+        self.font.extend(remap[f] for f in other.font)
+        self.size.extend(other.size)
+        self.x0.extend(other.x0)
+        self.y0.extend(other.y0)
+        self.x1.extend(other.x1)
+        self.y1.extend(other.y1)
+
+    def page_table(self, page: int) -> "CharTable":
+        """Copy of one page's rows (rows are stored in page order)."""
+        lo = bisect_left(self.page, page)
+        hi = bisect_right(self.page, page, lo)
+        table = CharTable()
+        table.fonts = list(self.fonts)
+        table._font_ids = dict(self._font_ids)
+        for column in self.COLUMNS:
+            setattr(table, column, getattr(self, column)[lo:hi])
+        return table
+
+    # ---------------------------------------------------------
+    # Dict view (Streamlit / HTML / JSON consumers)
+    # ---------------------------------------------------------
+    def record(self, i: int) -> Dict[str, Any]:
+        code = self.code[i]
+        return {
+            "page": self.page[i],
+            "char": chr(code),
+            "codepoint": f"U+{code:04X}",
+            "name": codepoint_name(code),
+            "fontname": self.fonts[self.font[i]],
+            "size": self.size[i],
+            "x0": self.x0[i],
+            "y0": self.y0[i],
+            "x1": self.x1[i],
+            "y1": self.y1[i],
+        }
+
+    def to_records(self) -> List[Dict[str, Any]]:
+        return [self.record(i) for i in range(len(self))]
+
+    def __len__(self) -> int:
+        return len(self.code)
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        for i in range(len(self)):
+            yield self.record(i)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self.record(i) for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        return self.record(index)
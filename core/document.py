@@ -0,0 +1,367 @@
+# core/document.py
+import hashlib
+import io
+import mmap
+import os
+import re
+from io import BytesIO
+from typing import List, Dict, Any, Iterator, Tuple
+
+def _pdf_name(key) -> str:
+    """Value of an xref_get_key() result without the leading '/' of PDF names."""
+    kind, value = key
+    if kind == "null":
+        return ""
+    return value[1:] if kind == "name" else value
+
+# PDF tokens, enough to walk the top level of a dictionary's source
+_TOKEN = re.compile(
+    r"<<|>>|\[|\]|/[^\s/<>\[\]()%{}]*|\d+\s+\d+\s+R\b"
+    r"|\((?:\\.|[^\\)])*\)|<[0-9A-Fa-f\s]*>|[^\s/<>\[\]()%{}]+"
+)
+
+def _dict_keys(source: str) -> List[str]:
+    """Top-level keys of a PDF dictionary's source text (nested values skipped)."""
+    keys = []
+    depth = 0
+    expect_key = True
+    for token in _TOKEN.findall(source):
+        if token in ("<<", "["):
+            depth += 1
+            continue
+        if token in (">>", "]"):
+            depth -= 1
+            if depth == 1:
+                expect_key = True
+            continue
+        if depth != 1:
+            continue
+        if expect_key and token.startswith("/"):
+            keys.append(token[1:])
+            expect_key = False
+        else:
+            expect_key = True
+    return keys
+
+def _map_file(f) -> memoryview:
+    """Read-only memoryview over an mmap of an open file (no copy)."""
+    return memoryview(mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ))
+
+class _BufferReader(io.RawIOBase):
+    """Seekable read-only file over a memoryview, for pdfminer."""
+
+    def __init__(self, view: memoryview):
+        self._view = view
+        self._pos = 0
+
+    def readable(self):
+        return True
+
+    def seekable(self):
+        return True
+
+    def readinto(self, b):
+        n = max(0, min(len(b), len(self._view) - self._pos))
+        b[:n] = self._view[self._pos:self._pos + n]
+        self._pos += n
+        return n
+
+    def seek(self, offset, whence=io.SEEK_SET):
+        if whence == io.SEEK_CUR:
+            offset += self._pos
+        elif whence == io.SEEK_END:
+            offset += len(self._view)
+        self._pos = max(0, offset)
+        return self._pos
+
+
+class PdfDocument:
+    """
+    Shared document session: reads the input once and keeps a single
+    PyMuPDF handle open so every stage (characters, fonts, xref objects)
+    works from the same parsed document.
+    pdf_file: path, bytes, buffer (bytearray / memoryview / mmap), or
+    file-like (BytesIO / Streamlit upload / open file)
+
+    Inputs are never copied: paths and real files are memory-mapped,
+    in-memory file-likes are viewed through getbuffer(), and the
+    resulting memoryview is handed straight to PyMuPDF and pdfminer.
+    """
+
+    def __init__(self, pdf_file):
+        self.path = None
+        self._data = None
+        self._owns_view = False  # _data is a mapping/buffer view we created
+        self._fitz = None
+        self._chars = {}
+        self._fonts = None
+        self._font_locations = None
+        self._revisions = None
+        self._sha256 = None
+
+        if isinstance(pdf_file, (str, os.PathLike)):
+            self.path = os.fspath(pdf_file)
+        elif isinstance(pdf_file, bytes):
+            self._data = pdf_file
+        elif isinstance(pdf_file, (bytearray, memoryview, mmap.mmap)):
+            self._data = memoryview(pdf_file).cast("B")
+        elif hasattr(pdf_file, "getbuffer"):
+            # BytesIO and Streamlit uploads: view the buffer in place
+            self._data = pdf_file.getbuffer()
+            self._owns_view = True
+        else:
+            try:
+                self._data = _map_file(pdf_file)
+                self._owns_view = True
+            except (AttributeError, OSError, ValueError, io.UnsupportedOperation):
+                # Not backed by a mappable file: read it once and rewind
+                try:
+                    pdf_file.seek(0)
+                except Exception:
+                    pass
+                self._data = pdf_file.read()
+                try:
+                    pdf_file.seek(0)
+                except Exception:
+                    pass
+
+    @classmethod
+    def open(cls, pdf_file) -> "PdfDocument":
+        """Return pdf_file unchanged if it is already a session, else open one."""
+        if isinstance(pdf_file, cls):
+            return pdf_file
+        return cls(pdf_file)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        if self._revisions is not None:
+            self._revisions.close()
+            self._revisions = None
+        if self._fitz is not None:
+            self._fitz.close()
+            self._fitz = None
+        if self._owns_view:
+            # Unmap / unpin the caller's buffer; paths remap on next use
+            try:
+                self._data.release()
+            except BufferError:
+                pass  # still exported elsewhere, left to the GC
+            self._data = None
+            self._owns_view = False
+
+    # ---------------------------------------------------------
+    # Raw sources
+    # ---------------------------------------------------------
+    @property
+    def data(self):
+        """
+        Raw PDF bytes as bytes or a read-only memoryview (path inputs are
+        memory-mapped on first access rather than read).
+        """
+        if self._data is None:
+            with open(self.path, "rb") as f:
+                try:
+                    self._data = _map_file(f)
+                    self._owns_view = True
+                except ValueError:  # empty file cannot be mapped
+                    self._data = b""
+        return self._data
+
+    def sha256(self) -> str:
+        """Hex SHA-256 of the PDF bytes (path inputs are hashed in chunks)."""
+        if self._sha256 is None:
+            h = hashlib.sha256()
+            if self._data is not None:
+                h.update(self._data)
+            else:
+                with open(self.path, "rb") as f:
+                    for chunk in iter(lambda: f.read(1 << 20), b""):
+                        h.update(chunk)
+            self._sha256 = h.hexdigest()
+        return self._sha256
+
+    def pdfminer_source(self):
+        """Input suitable for pdfminer's extract_pages."""
+        if self.path is not None:
+            return self.path
+        if isinstance(self._data, bytes):
+            return BytesIO(self._data)
+        return _BufferReader(self._data)
+
+    @property
+    def fitz(self):
+        """Lazily opened PyMuPDF document, shared by all stages."""
+        if self._fitz is None:
+            import fitz  # PyMuPDF
+            if self.path is not None:
+                self._fitz = fitz.open(self.path)
+            else:
+                self._fitz = fitz.open(stream=self._data, filetype="pdf")
+        return self._fitz
+
+    # ---------------------------------------------------------
+    # Stage views
+    # ---------------------------------------------------------
+    def chars(self, backend: str = "pdfminer", workers: int = 1, page_cache=None):
+        """
+        Per-character CharTable (extracted once per backend, then cached).
+        workers > 1 shards extraction across processes (core.parallel);
+        page_cache (core.page_cache.PageCache) extracts only uncached pages.
+        """
+        if backend not in self._chars:
+            if page_cache is not None:
+                from core.page_cache import extract_char_table_cached
+                self._chars[backend] = extract_char_table_cached(self, backend, page_cache)
+            elif workers > 1:
+                from core.parallel import extract_char_table_parallel
+                self._chars[backend] = extract_char_table_parallel(self, backend, workers)
+            else:
+                from core.analyzer import extract_char_table
+                self._chars[backend] = extract_char_table(self, backend)
+        return self._chars[backend]
+
+    def seed_chars(self, backend: str, table) -> None:
+        """Install an already assembled CharTable for backend (see core.revisions)."""
+        self._chars[backend] = table
+
+    def _entries(self, xref: int, prefix: str) -> Iterator[Tuple[str, Tuple[int, str]]]:
+        """
+        (key, location) for each entry of the dictionary at (xref, prefix)
+        whose value is a dictionary. A location is (xref, "") for an
+        indirect object, or (owner xref, "Key/Path/") for an inline one,
+        the key-path form xref_get_key() accepts.
+        """
+        doc = self.fitz
+        source = doc.xref_object(xref, compressed=True) if not prefix else doc.xref_get_key(xref, prefix[:-1])[1]
+        for key in _dict_keys(source):
+            kind, value = doc.xref_get_key(xref, prefix + key)
+            if kind == "xref":
+                yield key, (int(value.split()[0]), "")
+            elif kind == "dict":
+                yield key, (xref, prefix + key + "/")
+
+    def _resources(self, xref: int, prefix: str, key: str = "Resources"):
+        """Location of the dictionary under key at (xref, prefix), or None."""
+        kind, value = self.fitz.xref_get_key(xref, prefix + key)
+        if kind == "xref":
+            return int(value.split()[0]), ""
+        if kind == "dict":
+            return xref, prefix + key + "/"
+        return None
+
+    def font_locations(self) -> List[Tuple[int, str]]:
+        """
+        Every font the pages draw with, in first-use order: the /Font
+        entries of each page's (possibly inherited) /Resources and,
+        recursively, of the Form XObjects they use. Locations as in
+        _entries(): (xref, "") for font objects, (owner xref, key path)
+        for inline font dictionaries. Fonts no page references are not
+        listed, whatever their /Type.
+        """
+        if self._font_locations is None:
+            doc = self.fitz
+            stack = []
+            for index in range(doc.page_count):
+                node, seen_nodes = doc.page_xref(index), set()
+                while node and node not in seen_nodes:
+                    seen_nodes.add(node)
+                    resources = self._resources(node, "")
+                    if resources is not None:
+                        stack.append(resources)
+                        break
+                    kind, value = doc.xref_get_key(node, "Parent")
+                    node = int(value.split()[0]) if kind == "xref" else 0
+            stack.reverse()
+
+            locations, seen = [], set()
+            visited = set()
+            while stack:
+                resources = stack.pop()
+                if resources in visited:
+                    continue
+                visited.add(resources)
+                try:
+                    fonts = self._resources(*resources, key="Font")
+                    for _name, location in self._entries(*fonts) if fonts else ():
+                        if location not in seen:
+                            seen.add(location)
+                            locations.append(location)
+                    xobjects = self._resources(*resources, key="XObject")
+                    forms = []
+                    for _name, (xref, prefix) in self._entries(*xobjects) if xobjects else ():
+                        if not prefix and doc.xref_get_key(xref, "Subtype") == ("name", "/Form"):
+                            inner = self._resources(xref, "")
+                            if inner is not None:
+                                forms.append(inner)
+                    stack.extend(reversed(forms))
+                except Exception:
+                    continue
+            self._font_locations = locations
+        return self._font_locations
+
+    def fonts(self) -> List[Dict[str, Any]]:
+        """
+        Font inventory of the fonts pages reference (font_locations()),
+        built once per document rather than per page:
+          xref (0 for inline font dictionaries), name, type, encoding,
+          content (embedded program bytes or b""), sha256 (of content,
+          None when not embedded)
+        Embedded programs are de-duplicated by content hash, so a subset
+        shared by many xrefs is listed once while distinct subsets with the
+        same base name are listed separately. Non-embedded fonts are
+        de-duplicated by (name, type, encoding).
+        """
+        if self._fonts is None:
+            doc = self.fitz
+            seen = set()
+            fonts = []
+            for xref, prefix in self.font_locations():
+                try:
+                    name = _pdf_name(doc.xref_get_key(xref, prefix + "BaseFont"))
+                    font_type = _pdf_name(doc.xref_get_key(xref, prefix + "Subtype"))
+                    encoding = _pdf_name(doc.xref_get_key(xref, prefix + "Encoding"))
+                except Exception:
+                    continue
+                content = b""
+                if not prefix:
+                    try:
+                        content = doc.extract_font(xref, named=True).get("content") or b""
+                    except Exception:
+                        pass
+                digest = hashlib.sha256(content).hexdigest() if content else None
+
+                identity = digest or (name, font_type, encoding)
+                if identity in seen:
+                    continue
+                seen.add(identity)
+                fonts.append({
+                    "xref": 0 if prefix else xref,
+                    "name": name,
+                    "type": font_type,
+                    "encoding": encoding,
+                    "content": content,
+                    "sha256": digest,
+                })
+            self._fonts = fonts
+        return self._fonts
+
+    def revisions(self):
+        """Incremental-update structure (core.revisions.RevisionHistory), built once."""
+        if self._revisions is None:
+            from core.revisions import RevisionHistory
+            self._revisions = RevisionHistory(self)
+        return self._revisions
+
+    def xref_objects(self) -> Iterator[Tuple[int, str]]:
+        """Yield (xref, object source) for every readable xref."""
+        doc = self.fitz
+        for obj_num in range(1, doc.xref_length()):
+            try:
+                yield obj_num, doc.xref_object(obj_num)
+            except Exception:
+                continue
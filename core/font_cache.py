@@ -0,0 +1,84 @@
+# core/font_cache.py
+import json
+import os
+import sqlite3
+from typing import Dict, Any, Optional
+
+DEFAULT_FONT_CACHE_PATH = os.environ.get(
+    "STEGO_SNIFFER_FONT_CACHE",
+    os.path.join(os.path.expanduser("~"), ".cache", "pdf-stego-sniffer", "fonts.sqlite"),
+)
+
+class FontReportCache:
+    """
+    SQLite-backed store of font_glyph_report() results keyed by a hash of
+    the extracted font program, shared across documents and processes.
+
+    inspect_font_glyphs() builds keys as "<ANALYZER_VERSION>:<sha256>", so a
+    heuristics change never serves stale reports. The database runs in WAL
+    mode so concurrent batch workers can read while one writes.
+    """
+
+    def __init__(self, path: str = DEFAULT_FONT_CACHE_PATH):
+        self.path = path
+        self.hits = 0
+        self.misses = 0
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._conn = sqlite3.connect(path, timeout=30)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS font_reports (key TEXT PRIMARY KEY, report TEXT NOT NULL)"
+        )
+        self._conn.commit()
+        self._memo: Optional[Dict[str, Dict[str, Any]]] = None
+
+    def preload(self, prefix: str = "") -> int:
+        """
+        Load every report whose key starts with `prefix` into memory so
+        later lookups skip SQLite (long-lived workers). Returns the count.
+        """
+        rows = self._conn.execute(
+            "SELECT key, report FROM font_reports WHERE substr(key, 1, ?) = ?", (len(prefix), prefix)
+        ).fetchall()
+        if self._memo is None:
+            self._memo = {}
+        self._memo.update((key, json.loads(report)) for key, report in rows)
+        return len(rows)
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        report = self._memo.get(key) if self._memo is not None else None
+        if report is not None:
+            self.hits += 1
+            return dict(report)
+        row = self._conn.execute("SELECT report FROM font_reports WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return json.loads(row[0])
+
+    def put(self, key: str, report: Dict[str, Any]) -> None:
+        if self._memo is not None:
+            self._memo[key] = dict(report)
+        with self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO font_reports (key, report) VALUES (?, ?)",
+                (key, json.dumps(report)),
+            )
+
+    def close(self):
+        self._conn.close()
+
+    def __len__(self) -> int:
+        return self._conn.execute("SELECT COUNT(*) FROM font_reports").fetchone()[0]
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+            "entries": len(self),
+        }
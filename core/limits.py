@@ -0,0 +1,211 @@
+# core/limits.py
+import time
+from contextlib import contextmanager
+from typing import Dict, Any, Iterator, Optional, Tuple
+
+try:
+    import resource
+except ImportError:  # Windows: no address-space limit
+    resource = None
+
+from core.metrics import NULL_PROFILER
+
+class Limits:
+    """
+    Budgets for analysing an untrusted PDF. None disables a budget.
+
+      max_pages, max_objects: checked when the document is opened
+      max_chars: checked after every extracted page
+      max_font_bytes: largest embedded font program handed to fontTools
+      stage_timeout: wall-clock seconds per analysis stage; only enforced
+        when the work runs in a worker process (limited_analyze_pdf,
+        run_batch, the scan service), which is killed on overrun
+      max_memory_mb: address-space limit applied inside worker processes,
+        so a decompression bomb fails with MemoryError instead of
+        exhausting the host
+    """
+
+    def __init__(
+        self,
+        max_pages: Optional[int] = None,
+        max_chars: Optional[int] = None,
+        max_objects: Optional[int] = None,
+        max_font_bytes: Optional[int] = None,
+        stage_timeout: Optional[float] = None,
+        max_memory_mb: Optional[int] = None,
+    ):
+        self.max_pages = max_pages
+        self.max_chars = max_chars
+        self.max_objects = max_objects
+        self.max_font_bytes = max_font_bytes
+        self.stage_timeout = stage_timeout
+        self.max_memory_mb = max_memory_mb
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {k: v for k, v in vars(self).items() if v is not None}
+
+    def __bool__(self) -> bool:
+        return bool(self.as_dict())
+
+    def __repr__(self) -> str:
+        return "Limits(" + ", ".join(f"{k}={v!r}" for k, v in self.as_dict().items()) + ")"
+
+    def check(self, budget: str, actual, stage: Optional[str] = None) -> None:
+        """Raise LimitExceeded when `actual` is over the named budget."""
+        limit = getattr(self, budget)
+        if limit is not None and actual > limit:
+            raise LimitExceeded(budget, limit, actual, stage)
+
+    def apply_memory_limit(self) -> None:
+        """Cap this process's address space at max_memory_mb (worker processes only)."""
+        if self.max_memory_mb is None or resource is None:
+            return
+        cap = self.max_memory_mb * 1024 * 1024
+        _soft, hard = resource.getrlimit(resource.RLIMIT_AS)
+        if hard != resource.RLIM_INFINITY:
+            cap = min(cap, hard)
+        resource.setrlimit(resource.RLIMIT_AS, (cap, hard))
+
+class LimitExceeded(Exception):
+    """A document went over one of its Limits."""
+
+    def __init__(self, budget: str, limit, actual=None, stage: Optional[str] = None):
+        detail = f"{actual} > {limit}" if actual is not None else f"limit {limit}"
+        super().__init__(f"{budget} exceeded ({detail})" + (f" in stage {stage}" if stage else ""))
+        self.budget = budget
+        self.limit = limit
+        self.actual = actual
+        self.stage = stage
+
+    def record_fields(self) -> Dict[str, Any]:
+        return {"budget": self.budget, "limit": self.limit, "stage": self.stage}
+
+def add_limit_arguments(parser) -> None:
+    """The --max-* / --stage-timeout options shared by the command-line tools."""
+    group = parser.add_argument_group("resource limits (hostile PDFs)")
+    group.add_argument("--max-pages", type=int, default=None, help="refuse documents with more pages")
+    group.add_argument("--max-chars", type=int, default=None, help="stop extraction past this many characters")
+    group.add_argument("--max-objects", type=int, default=None, help="refuse documents with more xref objects")
+    group.add_argument("--max-font-bytes", type=int, default=None,
+                       help="refuse embedded font programs larger than this")
+    group.add_argument("--stage-timeout", type=float, default=None,
+                       help="kill the analysis when one stage runs longer (seconds)")
+    group.add_argument("--max-memory", type=int, default=None, metavar="MB",
+                       help="address-space cap for the analysis process")
+
+def limits_from_args(args) -> Optional[Limits]:
+    limits = Limits(
+        max_pages=args.max_pages,
+        max_chars=args.max_chars,
+        max_objects=args.max_objects,
+        max_font_bytes=args.max_font_bytes,
+        stage_timeout=args.stage_timeout,
+        max_memory_mb=args.max_memory,
+    )
+    return limits if limits else None
+
+def limit_record(path: str, error: LimitExceeded, seconds: float) -> Dict[str, Any]:
+    """run_batch-style record for a document stopped by a budget (status "limit")."""
+    from core.batch import failure_record
+
+    record = failure_record(path, "limit", str(error), seconds)
+    record.update(error.record_fields())
+    return record
+
+def check_document(doc, limits: Optional[Limits]) -> None:
+    """Object and page budgets, from the xref table alone."""
+    if not limits:
+        return
+    fitz_doc = doc.fitz
+    limits.check("max_objects", fitz_doc.xref_length() - 1, "open")
+    limits.check("max_pages", fitz_doc.page_count, "open")
+
+def check_fonts(doc, limits: Optional[Limits]) -> None:
+    if not limits or limits.max_font_bytes is None:
+        return
+    for font in doc.fonts():
+        limits.check("max_font_bytes", len(font["content"]), "fonts")
+
+class StageReporter:
+    """
+    Profiler wrapper used inside worker processes: announces every stage
+    over the worker's pipe as ("stage", name) so the parent can apply
+    stage_timeout, then records into the wrapped profiler as usual.
+    """
+
+    def __init__(self, conn, inner=NULL_PROFILER):
+        self.conn = conn
+        self.inner = inner
+        self.enabled = inner.enabled
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[Dict[str, int]]:
+        self.conn.send(("stage", name))
+        with self.inner.stage(name) as items:
+            yield items
+
+    def as_dict(self) -> Dict[str, Any]:
+        return self.inner.as_dict()
+
+def job_deadline(started: float, stage_started: float, timeout: Optional[float],
+                 limits: Optional[Limits]) -> Tuple[Optional[float], str]:
+    """
+    (monotonic time at which a worker's current job must be killed, and
+    why: "timeout" for the whole-document timeout or "stage_timeout").
+    The deadline is None when neither applies.
+    """
+    deadline, reason = None, "timeout"
+    if timeout is not None:
+        deadline = started + timeout
+    if limits and limits.stage_timeout is not None:
+        stage_end = stage_started + limits.stage_timeout
+        if deadline is None or stage_end < deadline:
+            deadline, reason = stage_end, "stage_timeout"
+    return deadline, reason
+
+def overrun_record(path: str, reason: str, timeout, limits, stage: str, elapsed: float) -> Dict[str, Any]:
+    """Record for a job killed at its job_deadline()."""
+    from core.batch import failure_record
+
+    if reason == "timeout":
+        return failure_record(path, "timeout", f"exceeded {timeout}s", elapsed)
+    return limit_record(path, LimitExceeded("stage_timeout", limits.stage_timeout, stage=stage), elapsed)
+
+def limited_analyze_pdf(pdf_file, limits: Limits, timeout: Optional[float] = None, **options) -> Dict[str, Any]:
+    """
+    analyze_pdf() in a separate worker process under `limits`; returns a
+    run_batch-style record instead of raising. status is "ok", "limit"
+    (with budget, limit and stage), "timeout", "error" or "crash".
+    pdf_file: path or bytes
+    """
+    from core.batch import _Worker, failure_record
+
+    name = pdf_file if isinstance(pdf_file, str) else "<bytes>"
+    worker = _Worker({**options, "limits": limits})
+    try:
+        try:
+            if isinstance(pdf_file, str):
+                worker.submit(pdf_file)
+            else:
+                worker.submit(name, bytes(pdf_file))
+        except (EOFError, OSError):  # died during start-up
+            worker.kill()
+            return failure_record(name, "crash", f"worker exited with code {worker.process.exitcode}", 0.0)
+        while True:
+            deadline, reason = job_deadline(worker.started, worker.stage_started, timeout, limits)
+            wait_for = None if deadline is None else max(0.0, deadline - time.monotonic())
+            if not worker.conn.poll(wait_for):
+                worker.kill()
+                elapsed = time.monotonic() - worker.started
+                return overrun_record(name, reason, timeout, limits, worker.stage, elapsed)
+            try:
+                record = worker.receive()
+            except (EOFError, OSError):
+                worker.kill()
+                elapsed = time.monotonic() - worker.started
+                return failure_record(name, "crash", f"worker exited with code {worker.process.exitcode}", elapsed)
+            if record is not None:
+                worker.path = None
+                return record
+    finally:
+        worker.stop()
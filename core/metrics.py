@@ -0,0 +1,148 @@
+# core/metrics.py
+import sys
+import time
+import tracemalloc
+from contextlib import contextmanager
+from typing import Dict, Any, Iterator, Optional
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+def _peak_rss_kb() -> Optional[int]:
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak // 1024 if sys.platform == "darwin" else peak  # bytes on macOS, KiB elsewhere
+
+class Profiler:
+    """
+    Per-stage wall time, CPU time, memory and item counts for one analysis.
+
+        profiler = Profiler()
+        with profiler.stage("extraction") as items:
+            table = doc.chars()
+            items["chars"] = len(table)
+        metrics = profiler.as_dict()
+
+    py_peak_kb is the tracemalloc peak above the stage's starting
+    allocation, i.e. Python-heap objects such as pdfminer's layout tree but
+    not PyMuPDF's C buffers; rss_peak_kb is the process's peak resident
+    size once the stage finished. tracemalloc slows pure-Python stages
+    noticeably, so pass trace_memory=False when only timings matter.
+    A stage recorded twice accumulates.
+    """
+
+    enabled = True
+
+    def __init__(self, trace_memory: bool = True):
+        self.trace_memory = trace_memory
+        self.stages: Dict[str, Dict[str, Any]] = {}
+        self._started_tracing = False
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[Dict[str, int]]:
+        if self.trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracing = True
+        items: Dict[str, int] = {}
+        base = 0
+        if self.trace_memory:
+            base = tracemalloc.get_traced_memory()[0]
+            tracemalloc.reset_peak()
+        wall, cpu = time.perf_counter(), time.process_time()
+        try:
+            yield items
+        finally:
+            wall, cpu = time.perf_counter() - wall, time.process_time() - cpu
+            py_peak = (tracemalloc.get_traced_memory()[1] - base) // 1024 if self.trace_memory else None
+            self._record(name, wall, cpu, py_peak, items)
+
+    def _record(self, name: str, wall: float, cpu: float, py_peak: Optional[int], items: Dict[str, int]):
+        entry = self.stages.get(name)
+        if entry is None:
+            entry = self.stages[name] = {"wall_s": 0.0, "cpu_s": 0.0, "py_peak_kb": py_peak, "items": {}}
+        entry["wall_s"] += wall
+        entry["cpu_s"] += cpu
+        if py_peak is not None:
+            entry["py_peak_kb"] = max(entry["py_peak_kb"] or 0, py_peak)
+        entry["rss_peak_kb"] = _peak_rss_kb()
+        for key, n in items.items():
+            entry["items"][key] = entry["items"].get(key, 0) + n
+
+    def as_dict(self) -> Dict[str, Any]:
+        """{"stages": {name: {...}}, "total": {...}}; stops tracemalloc if this profiler started it."""
+        if self._started_tracing:
+            tracemalloc.stop()
+            self._started_tracing = False
+        stages = {
+            name: {**s, "wall_s": round(s["wall_s"], 6), "cpu_s": round(s["cpu_s"], 6), "items": dict(s["items"])}
+            for name, s in self.stages.items()
+        }
+        peaks = [s["py_peak_kb"] for s in stages.values() if s["py_peak_kb"] is not None]
+        return {
+            "stages": stages,
+            "total": {
+                "wall_s": round(sum(s["wall_s"] for s in stages.values()), 6),
+                "cpu_s": round(sum(s["cpu_s"] for s in stages.values()), 6),
+                "py_peak_kb": max(peaks) if peaks else None,
+                "rss_peak_kb": _peak_rss_kb(),
+            },
+        }
+
+class _NullProfiler:
+    """Stand-in when profiling is off: stages run unmeasured."""
+
+    enabled = False
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[Dict[str, int]]:
+        yield {}
+
+NULL_PROFILER = _NullProfiler()
+
+def resolve_profiler(profile) -> "Profiler":
+    """analyze_pdf's profile option: True/False/None or a Profiler to record into."""
+    if profile is True:
+        return Profiler()
+    return profile or NULL_PROFILER
+
+# -------------------------------------------------------------
+# Prometheus text exposition
+# -------------------------------------------------------------
+_GAUGES = (
+    ("wall_s", "stage_wall_seconds", "Wall-clock time per analysis stage."),
+    ("cpu_s", "stage_cpu_seconds", "CPU time per analysis stage."),
+    ("py_peak_kb", "stage_python_peak_kilobytes", "tracemalloc peak above the stage's starting allocation."),
+    ("rss_peak_kb", "stage_rss_peak_kilobytes", "Process peak RSS after the stage."),
+)
+
+def _labels(labels: Dict[str, Any]) -> str:
+    def escape(value) -> str:
+        return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+    return "{" + ",".join(f'{k}="{escape(v)}"' for k, v in labels.items()) + "}"
+
+def to_prometheus(runs, prefix: str = "stego_sniffer") -> str:
+    """
+    Prometheus text format for one or more metrics dicts.
+    runs: a metrics dict, or a list of (labels, metrics) pairs, e.g.
+      [({"document": "a.pdf", "backend": "pdfminer"}, result["metrics"]), ...]
+    """
+    if isinstance(runs, dict):
+        runs = [({}, runs)]
+    lines = []
+    for key, name, help_text in _GAUGES:
+        lines.append(f"# HELP {prefix}_{name} {help_text}")
+        lines.append(f"# TYPE {prefix}_{name} gauge")
+        for labels, metrics in runs:
+            for stage, s in metrics["stages"].items():
+                if s.get(key) is not None:
+                    lines.append(f"{prefix}_{name}{_labels({**labels, 'stage': stage})} {s[key]}")
+    lines.append(f"# HELP {prefix}_stage_items Items processed per analysis stage.")
+    lines.append(f"# TYPE {prefix}_stage_items gauge")
+    for labels, metrics in runs:
+        for stage, s in metrics["stages"].items():
+            for item, n in s["items"].items():
+                lines.append(f"{prefix}_stage_items{_labels({**labels, 'stage': stage, 'item': item})} {n}")
+    return "\n".join(lines) + "\n"
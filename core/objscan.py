@@ -0,0 +1,133 @@
+# core/objscan.py
+import mmap
+import re
+from functools import lru_cache
+from typing import List, Dict, Any, Iterable, Tuple
+
+from core.document import PdfDocument
+
+# Names pdfid-style triage treats as indicators of active or hidden content
+DEFAULT_KEYWORDS = (
+    "JBIG2Decode",
+    "JavaScript",
+    "JS",
+    "EmbeddedFile",
+    "Launch",
+    "OpenAction",
+    "AA",
+    "AcroForm",
+    "RichMedia",
+    "XFA",
+)
+
+# A PDF name ends at whitespace, a delimiter or end of input
+_NAME_END = r"(?![^\x00\t\n\f\r ()<>\[\]{}/%])"
+
+_OBJ_HEADER = re.compile(rb"(\d+)\s+\d+\s+obj$")
+
+@lru_cache(maxsize=None)
+def _keyword_pattern(keywords: Tuple[str, ...], binary: bool):
+    """One compiled alternation matching any of the /Name keywords."""
+    # Longest first so /JavaScript is not reported as /JS
+    names = "|".join(re.escape(k) for k in sorted(keywords, key=len, reverse=True))
+    pattern = "/(" + names + ")" + _NAME_END
+    return re.compile(pattern.encode("ascii") if binary else pattern)
+
+def scan_object(source: str, keywords: Iterable[str] = DEFAULT_KEYWORDS) -> Dict[str, Any]:
+    """
+    Byte-level flags for one object's source:
+      non_ascii: any character outside 7-bit ASCII
+      keywords:  indicator names present, in first-seen order
+    """
+    found = _keyword_pattern(tuple(keywords), False).findall(source)
+    return {
+        "non_ascii": not source.isascii(),
+        "keywords": list(dict.fromkeys(found)),
+    }
+
+def flag_suspicious_pdf_objects(pdf_file, keywords: Iterable[str] = DEFAULT_KEYWORDS) -> List[Dict[str, Any]]:
+    """
+    Scan every xref object's source and flag those containing non-ASCII
+    bytes or any of the keyword names. Each object is checked with
+    str.isascii() and a single regex pass, both in C.
+    Returns [{object_number, preview, non_ascii, keywords}, ...].
+    """
+    search = _keyword_pattern(tuple(keywords), False).findall
+    suspicious_objects = []
+    doc = PdfDocument.open(pdf_file)
+    try:
+        for obj_num, obj_str in doc.xref_objects():
+            non_ascii = not obj_str.isascii()
+            found = search(obj_str)
+            if non_ascii or found:
+                suspicious_objects.append({
+                    "object_number": obj_num,
+                    "preview": obj_str[:80],
+                    "non_ascii": non_ascii,
+                    "keywords": list(dict.fromkeys(found)),
+                })
+    finally:
+        if doc is not pdf_file:
+            doc.close()
+    return suspicious_objects
+
+def scan_raw(data, keywords: Iterable[str] = DEFAULT_KEYWORDS) -> List[Dict[str, Any]]:
+    """
+    Keyword hits in raw PDF bytes (bytes, memoryview or mmap), including
+    uncompressed stream data that xref_object() does not show.
+    Returns [{offset, keyword, object_number}, ...]; object_number is the
+    nearest preceding "N G obj" header, or None outside any object.
+    """
+    return [
+        {
+            "offset": m.start(),
+            "keyword": m.group(1).decode("ascii"),
+            "object_number": _enclosing_object(data, m.start()),
+        }
+        for m in _keyword_pattern(tuple(keywords), True).finditer(data)
+    ]
+
+def _rfind(data, sub: bytes, end: int) -> int:
+    """data.rfind(sub, 0, end), also for memoryviews (searched in chunks)."""
+    if not isinstance(data, memoryview):
+        return data.rfind(sub, 0, end)
+    step = 1 << 16
+    while end > 0:
+        start = max(0, end - step)
+        pos = bytes(data[start:end]).rfind(sub)
+        if pos != -1:
+            return start + pos
+        end = start + len(sub) - 1 if start else 0
+    return -1
+
+def _enclosing_object(data, offset: int):
+    """Number of the object whose "N G obj" header precedes offset, if open."""
+    pos = _rfind(data, b"obj", offset)
+    while pos != -1:
+        if bytes(data[max(0, pos - 3):pos]) == b"end":
+            return None
+        header = _OBJ_HEADER.search(bytes(data[max(0, pos - 32):pos + 3]))
+        if header:
+            return int(header.group(1))
+        pos = _rfind(data, b"obj", pos)
+    return None
+
+def scan_file(pdf_file, keywords: Iterable[str] = DEFAULT_KEYWORDS) -> List[Dict[str, Any]]:
+    """
+    scan_raw() over a whole PDF. Path inputs are memory-mapped rather than
+    read, so large files are scanned without copying them into memory.
+    """
+    doc = PdfDocument.open(pdf_file)
+    try:
+        if doc.path is None:
+            return scan_raw(doc.data, keywords)
+        with open(doc.path, "rb") as f:
+            try:
+                mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:  # empty file
+                return []
+            with mm:
+                return scan_raw(mm, keywords)
+    finally:
+        if doc is not pdf_file:
+            doc.close()
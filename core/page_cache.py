@@ -0,0 +1,157 @@
+# core/page_cache.py
+import hashlib
+import os
+import re
+import sqlite3
+from array import array
+from typing import Dict, Any, Iterator, List, Optional
+
+from core.chartable import CharTable
+from core.revisions import object_digest, page_dependencies
+
+DEFAULT_PAGE_CACHE_PATH = os.environ.get(
+    "STEGO_SNIFFER_PAGE_CACHE",
+    os.path.join(os.path.expanduser("~"), ".cache", "pdf-stego-sniffer", "pages.sqlite"),
+)
+
+_PARENT = re.compile(r"/Parent\s+\d+\s+\d+\s+R")
+
+class PageCache:
+    """
+    SQLite-backed store of per-page CharTables keyed by page_key(), i.e. by
+    what the page's text is drawn from rather than by the document, so a
+    re-submitted document with a few edited pages only re-extracts those.
+
+    Same layout as FontReportCache: one WAL-mode database shared by
+    processes. Tables are stored as CharTable.to_bytes() BLOBs (a JSON
+    font list plus the raw column arrays), so reading an entry cannot
+    run code; a row that does not decode counts as a miss.
+    """
+
+    def __init__(self, path: str = DEFAULT_PAGE_CACHE_PATH):
+        self.path = path
+        self.hits = 0
+        self.misses = 0
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._conn = sqlite3.connect(path, timeout=30)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS page_tables (key TEXT PRIMARY KEY, tbl BLOB NOT NULL)"
+        )
+        self._conn.commit()
+
+    def get(self, key: str) -> Optional[CharTable]:
+        row = self._conn.execute("SELECT tbl FROM page_tables WHERE key = ?", (key,)).fetchone()
+        table = None
+        if row is not None:
+            try:
+                table = CharTable.from_bytes(bytes(row[0]))
+            except ValueError:
+                pass
+        if table is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return table
+
+    def put(self, key: str, table: CharTable) -> None:
+        with self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO page_tables (key, tbl) VALUES (?, ?)",
+                (key, table.to_bytes()),
+            )
+
+    def present(self, keys: List[str]) -> set:
+        """Subset of keys already stored, without loading any tables."""
+        found = set()
+        for start in range(0, len(keys), 500):
+            chunk = keys[start:start + 500]
+            rows = self._conn.execute(
+                f"SELECT key FROM page_tables WHERE key IN ({','.join('?' * len(chunk))})", chunk
+            ).fetchall()
+            found.update(row[0] for row in rows)
+        return found
+
+    def close(self):
+        self._conn.close()
+
+    def __len__(self) -> int:
+        return self._conn.execute("SELECT COUNT(*) FROM page_tables").fetchone()[0]
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+            "entries": len(self),
+        }
+
+def page_key(fitz_doc, index: int, backend: str, refs: Dict, digests: Dict) -> str:
+    """
+    Hash of everything one page's extracted characters depend on: the
+    backend and ANALYZER_VERSION, the page geometry (including inherited
+    boxes and rotation), the page dictionary minus /Parent, and the
+    contents of its content streams and every resource object reachable
+    from it. refs/digests memoize per-object work across pages.
+    """
+    from core.analyzer import ANALYZER_VERSION
+
+    page = fitz_doc[index]
+    h = hashlib.sha256()
+    h.update(f"{ANALYZER_VERSION}:{backend}:{tuple(page.mediabox)}:{tuple(page.cropbox)}:{page.rotation}".encode())
+    h.update(_PARENT.sub("", fitz_doc.xref_object(page.xref, compressed=True)).encode())
+    for xref in sorted(page_dependencies(fitz_doc, page.xref, refs) - {page.xref}):
+        if xref not in digests:
+            digests[xref] = object_digest(fitz_doc, xref) or b""
+        h.update(digests[xref])
+    return h.hexdigest()
+
+def iter_cached_pages(doc, backend: str, cache: PageCache) -> Iterator[CharTable]:
+    """
+    iter_pdf_pages() through a PageCache: cached pages are loaded (and
+    renumbered to their position in this document), the rest are extracted
+    in one pass over the misses and stored.
+    doc: PdfDocument session
+    """
+    from core.analyzer import iter_pdf_pages
+
+    fitz_doc = doc.fitz
+    refs: Dict = {}
+    digests: Dict = {}
+    keys = [page_key(fitz_doc, i, backend, refs, digests) for i in range(fitz_doc.page_count)]
+    cached = cache.present(keys)
+    missing = [i for i, key in enumerate(keys) if key not in cached]
+    extracted = iter_pdf_pages(doc, backend, missing) if missing else iter(())
+
+    for i, key in enumerate(keys):
+        if key not in cached:
+            cache.misses += 1
+            table = _extracted_or_empty(extracted, key, cache)
+        else:
+            table = cache.get(key)
+            if table is None:  # removed since present() was checked, or unreadable
+                table = _extracted_or_empty(iter_pdf_pages(doc, backend, [i]), key, cache)
+            table.page = array("I", [i + 1]) * len(table)
+        yield table
+
+def _extracted_or_empty(extracted: Iterator[CharTable], key: str, cache: PageCache) -> CharTable:
+    """
+    Next extracted page, stored under key. A backend that yields fewer
+    pages than asked for (pdfminer on a damaged page) leaves the rest
+    empty and uncached, so a later run tries them again.
+    """
+    table = next(extracted, None)
+    if table is None:
+        return CharTable()
+    cache.put(key, table)
+    return table
+
+def extract_char_table_cached(doc, backend: str, cache: PageCache) -> CharTable:
+    """extract_char_table() that re-extracts only pages missing from the cache."""
+    table = CharTable()
+    for page_table in iter_cached_pages(doc, backend, cache):
+        table.extend(page_table)
+    return table
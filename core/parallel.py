@@ -0,0 +1,74 @@
+# core/parallel.py
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Optional
+
+from core.analyzer import extract_char_table
+from core.chartable import CharTable
+from core.document import PdfDocument
+
+# Split each worker's share into a few chunks so slow pages balance out
+CHUNKS_PER_WORKER = 4
+
+# Per-process copy of the input (path or bytes), set by _init_worker
+_worker_source = None
+
+def _init_worker(source):
+    global _worker_source
+    _worker_source = source
+
+def _extract_range(backend: str, start: int, stop: int) -> CharTable:
+    """Worker task: open the input independently and extract one page range."""
+    with PdfDocument(_worker_source) as doc:
+        return extract_char_table(doc, backend, range(start, stop))
+
+def page_ranges(page_count: int, chunks: int) -> List[range]:
+    """Split [0, page_count) into at most `chunks` contiguous ranges, in order."""
+    chunks = max(1, min(chunks, page_count))
+    size, extra = divmod(page_count, chunks)
+    ranges = []
+    start = 0
+    for i in range(chunks):
+        stop = start + size + (1 if i < extra else 0)
+        ranges.append(range(start, stop))
+        start = stop
+    return ranges
+
+def extract_char_table_parallel(
+    pdf_file,
+    backend: str = "pdfminer",
+    workers: Optional[int] = None,
+) -> CharTable:
+    """
+    extract_char_table() sharded by page range across a ProcessPoolExecutor.
+
+    Each worker opens the file itself; chunk tables are merged in page
+    order, so the result (and every detector run on it) is identical to
+    the serial path. Single-page documents and workers=1 run serially.
+    pdf_file: path, file-like or PdfDocument session
+    workers: process count (default: os.cpu_count())
+    """
+    workers = workers or os.cpu_count() or 1
+    doc = PdfDocument.open(pdf_file)
+    owned = doc is not pdf_file
+    try:
+        page_count = doc.fitz.page_count
+        if workers <= 1 or page_count <= 1:
+            return extract_char_table(doc, backend)
+
+        # Workers get the path when there is one, else the bytes once each
+        source = doc.path if doc.path is not None else bytes(doc.data)
+        ranges = page_ranges(page_count, workers * CHUNKS_PER_WORKER)
+        table = CharTable()
+        with ProcessPoolExecutor(
+            max_workers=min(workers, len(ranges)),
+            initializer=_init_worker,
+            initargs=(source,),
+        ) as pool:
+            futures = [pool.submit(_extract_range, backend, r.start, r.stop) for r in ranges]
+            for future in futures:
+                table.extend(future.result())
+        return table
+    finally:
+        if owned:
+            doc.close()
@@ -0,0 +1,106 @@
+# core/report.py
+import os
+import unicodedata
+from functools import lru_cache
+from typing import Dict, Any, Iterator, Optional
+
+TEMPLATE_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "templates")
+REPORT_TEMPLATE = "stego_report.html"
+DEFAULT_BYTECODE_CACHE_DIR = os.environ.get(
+    "STEGO_SNIFFER_JINJA_CACHE",
+    os.path.join(os.path.expanduser("~"), ".cache", "pdf-stego-sniffer", "jinja"),
+)
+# Template events joined per write when streaming a report to a file
+STREAM_BUFFER = 64
+
+def _unicodename(c): return unicodedata.name(c, "UNKNOWN")
+def _ord(c): return ord(c)
+def _format_codepoint(v): return f"{v:04X}"
+
+def _bytecode_cache(jinja2, directory: str):
+    """FileSystemBytecodeCache in directory, or None when it can't be created."""
+    try:
+        os.makedirs(directory, exist_ok=True)
+    except OSError:
+        return None
+    return jinja2.FileSystemBytecodeCache(directory)
+
+@lru_cache(maxsize=None)
+def report_environment():
+    """
+    Process-wide jinja2 Environment over templates/ with the report filters.
+    Compiled templates stay in its cache, so only the first render in a
+    process pays for parsing and compiling; the compiled bytecode is also
+    kept in DEFAULT_BYTECODE_CACHE_DIR (or $STEGO_SNIFFER_JINJA_CACHE), so a
+    fresh process only unmarshals it.
+    """
+    import jinja2
+
+    env = jinja2.Environment(
+        loader=jinja2.FileSystemLoader(TEMPLATE_DIR),
+        bytecode_cache=_bytecode_cache(jinja2, DEFAULT_BYTECODE_CACHE_DIR),
+        autoescape=False,
+    )
+    env.filters.update({
+        "unicodename": _unicodename,
+        "ord": _ord,
+        "format_codepoint": _format_codepoint,
+    })
+    return env
+
+def precompile_templates() -> int:
+    """Compile every template under templates/ now; returns how many."""
+    env = report_environment()
+    names = env.list_templates(extensions=["html"])
+    for name in names:
+        env.get_template(name)
+    return len(names)
+
+def report_context(result: Dict[str, Any], heatmap_b64: Optional[str] = None,
+                   suspicious_objects=None) -> Dict[str, Any]:
+    """Variables for REPORT_TEMPLATE from an analyze_pdf() result."""
+    summary = result["summary"]
+    risk = result.get("risk_score", {})
+    return {
+        "total_chars": summary["total_chars"],
+        "fonts_used": ", ".join([f[0] for f in summary.get("fonts_used_top", [])]),
+        "mixed_scripts_hint": summary["mixed_scripts_hint"],
+        "zero_width_count": summary["zero_width_count"],
+        "rtl_marks_count": summary["rtl_marks_count"],
+        "suspicious_count": summary["suspicious_count"],
+        "total_score": risk.get("total_score", 0),
+        "risk_level": risk.get("risk_level", "Unknown"),
+        "score_breakdown": [
+            {"name": k.replace("_", " ").title(), "score": v.get("score", 0)}
+            for k, v in risk.get("breakdown", {}).items()
+        ],
+        "suspicious": result.get("suspicious", []),
+        "font_characters": result.get("font_characters", {}),
+        "heatmap_b64": heatmap_b64,
+        "suspicious_objects": suspicious_objects or [],
+        "revisions": result.get("revisions", {}),
+    }
+
+def generate_report(result: Dict[str, Any], heatmap_b64: Optional[str] = None,
+                    suspicious_objects=None) -> Iterator[str]:
+    """The HTML report as a sequence of text chunks, rendered lazily."""
+    template = report_environment().get_template(REPORT_TEMPLATE)
+    return template.generate(**report_context(result, heatmap_b64, suspicious_objects))
+
+def render_report(result: Dict[str, Any], heatmap_b64: Optional[str] = None,
+                  suspicious_objects=None) -> str:
+    """The whole HTML report as one string (prefer write_report for large documents)."""
+    template = report_environment().get_template(REPORT_TEMPLATE)
+    return template.render(**report_context(result, heatmap_b64, suspicious_objects))
+
+def write_report(dest, result: Dict[str, Any], heatmap_b64: Optional[str] = None,
+                 suspicious_objects=None) -> None:
+    """
+    Stream the HTML report into dest (a path, or a binary file object) as
+    UTF-8, STREAM_BUFFER template events at a time, so the report is
+    never held in memory as a whole.
+    """
+    template = report_environment().get_template(REPORT_TEMPLATE)
+    stream = template.stream(**report_context(result, heatmap_b64, suspicious_objects))
+    stream.enable_buffering(STREAM_BUFFER)
+    stream.dump(dest, encoding="utf-8")
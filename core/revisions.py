@@ -0,0 +1,231 @@
+# core/revisions.py
+import hashlib
+import re
+from array import array
+from typing import List, Dict, Any, Optional, Set
+
+from core.chartable import CharTable
+from core.objscan import scan_object
+
+# End of one revision: trailer tail plus the line ending after %%EOF
+_EOF = re.compile(rb"startxref\s+\d+\s+%%EOF[ \t]*(?:\r\n|\r|\n)?")
+_OBJ_HEADER = re.compile(rb"(\d+)\s+\d+\s+obj\b")
+_REF = re.compile(r"(\d+) \d+ R")
+
+def revision_ends(data) -> List[int]:
+    """
+    Byte offsets where each revision of the file ends (one per
+    incremental-update section, the original document first). A
+    linearized file's first-page trailer is not counted as a revision.
+    """
+    ends = [m.end() for m in _EOF.finditer(data)]
+    if len(ends) > 1 and b"/Linearized" in bytes(data[:1024]):
+        ends = ends[1:]
+    return ends or [len(data)]
+
+class RevisionHistory:
+    """
+    Incremental-update sections of a PDF session.
+
+    Each revision is the file prefix up to its %%EOF and is opened
+    zero-copy from the session's buffer. For every update, the objects it
+    (re)defines are compared with the previous revision to find the ones
+    that really changed, and a page counts as touched when its page
+    object, content streams or anything reachable from its resources is
+    among them. Built by PdfDocument.revisions().
+    """
+
+    def __init__(self, doc):
+        self.doc = doc
+        self.ends = revision_ends(doc.data)
+        self.reused_revision: Optional[int] = None
+        self.reused_pages = 0
+        self._docs = {}
+        self._changed: Optional[List[Set[int]]] = None
+        self._touched: Optional[List[Set[int]]] = None
+
+    def __len__(self) -> int:
+        return len(self.ends)
+
+    def close(self):
+        for rev_doc in self._docs.values():
+            rev_doc.close()
+        self._docs.clear()
+
+    def sha256(self, k: int) -> str:
+        """Hash of revision k's bytes (as if that version were scanned alone)."""
+        return hashlib.sha256(memoryview(self.doc.data)[:self.ends[k]]).hexdigest()
+
+    def _fitz(self, k: int):
+        if k == len(self) - 1:
+            return self.doc.fitz
+        if k not in self._docs:
+            import fitz  # PyMuPDF
+            prefix = memoryview(self.doc.data)[:self.ends[k]]
+            self._docs[k] = fitz.open(stream=prefix, filetype="pdf")
+        return self._docs[k]
+
+    # ---------------------------------------------------------
+    # Changed objects and touched pages
+    # ---------------------------------------------------------
+    def _analyze(self):
+        if self._changed is not None:
+            return
+        base = self._fitz(0)
+        self._changed = [set(range(1, base.xref_length()))]
+        self._touched = [{base.page_xref(i) for i in range(base.page_count)}]
+        data = self.doc.data
+        for k in range(1, len(self)):
+            prev, cur = self._fitz(k - 1), self._fitz(k)
+            section = bytes(data[self.ends[k - 1]:self.ends[k]])
+            if b"/ObjStm" in section:
+                # Objects packed into object streams have no visible header
+                candidates = range(1, cur.xref_length())
+            else:
+                candidates = {int(n) for n in _OBJ_HEADER.findall(section)}
+            changed = {
+                x for x in candidates
+                if x < cur.xref_length() and object_digest(prev, x) != object_digest(cur, x)
+            }
+            prev_pages = {prev.page_xref(i) for i in range(prev.page_count)}
+            refs = {}
+            touched = set()
+            for i in range(cur.page_count):
+                px = cur.page_xref(i)
+                if px not in prev_pages or (changed and page_dependencies(cur, px, refs) & changed):
+                    touched.add(px)
+            self._changed.append(changed)
+            self._touched.append(touched)
+
+    def char_table(self, backend: str, k: int, prior: CharTable) -> CharTable:
+        """
+        Full-document CharTable that copies pages unchanged since revision k
+        from that revision's cached table (renumbered to their current
+        position) and extracts only the pages later updates touched.
+        """
+        from core.analyzer import iter_pdf_pages
+
+        self._analyze()
+        final = self.doc.fitz
+        prior_doc = self._fitz(k)
+        prior_index = {prior_doc.page_xref(j): j for j in range(prior_doc.page_count)}
+        touched_after = set().union(*self._touched[k + 1:])
+
+        plan = []
+        extract = []
+        for i in range(final.page_count):
+            px = final.page_xref(i)
+            if px in prior_index and px not in touched_after:
+                plan.append(prior_index[px] + 1)
+            else:
+                plan.append(None)
+                extract.append(i)
+
+        extracted = iter_pdf_pages(self.doc, backend, extract) if extract else iter(())
+        table = CharTable()
+        for i, prior_page in enumerate(plan):
+            if prior_page is None:
+                # Pages the backend never yielded (damaged) stay empty
+                page = next(extracted, None)
+                if page is not None:
+                    table.extend(page)
+            else:
+                page = prior.page_table(prior_page)
+                page.page = array("I", [i + 1]) * len(page)
+                table.extend(page)
+        self.reused_revision = k
+        self.reused_pages = len(plan) - len(extract)
+        return table
+
+    def report(self, suspicious: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Per-revision breakdown for analyze_pdf() results. Every current page
+        is attributed to the last revision that touched it, so the
+        suspicious counts add up to the document total.
+        """
+        data = self.doc.data
+        trailing = len(bytes(data[self.ends[-1]:]).strip())
+        self._analyze()
+        final = self.doc.fitz
+        owner = {}
+        for k, touched in enumerate(self._touched):
+            for px in touched:
+                owner[px] = k
+        page_owner = [owner.get(final.page_xref(i), 0) for i in range(final.page_count)]
+        suspicious_by_revision = [0] * len(self)
+        for s in suspicious:
+            if 0 < s["page"] <= len(page_owner):
+                suspicious_by_revision[page_owner[s["page"] - 1]] += 1
+
+        breakdown = []
+        for k in range(len(self)):
+            rev_doc = self._fitz(k)
+            page_numbers = {rev_doc.page_xref(i): i + 1 for i in range(rev_doc.page_count)}
+            flagged = []
+            # The base revision is covered by the document-wide object scan
+            for x in sorted(self._changed[k]) if k else ():
+                try:
+                    flags = scan_object(rev_doc.xref_object(x))
+                except Exception:
+                    continue
+                if flags["non_ascii"] or flags["keywords"]:
+                    flagged.append({"object_number": x, **flags})
+            breakdown.append({
+                "revision": k,
+                "start": self.ends[k - 1] if k else 0,
+                "end": self.ends[k],
+                "objects_changed": len(self._changed[k]),
+                "pages_touched": sorted(page_numbers[px] for px in self._touched[k]),
+                "flagged_objects": flagged,
+                "suspicious_count": suspicious_by_revision[k],
+            })
+        return {
+            "count": len(self),
+            "trailing_bytes": trailing,
+            "reused_revision": self.reused_revision,
+            "reused_pages": self.reused_pages,
+            "breakdown": breakdown,
+        }
+
+def object_digest(doc, xref: int) -> Optional[bytes]:
+    """Hash of an object's dictionary source plus its raw stream bytes."""
+    try:
+        h = hashlib.sha256(doc.xref_object(xref, compressed=True).encode())
+        if doc.xref_is_stream(xref):
+            h.update(doc.xref_stream_raw(xref))
+        return h.digest()
+    except Exception:
+        return None
+
+def page_dependencies(doc, page_xref: int, refs: Dict[int, List[int]]) -> Set[int]:
+    """
+    Objects a page's text depends on: the page itself, its /Contents and
+    everything reachable from its (possibly inherited) /Resources.
+    refs memoizes each object's outgoing references across pages.
+    """
+    seen = set()
+    kind, value = doc.xref_get_key(page_xref, "Contents")
+    roots = [int(n) for n in _REF.findall(value)]
+    node = page_xref
+    while node and node not in seen:
+        seen.add(node)
+        kind, value = doc.xref_get_key(node, "Resources")
+        if kind != "null":
+            roots += [int(n) for n in _REF.findall(value)]
+            break
+        kind, value = doc.xref_get_key(node, "Parent")
+        node = int(value.split()[0]) if kind == "xref" else 0
+
+    stack = roots
+    while stack:
+        x = stack.pop()
+        if x in seen:
+            continue
+        seen.add(x)
+        if x not in refs:
+            try:
+                refs[x] = [int(n) for n in _REF.findall(doc.xref_object(x, compressed=True))]
+            except Exception:
+                refs[x] = []
+        stack.extend(refs[x])
+    return seen
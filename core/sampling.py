@@ -0,0 +1,122 @@
+# core/sampling.py
+import math
+import random
+from typing import List, Dict, Any
+
+from core.analyzer import _analyze_document, iter_pdf_pages, table_stats
+from core.chartable import CharTable
+from core.document import PdfDocument
+
+DEFAULT_SAMPLE_PAGES = 50
+DEFAULT_EDGE_PAGES = 5
+# Sampled suspicious density (% of characters) that triggers a full scan
+DEFAULT_ESCALATE_DENSITY = 0.1
+# Confidence is the chance of sampling at least one page with hidden
+# characters when at least this fraction of the interior pages has them
+DEFAULT_MIN_FRACTION = 0.01
+
+def sample_page_indices(page_count: int, sample: int, edge: int, seed) -> List[int]:
+    """
+    Sorted 0-based page indices: the first and last `edge` pages plus one
+    random page from each of `sample` equal strata of the pages between
+    them. seed makes the choice reproducible (analyze_pdf uses the
+    document hash, so cached and fresh runs agree).
+    """
+    if page_count <= 2 * edge + sample:
+        return list(range(page_count))
+    chosen = set(range(edge)) | set(range(page_count - edge, page_count))
+    rng = random.Random(seed)
+    interior = page_count - 2 * edge
+    for k in range(sample):
+        lo = edge + (k * interior) // sample
+        hi = edge + ((k + 1) * interior) // sample
+        chosen.add(rng.randrange(lo, hi))
+    return sorted(chosen)
+
+def detection_confidence(population: int, drawn: int, min_fraction: float) -> float:
+    """
+    Probability that `drawn` pages taken without replacement from
+    `population` include at least one of the ceil(min_fraction *
+    population) affected pages (hypergeometric; stratified draws do at
+    least as well).
+    """
+    if drawn >= population:
+        return 1.0
+    affected = max(1, math.ceil(min_fraction * population))
+    miss = 1.0
+    for i in range(drawn):
+        miss *= max(0, population - affected - i) / (population - i)
+    return round(1.0 - miss, 4)
+
+def sampled_analyze_pdf(
+    pdf_file,
+    backend: str = "pdfminer",
+    font_cache=None,
+    sample_pages: int = DEFAULT_SAMPLE_PAGES,
+    edge_pages: int = DEFAULT_EDGE_PAGES,
+    escalate_density: float = DEFAULT_ESCALATE_DENSITY,
+    min_fraction: float = DEFAULT_MIN_FRACTION,
+    seed=None,
+) -> Dict[str, Any]:
+    """
+    analyze_pdf() over a page sample for very large documents: the first
+    and last `edge_pages` pages plus a stratified random sample of
+    `sample_pages` pages. When the sample's suspicious density reaches
+    `escalate_density` percent the remaining pages are extracted too and
+    the result is a full analysis. Returns the analyze_pdf() shape
+    ("characters" holds the analysed pages only), plus:
+      partial: True when pages were left unread
+      sampling: {pages_analyzed, page_count, coverage, confidence,
+                 min_fraction, sample_density_pct, escalate_density_pct,
+                 escalated, edge_pages, sample_pages}
+    The risk score extrapolates zero-width and RTL counts from the sample
+    (see _risk_from_counts) and carries the same coverage/confidence.
+    """
+    doc = PdfDocument.open(pdf_file)
+    owned = doc is not pdf_file
+    try:
+        page_count = doc.fitz.page_count
+        indices = sample_page_indices(page_count, sample_pages, edge_pages, seed or doc.sha256())
+        # A backend may yield fewer pages than asked for (a damaged page
+        # ends extraction early); pages it never yielded count as unsampled
+        tables = {}
+        for i, table in zip(indices, iter_pdf_pages(doc, backend, indices) if indices else ()):
+            tables[i] = table
+
+        sample = CharTable()
+        for i in sorted(tables):
+            sample.extend(tables[i])
+        stats = table_stats(sample)
+        density = stats["suspicious_count"] / len(sample) * 100 if len(sample) else 0.0
+
+        escalated = len(tables) < page_count and density >= escalate_density
+        if escalated:
+            rest = [i for i in range(page_count) if i not in tables]
+            for i, table in zip(rest, iter_pdf_pages(doc, backend, rest)):
+                tables[i] = table
+            sample = CharTable()
+            for i in sorted(tables):
+                sample.extend(tables[i])
+
+        interior = max(0, page_count - 2 * edge_pages)
+        drawn = sum(1 for i in tables if edge_pages <= i < page_count - edge_pages)
+        sampling = {
+            "pages_analyzed": len(tables),
+            "page_count": page_count,
+            "coverage": round(len(tables) / page_count, 4) if page_count else 1.0,
+            "confidence": detection_confidence(interior, drawn, min_fraction) if interior else 1.0,
+            "min_fraction": min_fraction,
+            "sample_density_pct": round(density, 4),
+            "escalate_density_pct": escalate_density,
+            "escalated": escalated,
+            "edge_pages": edge_pages,
+            "sample_pages": sample_pages,
+        }
+
+        result = _analyze_document(doc, backend, font_cache=font_cache, table=sample, sampling=sampling)
+        result["partial"] = len(tables) < page_count
+        result["sampling"] = sampling
+        return result
+    finally:
+        if owned:
+            doc.close()
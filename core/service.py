@@ -0,0 +1,339 @@
+# core/service.py
+import asyncio
+import json
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from email.parser import BytesParser
+from email.policy import HTTP
+from typing import Dict, Any, List, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+from core.batch import _Worker, failure_record
+from core.limits import job_deadline, overrun_record
+
+DEFAULT_QUEUE_SIZE = 32
+DEFAULT_MAX_UPLOAD = 256 * 1024 * 1024
+_MAX_HEADER_BYTES = 64 * 1024
+
+_REASONS = {
+    200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+    411: "Length Required", 413: "Payload Too Large", 422: "Unprocessable Entity",
+    500: "Internal Server Error", 503: "Service Unavailable", 504: "Gateway Timeout",
+}
+
+# Record status -> HTTP status
+_STATUS_CODES = {"ok": 200, "error": 422, "limit": 422, "timeout": 504, "crash": 500}
+
+class QueueFull(Exception):
+    """The scan queue is at capacity; the client should retry later."""
+
+class ScanService:
+    """
+    analyze_pdf() behind a bounded queue and a pool of warm worker processes
+    (the same crash-isolated workers run_batch uses).
+
+    scan() enqueues an upload and waits for its record. Every worker busy
+    and `queue_size` uploads already waiting raises QueueFull instead of
+    buffering more, which the HTTP layer turns into 503 + Retry-After;
+    reserve() claims the place up front, before the upload is read. A job
+    that exceeds `timeout` seconds has its worker killed and replaced.
+    Extra keyword options go to the workers as in run_batch (backend,
+    cache_dir, font_cache_path, page_cache_path, triage, limits, ...).
+    """
+
+    def __init__(
+        self,
+        workers: Optional[int] = None,
+        queue_size: int = DEFAULT_QUEUE_SIZE,
+        timeout: Optional[float] = None,
+        **options,
+    ):
+        self.workers = workers or os.cpu_count() or 1
+        self.queue_size = queue_size
+        self.timeout = timeout
+        self.options = options
+        self.pool: List[_Worker] = []
+        self.queue: Optional[asyncio.Queue] = None
+        self._tasks: List[asyncio.Task] = []
+        # Threads for the blocking pipe sends and process joins, one per
+        # worker so a dispatcher never waits behind another's upload
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self.accepted = 0  # reserved and not yet finished
+        self.completed = 0
+        self.rejected = 0
+
+    async def start(self):
+        self.queue = asyncio.Queue()
+        self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="scan-worker")
+        self.pool = [_Worker(self.options) for _ in range(self.workers)]
+        self._tasks = [asyncio.create_task(self._dispatch(i)) for i in range(self.workers)]
+
+    async def close(self):
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        loop = asyncio.get_running_loop()
+        await asyncio.gather(*(loop.run_in_executor(self._executor, w.stop) for w in self.pool))
+        self._executor.shutdown()
+
+    def reserve(self):
+        """
+        Claim a place for one upload: a worker if one is free, otherwise a
+        queue slot. Raises QueueFull when both are taken. The place is
+        given back when scan(..., reserved=True) finishes, or by release().
+        """
+        if self.accepted >= self.workers + self.queue_size:
+            self.rejected += 1
+            raise QueueFull(f"{self.workers} scans running and {self.queue_size} queued")
+        self.accepted += 1
+
+    def release(self):
+        """Give back a reserve()d place that will not be scanned."""
+        self.accepted -= 1
+
+    async def scan(self, name: str, data: bytes, reserved: bool = False) -> Dict[str, Any]:
+        if not reserved:
+            self.reserve()
+        future = asyncio.get_running_loop().create_future()
+        self.queue.put_nowait((name, data, future))
+        return await future
+
+    async def _dispatch(self, i: int):
+        """One consumer per worker: take the next upload and run it on pool[i]."""
+        loop = asyncio.get_running_loop()
+        while True:
+            name, data, future = await self.queue.get()
+            try:
+                record = await self._run(loop, i, name, data)
+            except Exception as e:
+                record = failure_record(name, "error", f"{type(e).__name__}: {e}", 0.0)
+            finally:
+                self.queue.task_done()
+                self.accepted -= 1
+            self.completed += 1
+            if not future.done():
+                future.set_result(record)
+
+    async def _run(self, loop, i: int, name: str, data: bytes) -> Dict[str, Any]:
+        worker = self.pool[i]
+        limits = self.options.get("limits")
+        reason = None
+        try:
+            if not worker.ready:
+                # The worker's one-off import is not charged to the job
+                await _receive(loop, worker.conn, None)
+                worker.ready = True
+            await loop.run_in_executor(self._executor, worker.submit, name, data)
+            while True:
+                deadline, reason = job_deadline(worker.started, worker.stage_started, self.timeout, limits)
+                wait_for = None if deadline is None else max(0.0, deadline - time.monotonic())
+                message = await _receive(loop, worker.conn, wait_for)
+                if isinstance(message, tuple):  # stage announcement (limits.stage_timeout)
+                    worker.stage, worker.stage_started = message[1], time.monotonic()
+                    continue
+                worker.path = None
+                return message
+        except asyncio.TimeoutError:
+            overrun = True
+        except (EOFError, OSError):
+            overrun = False
+        # Never reuse the worker: a late record would answer the next job
+        elapsed = time.monotonic() - worker.started if worker.path is not None else 0.0
+        await loop.run_in_executor(self._executor, worker.kill)
+        self.pool[i] = _Worker(self.options)
+        if overrun:
+            return overrun_record(name, reason, self.timeout, limits, worker.stage, elapsed)
+        return failure_record(name, "crash", f"worker exited with code {worker.process.exitcode}", elapsed)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "workers": self.workers,
+            "queued": self.queue.qsize() if self.queue else 0,
+            "queue_size": self.queue_size,
+            "completed": self.completed,
+            "rejected": self.rejected,
+        }
+
+async def _receive(loop, conn, timeout: Optional[float]):
+    """
+    conn.recv() once the event loop sees the message arrive, so waiting on
+    a worker takes no thread. asyncio.TimeoutError after `timeout` seconds.
+    """
+    fd = conn.fileno()
+    future = loop.create_future()
+
+    def readable():
+        loop.remove_reader(fd)
+        if future.done():  # timed out meanwhile; the worker is being replaced
+            return
+        try:
+            future.set_result(conn.recv())
+        except Exception as e:
+            future.set_exception(e)
+
+    loop.add_reader(fd, readable)
+    try:
+        return await asyncio.wait_for(future, timeout)
+    finally:
+        # Synchronously, before the caller can close conn and its fd is reused
+        loop.remove_reader(fd)
+
+# -------------------------------------------------------------
+# HTTP front end (asyncio streams, HTTP/1.1 with keep-alive)
+# -------------------------------------------------------------
+async def _read_head(reader: asyncio.StreamReader):
+    """(method, target, headers) or None on a closed connection."""
+    try:
+        head = await reader.readuntil(b"\r\n\r\n")
+    except asyncio.IncompleteReadError:
+        return None
+    except asyncio.LimitOverrunError:
+        raise _HttpError(400, "request headers too large")
+    lines = head.decode("latin-1").split("\r\n")
+    try:
+        method, target, _version = lines[0].split(" ", 2)
+    except ValueError:
+        raise _HttpError(400, "malformed request line")
+    headers = {}
+    for line in lines[1:]:
+        if ":" in line:
+            key, value = line.split(":", 1)
+            headers[key.strip().lower()] = value.strip()
+    return method, target, headers
+
+def _content_length(method: str, headers: Dict[str, str], max_upload: int) -> int:
+    """
+    Body size declared by the headers. A body is read for every method
+    that declares one, so its bytes are never parsed as the next request
+    on a keep-alive connection.
+    """
+    if "chunked" in headers.get("transfer-encoding", "").lower():
+        raise _HttpError(411, "chunked request bodies are not supported; send Content-Length")
+    if "content-length" not in headers:
+        if method == "POST":
+            raise _HttpError(411, "Content-Length required")
+        return 0
+    try:
+        length = int(headers["content-length"])
+    except ValueError:
+        raise _HttpError(400, "invalid Content-Length")
+    if length < 0:
+        raise _HttpError(400, "invalid Content-Length")
+    if length > max_upload:
+        raise _HttpError(413, f"upload exceeds {max_upload} bytes")
+    return length
+
+class _HttpError(Exception):
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+
+def _upload(headers: Dict[str, str], body: bytes, query: str) -> Tuple[str, bytes]:
+    """(name, pdf bytes) from a raw application/pdf body or a multipart "file" field."""
+    content_type = headers.get("content-type", "")
+    name = parse_qs(query).get("name", ["upload.pdf"])[0]
+    if content_type.startswith("multipart/form-data"):
+        message = BytesParser(policy=HTTP).parsebytes(
+            b"Content-Type: " + content_type.encode("latin-1") + b"\r\n\r\n" + body
+        )
+        for part in message.iter_parts():
+            if part.get_param("name", header="content-disposition") == "file":
+                return part.get_filename() or name, part.get_payload(decode=True) or b""
+        raise _HttpError(400, 'multipart upload has no "file" field')
+    return name, body
+
+def _response(status: int, payload: Dict[str, Any], keep_alive: bool, extra: str = "") -> bytes:
+    body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+    head = (
+        f"HTTP/1.1 {status} {_REASONS.get(status, '')}\r\n"
+        f"Content-Type: application/json; charset=utf-8\r\n"
+        f"Content-Length: {len(body)}\r\n"
+        f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n"
+        f"{extra}\r\n"
+    )
+    return head.encode("latin-1") + body
+
+async def _scan(service: ScanService, reader, headers: Dict[str, str], query: str, length: int):
+    """Run one POST /scan; its place is reserved before the body is read."""
+    service.reserve()
+    try:
+        body = await reader.readexactly(length)
+        name, data = _upload(headers, body, query)
+        if not data:
+            raise _HttpError(400, "empty upload")
+    except BaseException:
+        service.release()
+        raise
+    record = await service.scan(name, data, reserved=True)
+    return _STATUS_CODES.get(record["status"], 500), record
+
+async def _handle(service: ScanService, max_upload: int, reader, writer):
+    try:
+        while True:
+            keep_alive = False
+            try:
+                request = await _read_head(reader)
+                if request is None:
+                    break
+                method, target, headers = request
+                keep_alive = headers.get("connection", "").lower() != "close"
+                url = urlsplit(target)
+                length = _content_length(method, headers, max_upload)
+                extra = ""
+                if url.path == "/scan" and method == "POST":
+                    try:
+                        status, payload = await _scan(service, reader, headers, url.query, length)
+                    except QueueFull as e:
+                        # The body is left unread, so the connection cannot be reused
+                        status, payload, extra = 503, {"status": "busy", "error": str(e)}, "Retry-After: 1\r\n"
+                        keep_alive = False
+                else:
+                    await reader.readexactly(length)
+                    if url.path == "/health":
+                        status, payload = 200, {"status": "ok", **service.stats()}
+                    elif url.path == "/scan":
+                        raise _HttpError(405, "use POST /scan")
+                    else:
+                        raise _HttpError(404, f"no route for {url.path}")
+            except _HttpError as e:
+                status, payload, extra = e.status, {"status": "error", "error": str(e)}, ""
+                keep_alive = False
+            writer.write(_response(status, payload, keep_alive, extra))
+            await writer.drain()
+            if not keep_alive:
+                break
+    except (ConnectionError, asyncio.IncompleteReadError):
+        pass
+    finally:
+        writer.close()
+
+async def serve(
+    host: str = "127.0.0.1",
+    port: int = 8088,
+    max_upload: int = DEFAULT_MAX_UPLOAD,
+    ready: Optional[asyncio.Event] = None,
+    **service_options,
+):
+    """
+    Run the HTTP scanning service until cancelled.
+
+      POST /scan   PDF as the raw body (application/pdf, ?name=...) or as the
+                   "file" field of multipart/form-data; returns the
+                   run_batch-style JSON record (422 error or budget
+                   exceeded, 504 timeout,
+                   500 crash, 503 + Retry-After when the queue is full)
+      GET /health  pool and queue statistics
+    """
+    service = ScanService(**service_options)
+    await service.start()
+    server = await asyncio.start_server(
+        lambda r, w: _handle(service, max_upload, r, w), host, port, limit=_MAX_HEADER_BYTES,
+    )
+    try:
+        async with server:
+            if ready is not None:
+                ready.set()
+            await server.serve_forever()
+    finally:
+        await service.close()
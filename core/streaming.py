@@ -0,0 +1,116 @@
+# core/streaming.py
+from collections import Counter
+from typing import List, Dict, Any, Iterator
+
+from core.analyzer import (
+    _risk_from_counts,
+    _summary_from_counts,
+    inspect_font_glyphs,
+    iter_pdf_pages,
+    revision_report,
+    table_stats,
+)
+from core.chartable import CharTable
+from core.document import PdfDocument
+
+class StreamingAnalysis:
+    """
+    Page-at-a-time analysis with bounded memory.
+
+    Iterating extracts one page, folds it into incremental accumulators
+    (codepoint and font histograms, font-character counts, suspicious hits)
+    and yields that page's partial result together with the running
+    summary and risk score. Only the current page's characters are ever
+    held; result() returns the same shape as analyze_pdf() with
+    "characters" set to None.
+
+        stream = StreamingAnalysis("big.pdf")
+        for partial in stream:
+            print(partial["page"], partial["risk_score"]["total_score"])
+        result = stream.result()
+    """
+
+    def __init__(self, pdf_file, backend: str = "pdfminer", font_cache=None, page_cache=None):
+        self.pdf_file = pdf_file
+        self.backend = backend
+        self.font_cache = font_cache
+        self.page_cache = page_cache
+        self.pages = 0
+        self.total_chars = 0
+        self.code_counts: Counter = Counter()
+        self.font_counts: Dict[str, int] = {}
+        self.font_characters: Dict[str, Dict[str, int]] = {}
+        self.suspicious: List[Dict[str, Any]] = []
+        self.fonts_report: List[Dict[str, Any]] = []
+        self.revisions: Dict[str, Any] = {}
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        doc = PdfDocument.open(self.pdf_file)
+        owned = doc is not self.pdf_file
+        try:
+            # Fonts first so the running risk score includes font anomalies
+            try:
+                self.fonts_report = inspect_font_glyphs(doc, self.font_cache)
+            except Exception as e:
+                self.fonts_report = [{"font_name": "N/A", "flag": f"font analysis failed: {e}"}]
+
+            if self.page_cache is not None:
+                from core.page_cache import iter_cached_pages
+                pages = iter_cached_pages(doc, self.backend, self.page_cache)
+            else:
+                pages = iter_pdf_pages(doc, self.backend)
+            for table in pages:
+                yield self.add_page(table)
+            self.revisions = revision_report(doc, self.suspicious)
+        finally:
+            if owned:
+                doc.close()
+
+    def add_page(self, table: CharTable) -> Dict[str, Any]:
+        """Fold one page into the accumulators and return its partial result."""
+        self.pages += 1
+        stats = table_stats(table)
+        page_suspicious = stats["suspicious"]
+
+        self.total_chars += stats["total_chars"]
+        self.code_counts.update(table.code)
+        for font, chars in stats["font_characters"].items():
+            counts = self.font_characters.setdefault(font, {})
+            for char, n in chars.items():
+                counts[char] = counts.get(char, 0) + n
+                self.font_counts[font] = self.font_counts.get(font, 0) + n
+        self.suspicious.extend(page_suspicious)
+
+        page_summary = stats["summary"]
+        page_summary["suspicious_count"] = stats["suspicious_count"]
+        return {
+            "page": self.pages,
+            "page_summary": page_summary,
+            "suspicious": page_suspicious,
+            "summary": self.summary(),
+            "risk_score": self.risk_score(),
+        }
+
+    def summary(self) -> Dict[str, Any]:
+        """Running document summary over the pages seen so far."""
+        summary = _summary_from_counts(self.total_chars, self.code_counts, self.font_counts)
+        summary["suspicious_count"] = len(self.suspicious)
+        summary["fonts_checked"] = len(self.fonts_report)
+        summary["fonts_flags"] = [f["flag"] for f in self.fonts_report]
+        return summary
+
+    def risk_score(self) -> Dict[str, Any]:
+        """Running calculate_risk_score() over the pages seen so far."""
+        return _risk_from_counts(self.total_chars, len(self.suspicious), self.summary(), self.fonts_report)
+
+    def result(self) -> Dict[str, Any]:
+        """Final result in analyze_pdf() shape, without per-character records."""
+        return {
+            "summary": self.summary(),
+            "characters": None,
+            "suspicious": self.suspicious,
+            "fonts_report": self.fonts_report,
+            "risk_score": self.risk_score(),
+            "font_characters": self.font_characters,
+            "revisions": self.revisions,
+        }
@@ -0,0 +1,253 @@
+# core/triage.py
+import re
+from io import BytesIO
+from typing import List, Dict, Any, Iterable, Optional
+
+from core.analyzer import _risk_from_counts, inspect_font_glyphs, iter_pdf_pages, revision_report
+from core.document import PdfDocument
+from core.objscan import flag_suspicious_pdf_objects
+from core.streaming import StreamingAnalysis
+from core.unicode_flags import ARABIC, LATIN, RTL_MARK, SUSPICIOUS, ZERO_WIDTH, code_flags
+
+DEFAULT_THRESHOLD = 70  # calculate_risk_score's HIGH band
+DEFAULT_SAMPLE_PAGES = 8
+
+_BFCHAR = re.compile(rb"beginbfchar(.*?)endbfchar", re.S)
+_BFRANGE = re.compile(rb"beginbfrange(.*?)endbfrange", re.S)
+_HEX = re.compile(rb"<([0-9A-Fa-f\s]*)>")
+_RANGE = re.compile(rb"<([0-9A-Fa-f\s]*)>\s*<([0-9A-Fa-f\s]*)>\s*(<[0-9A-Fa-f\s]*>|\[[^\]]*\])")
+_DIFF_TOKEN = re.compile(r"/([^\s/\[\]()<>{}%]+)|(\d+)")
+
+# Largest bfrange expanded codepoint by codepoint before giving up
+_MAX_RANGE = 0x10000
+
+def _hex_text(token: bytes) -> str:
+    raw = bytes.fromhex(token.decode("ascii").replace(" ", "").replace("\n", "").replace("\r", ""))
+    return raw.decode("utf-16-be", errors="replace")
+
+def _text_flags(text: str) -> int:
+    flags = 0
+    for ch in text:
+        flags |= code_flags(ord(ch))
+    return flags
+
+def _tounicode_flags(cmap: bytes) -> Optional[int]:
+    """OR of flags over every destination of a ToUnicode CMap (None if unbounded)."""
+    flags = 0
+    for block in _BFCHAR.findall(cmap):
+        # <src> <dst> pairs: every second token is a destination
+        for token in _HEX.findall(block)[1::2]:
+            flags |= _text_flags(_hex_text(token))
+    for block in _BFRANGE.findall(cmap):
+        for lo, hi, dst in _RANGE.findall(block):
+            span = int(lo.replace(b" ", b"") or b"0", 16), int(hi.replace(b" ", b"") or b"0", 16)
+            count = span[1] - span[0] + 1
+            if dst.startswith(b"["):
+                for token in _HEX.findall(dst):
+                    flags |= _text_flags(_hex_text(token))
+                continue
+            text = _hex_text(dst[1:-1])
+            if not text:
+                continue
+            if count > _MAX_RANGE:
+                return None
+            flags |= _text_flags(text[:-1])
+            first = ord(text[-1])
+            for code in range(first, min(first + count, 0x110000)):
+                flags |= code_flags(code)
+    return flags
+
+def _encoding_flags(fitz_doc, xref: int, subtype: str) -> Optional[int]:
+    """
+    OR of flags over a simple font's encoding, resolved the way pdfminer's
+    PDFSimpleFont does (base encoding, Differences, or the embedded Type1
+    program's built-in encoding). None when it cannot be bounded.
+    """
+    from pdfminer.encodingdb import EncodingDB, name2unicode
+
+    kind, value = fitz_doc.xref_get_key(xref, "Encoding")
+    default = "WinAnsiEncoding" if subtype == "TrueType" else "StandardEncoding"
+    if kind == "null":
+        descriptor = fitz_doc.xref_get_key(xref, "FontDescriptor")
+        if descriptor[0] == "xref":
+            fd = int(descriptor[1].split()[0])
+            fontfile = fitz_doc.xref_get_key(fd, "FontFile")
+            if fontfile[0] == "xref":
+                # pdfminer reads the program's built-in encoding unless the
+                # font is one of the standard 14, so allow both
+                builtin = _type1_builtin_flags(fitz_doc, int(fontfile[1].split()[0]))
+                if builtin is None:
+                    return None
+                return builtin | _text_flags("".join(EncodingDB.get_encoding(default).values()))
+        return _text_flags("".join(EncodingDB.get_encoding(default).values()))
+    if kind == "name":
+        return _text_flags("".join(EncodingDB.get_encoding(value[1:]).values()))
+
+    # Encoding dictionary (inline or indirect)
+    enc = int(value.split()[0]) if kind == "xref" else xref
+    prefix = "" if kind == "xref" else "Encoding/"
+    base = fitz_doc.xref_get_key(enc, prefix + "BaseEncoding")
+    flags = _text_flags("".join(EncodingDB.get_encoding(base[1][1:] if base[0] == "name" else default).values()))
+    diff_kind, diff = fitz_doc.xref_get_key(enc, prefix + "Differences")
+    if diff_kind == "array":
+        for name, _code in _DIFF_TOKEN.findall(diff):
+            if name:
+                name = re.sub(r"#([0-9A-Fa-f]{2})", lambda m: chr(int(m.group(1), 16)), name)
+                try:
+                    flags |= _text_flags(name2unicode(name))
+                except (KeyError, ValueError):
+                    pass
+    return flags
+
+def _type1_builtin_flags(fitz_doc, fontfile_xref: int) -> Optional[int]:
+    from pdfminer.pdffont import Type1FontHeaderParser
+
+    try:
+        data = fitz_doc.xref_stream(fontfile_xref)
+        length1 = int(fitz_doc.xref_get_key(fontfile_xref, "Length1")[1])
+        encoding = Type1FontHeaderParser(BytesIO(data[:length1])).get_encoding()
+    except Exception:
+        return None
+    return _text_flags("".join(encoding.values()))
+
+def possible_flags(doc: PdfDocument) -> Optional[int]:
+    """
+    OR of the flags of every character any font the pages use can
+    produce (PdfDocument.font_locations(), so fonts without a /Type key
+    and fonts inside Form XObjects count): ToUnicode destinations plus
+    the simple-font encoding both backends fall back to. None when some
+    font cannot be bounded, e.g. an inline font dictionary or a CID font
+    without a ToUnicode CMap. LATIN is always possible, since unmapped
+    glyphs come out as "(cid:N)" text.
+    """
+    fitz_doc = doc.fitz
+    flags = LATIN
+    try:
+        locations = doc.font_locations()
+    except Exception:
+        return None
+    for xref, prefix in locations:
+        if prefix:
+            return None  # inline font dictionary: not resolved here
+        try:
+            subtype = fitz_doc.xref_get_key(xref, "Subtype")[1][1:]
+            kind, value = fitz_doc.xref_get_key(xref, "ToUnicode")
+            if kind == "xref":
+                cmap_flags = _tounicode_flags(fitz_doc.xref_stream(int(value.split()[0])) or b"")
+                if cmap_flags is None:
+                    return None
+                flags |= cmap_flags
+            elif subtype != "Type1" and subtype != "TrueType" and subtype != "MMType1":
+                return None  # Type0 predefined/embedded CMaps, Type3, unknown: not bounded here
+            if subtype != "Type0":
+                # Codes missing from ToUnicode fall back to the encoding
+                enc_flags = _encoding_flags(fitz_doc, xref, subtype)
+                if enc_flags is None:
+                    return None
+                flags |= enc_flags
+        except Exception:
+            return None
+    return flags
+
+def risk_bounds(stream: StreamingAnalysis, possible: Optional[int], complete: bool) -> List[float]:
+    """
+    [lower, upper] for the final calculate_risk_score total given the
+    pages folded into stream so far. Zero-width, RTL and mixed-script
+    points only grow as pages are added and font points are final, so they
+    form the lower bound; the upper bound caps each factor by what the
+    fonts can produce at all.
+    """
+    summary = stream.summary()
+    if complete:
+        score = stream.risk_score()["total_score"]
+        return [score, score]
+    lower = _risk_from_counts(0, 0, summary, stream.fonts_report)["total_score"]
+    if possible is None:
+        return [lower, 100]
+    upper = _risk_from_counts(0, 0, {}, stream.fonts_report)["total_score"]
+    upper += 30 if possible & SUSPICIOUS else 0
+    upper += 20 if possible & ZERO_WIDTH else 0
+    upper += 15 if possible & RTL_MARK else 0
+    if summary["mixed_scripts_hint"] or (possible & ARABIC and possible & LATIN):
+        upper += 15
+    return [lower, min(100, upper)]
+
+def sample_order(page_count: int, sample: int) -> List[int]:
+    """Evenly spread sample of page indices first, then the remaining pages."""
+    if page_count <= sample:
+        return list(range(page_count))
+    step = (page_count - 1) / max(1, sample - 1)
+    first = sorted({round(i * step) for i in range(sample)})
+    chosen = set(first)
+    return first + [i for i in range(page_count) if i not in chosen]
+
+def triage_pdf(
+    pdf_file,
+    threshold: float = DEFAULT_THRESHOLD,
+    backend: str = "pdfminer",
+    font_cache=None,
+    sample_pages: int = DEFAULT_SAMPLE_PAGES,
+) -> Dict[str, Any]:
+    """
+    Decide only whether the risk score reaches `threshold`, stopping as
+    soon as that is proven. Cheap signals run first: the byte-level object
+    scan, the font inventory (glyph report plus which characters the fonts
+    can produce at all), then a page sample followed by the remaining
+    pages. Returns the analyze_pdf() shape computed over the pages read
+    ("characters" is None; the revision breakdown covers the whole file,
+    its per-revision suspicious counts only the pages read), plus:
+      partial: True when pages were left unread
+      triage: {threshold, decision ("above" | "below"), stage
+               ("fonts" | "pages" | "complete"), score_bounds,
+               pages_analyzed, page_count}
+      suspicious_objects: flag_suspicious_pdf_objects() output
+    """
+    doc = PdfDocument.open(pdf_file)
+    owned = doc is not pdf_file
+    try:
+        suspicious_objects = flag_suspicious_pdf_objects(doc)
+        stream = StreamingAnalysis(doc, backend, font_cache)
+        try:
+            stream.fonts_report = inspect_font_glyphs(doc, font_cache)
+        except Exception as e:
+            stream.fonts_report = [{"font_name": "N/A", "flag": f"font analysis failed: {e}"}]
+        possible = possible_flags(doc)
+        page_count = doc.fitz.page_count
+
+        stage = "fonts"
+        bounds = risk_bounds(stream, possible, page_count == 0)
+        if bounds[0] < threshold <= bounds[1]:
+            stage = "pages"
+            order = sample_order(page_count, sample_pages)
+            for batch in (sorted(order[:sample_pages]), order[sample_pages:]):
+                for table in _pages(doc, backend, batch):
+                    stream.add_page(table)
+                    bounds = risk_bounds(stream, possible, stream.pages == page_count)
+                    if not bounds[0] < threshold <= bounds[1]:
+                        break
+                else:
+                    continue
+                break
+        if stream.pages == page_count:
+            stage = "complete"
+
+        stream.revisions = revision_report(doc, stream.suspicious)
+        result = stream.result()
+        result["partial"] = stage != "complete"
+        result["suspicious_objects"] = suspicious_objects
+        result["triage"] = {
+            "threshold": threshold,
+            "decision": "above" if bounds[0] >= threshold else "below",
+            "stage": stage,
+            "score_bounds": bounds,
+            "pages_analyzed": stream.pages,
+            "page_count": page_count,
+        }
+        return result
+    finally:
+        if owned:
+            doc.close()
+
+def _pages(doc: PdfDocument, backend: str, indices: Iterable[int]):
+    indices = list(indices)
+    return iter_pdf_pages(doc, backend, indices) if indices else iter(())
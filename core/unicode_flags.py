@@ -0,0 +1,89 @@
+# core/unicode_flags.py
+import unicodedata
+from array import array
+from typing import Dict
+
+# Per-codepoint classification bits
+ZERO_WIDTH = 0x01   # name contains "ZERO WIDTH"
+RTL_MARK = 0x02     # name contains "RIGHT-TO-LEFT"
+LTR_MARK = 0x04     # name contains "LEFT-TO-RIGHT"
+BIDI_EMBED = 0x08   # U+202A..U+202E embeddings/overrides
+FORMAT = 0x10       # general category Cf (invisible format characters)
+ARABIC = 0x20       # Arabic block U+0600..U+06FF
+LATIN = 0x40        # name contains "LATIN"
+
+SUSPICIOUS = ZERO_WIDTH | RTL_MARK | LTR_MARK | BIDI_EMBED | FORMAT
+
+PLANE_SIZE = 0x10000
+
+def classify(code: int) -> int:
+    """Flag bitmask for a single codepoint."""
+    ch = chr(code)
+    name = unicodedata.name(ch, "")
+    flags = 0
+    if "ZERO WIDTH" in name:
+        flags |= ZERO_WIDTH
+    if "RIGHT-TO-LEFT" in name:
+        flags |= RTL_MARK
+    if "LEFT-TO-RIGHT" in name:
+        flags |= LTR_MARK
+    if 0x202A <= code <= 0x202E:
+        flags |= BIDI_EMBED
+    if unicodedata.category(ch) == "Cf":
+        flags |= FORMAT
+    if 0x0600 <= code <= 0x06FF:
+        flags |= ARABIC
+    if "LATIN" in name:
+        flags |= LATIN
+    return flags
+
+# codepoint -> flags, one byte per codepoint, filled a plane at a time
+_table = bytearray(0x110000)
+_planes_ready = set()
+
+def _ensure_plane(plane: int) -> None:
+    if plane in _planes_ready:
+        return
+    start = plane * PLANE_SIZE
+    _table[start:start + PLANE_SIZE] = bytes(classify(c) for c in range(start, start + PLANE_SIZE))
+    _planes_ready.add(plane)
+
+def warm() -> None:
+    """Build the BMP table up front (astral planes stay lazy)."""
+    _ensure_plane(0)
+
+def code_flags(code: int) -> int:
+    _ensure_plane(code >> 16)
+    return _table[code]
+
+def flags_for(codes: array) -> bytes:
+    """
+    Flag byte for every entry of a codepoint column, in one C-level pass
+    over the lookup table (planes are built on first use).
+    """
+    if not codes:
+        return b""
+    if max(codes) < PLANE_SIZE:
+        _ensure_plane(0)
+    else:
+        for plane in {c >> 16 for c in codes}:
+            _ensure_plane(plane)
+    return bytes(map(_table.__getitem__, codes))
+
+# bytes.translate tables mapping a flag byte to 1 when any bit of mask is set
+_masks: Dict[int, bytes] = {}
+
+def mask_bytes(flags: bytes, mask: int) -> bytes:
+    """0/1 byte per entry: 1 where flags & mask."""
+    table = _masks.get(mask)
+    if table is None:
+        table = _masks[mask] = bytes(1 if i & mask else 0 for i in range(256))
+    return flags.translate(table)
+
+def flag_indices(flags: bytes, mask: int):
+    """Yield indices of entries with any bit of mask set, in order."""
+    hits = mask_bytes(flags, mask)
+    i = hits.find(1)
+    while i != -1:
+        yield i
+        i = hits.find(1, i + 1)
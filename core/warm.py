@@ -0,0 +1,176 @@
+# core/warm.py
+"""
+Persistent warm worker: import and pre-warm everything once, then analyze
+PDFs sent as JSON lines over stdin/stdout or a local Unix socket.
+
+    python -m core.warm [--socket PATH] [--font-cache PATH] [--page-cache PATH]
+
+Each request line is a path or {"path": ..., "options": {...}} (options
+among backend, streaming, triage); each reply line is the run_batch-style
+record for that document. The socket is created accessible to its owner
+only.
+"""
+import json
+import os
+import socket
+import socketserver
+import sys
+import time
+from typing import Dict, Any, Optional
+
+# analyze_pdf() options a request may set; not workers, so a client
+# cannot make the server fork a process pool of any size
+JOB_OPTIONS = ("backend", "streaming", "triage")
+
+def warm_up(templates: bool = True) -> Dict[str, Any]:
+    """
+    Import the extraction stack (pdfminer, fontTools, PyMuPDF), build the
+    BMP Unicode classification table and, when jinja2 is installed,
+    compile the report templates. Returns timings for the start-up line.
+    """
+    started = time.perf_counter()
+    import fitz  # noqa: F401
+    import pdfminer.pdffont  # noqa: F401
+    import core.analyzer  # noqa: F401  (pdfminer.high_level, fontTools)
+    import core.streaming  # noqa: F401
+    import core.triage  # noqa: F401
+    from core import unicode_flags
+
+    imported = time.perf_counter()
+    unicode_flags.warm()
+    info = {"import_s": round(imported - started, 3), "unicode_s": round(time.perf_counter() - imported, 3)}
+
+    if templates:
+        try:
+            from core.report import precompile_templates
+            info["templates"] = precompile_templates()
+        except ImportError:
+            info["templates"] = 0
+    return info
+
+class WarmWorker:
+    """
+    The warm state shared by all jobs of one process: caches stay open and
+    font reports stay in memory between documents. Without font_cache_path
+    the font cache is an in-memory SQLite database, so a font program seen
+    in one job is still parsed only once per process.
+    """
+
+    def __init__(self, font_cache_path: Optional[str] = None, page_cache_path: Optional[str] = None):
+        from core.analyzer import ANALYZER_VERSION
+        from core.font_cache import FontReportCache
+
+        self.info = warm_up()
+        self.font_cache = FontReportCache(font_cache_path or ":memory:")
+        self.info["fonts_preloaded"] = self.font_cache.preload(f"{ANALYZER_VERSION}:")
+        self.page_cache = None
+        if page_cache_path:
+            from core.page_cache import PageCache
+            self.page_cache = PageCache(page_cache_path)
+        self.jobs = 0
+
+    def run(self, request) -> Dict[str, Any]:
+        """Analyze one request (path string or dict); never raises."""
+        from core.analyzer import analyze_pdf
+        from core.batch import failure_record, result_record
+
+        started = time.perf_counter()
+        path = "?"
+        try:
+            if isinstance(request, str):
+                request = {"path": request}
+            path = request["path"]
+            options = {k: v for k, v in (request.get("options") or {}).items() if k in JOB_OPTIONS}
+            result = analyze_pdf(path, font_cache=self.font_cache, page_cache=self.page_cache, **options)
+            record = result_record(path, result, time.perf_counter() - started)
+        except Exception as e:
+            record = failure_record(path, "error", f"{type(e).__name__}: {e}", time.perf_counter() - started)
+        self.jobs += 1
+        return record
+
+    def handle_line(self, line: str) -> Optional[str]:
+        """One request line -> one reply line (None for blank lines)."""
+        line = line.strip()
+        if not line:
+            return None
+        try:
+            request = json.loads(line) if line[0] in "{\"" else line
+        except ValueError as e:
+            return json.dumps({"status": "error", "error": f"bad request: {e}"})
+        return json.dumps(self.run(request), ensure_ascii=False)
+
+def serve_stdin(worker: WarmWorker, stdin=None, stdout=None):
+    """JSON lines on stdin -> JSON lines on stdout, until EOF."""
+    stdin = stdin or sys.stdin
+    stdout = stdout or sys.stdout
+    stdout.write(json.dumps({"status": "ready", **worker.info}) + "\n")
+    stdout.flush()
+    for line in stdin:
+        reply = worker.handle_line(line)
+        if reply is not None:
+            stdout.write(reply + "\n")
+            stdout.flush()
+
+def serve_socket(worker: WarmWorker, path: str):
+    """The stdin protocol over a Unix socket; connections are served one at a time."""
+
+    class Handler(socketserver.StreamRequestHandler):
+        def handle(self):
+            for raw in self.rfile:
+                reply = worker.handle_line(raw.decode("utf-8"))
+                if reply is not None:
+                    self.wfile.write(reply.encode("utf-8") + b"\n")
+                    self.wfile.flush()
+
+    if os.path.exists(path):
+        os.unlink(path)
+    # Bind under a private umask: anyone who can connect can have any
+    # readable path analysed, so the socket is never group/world-accessible
+    umask = os.umask(0o077)
+    try:
+        server = socketserver.UnixStreamServer(path, Handler)
+    finally:
+        os.umask(umask)
+    with server:
+        print(json.dumps({"status": "ready", "socket": path, **worker.info}), file=sys.stderr, flush=True)
+        try:
+            server.serve_forever()
+        finally:
+            os.unlink(path)
+
+def submit(socket_path: str, pdf_path: str, timeout: Optional[float] = None, **options) -> Dict[str, Any]:
+    """
+    Client side: have the warm worker at socket_path analyze pdf_path and
+    return its record. Imports nothing beyond the standard library.
+    """
+    request = {"path": os.path.abspath(pdf_path), "options": options}
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.settimeout(timeout)
+        sock.connect(socket_path)
+        sock.sendall(json.dumps(request).encode("utf-8") + b"\n")
+        with sock.makefile("rb") as reply:
+            return json.loads(reply.readline())
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(prog="python -m core.warm", description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--socket", metavar="PATH", default=None,
+                        help="listen on a Unix socket instead of stdin/stdout")
+    parser.add_argument("--font-cache", metavar="PATH", default=None,
+                        help="SQLite font-report cache, preloaded into memory (default: in-memory only)")
+    parser.add_argument("--page-cache", metavar="PATH", default=None,
+                        help="SQLite per-page character cache (default: none)")
+    args = parser.parse_args()
+
+    # stdout carries the replies; keep library chatter (e.g. PyMuPDF's
+    # import notice) out of it
+    replies, sys.stdout = sys.stdout, sys.stderr
+    worker = WarmWorker(args.font_cache, args.page_cache)
+    try:
+        if args.socket:
+            serve_socket(worker, args.socket)
+        else:
+            serve_stdin(worker, stdout=replies)
+    except KeyboardInterrupt:
+        pass
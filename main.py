@@ -1,12 +1,9 @@
 import streamlit as st
-import tempfile
-from core.analyzer import analyze_pdf
-import jinja2
+from core.cache import cached_analyze_pdf
+from core.document import PdfDocument
+from core.objscan import flag_suspicious_pdf_objects
 import base64
-import unicodedata
-import matplotlib.pyplot as plt
 import io
-import fitz 
 
 # -------------------------------------------------------
 # ---------- Streamlit Page & Global Styling ------------
@@ -87,6 +84,8 @@ def plot_suspicious_heatmap(suspicious):
     if not xs:
         return None
 
+    import matplotlib.pyplot as plt  # only needed once there is something to plot
+
     plt.figure(figsize=(8, 6))
     plt.hexbin(xs, ys, gridsize=40, cmap='Reds', mincnt=1)
     plt.scatter(xs, ys, s=20, alpha=0.6)
@@ -112,327 +111,42 @@ def get_heatmap_base64(suspicious):
         return base64.b64encode(buf.getvalue()).decode()
     return None
 
-def flag_suspicious_pdf_objects(pdf_path):
-    """
-    Same logic as run_analyzer: scan raw PDF objects and flag suspicious ones.
-    """
-    suspicious_objects = []
-    doc = fitz.open(pdf_path)
-    for obj_num in range(1, doc.xref_length()):
-        try:
-            obj_str = doc.xref_object(obj_num)
-            # Flag objects containing non-ASCII bytes or suspicious keywords
-            if any(b > 127 for b in obj_str.encode(errors='ignore')) or b'/JBIG2Decode' in obj_str.encode():
-                suspicious_objects.append({
-                    "object_number": obj_num,
-                    "preview": obj_str[:80]
-                })
-        except Exception:
-            continue
-    doc.close()
-    return suspicious_objects
-
 # -------------------------------------------------------
 # ------------------ HTML Report Maker ------------------
 # -------------------------------------------------------
 
 def generate_html_report(result, heatmap_b64=None, suspicious_objects=None):
-    summary = result["summary"]
-    risk = result.get("risk_score", {})
-    suspicious = result.get("suspicious", [])
-    font_characters = result.get("font_characters", {})
-
-
-    score_breakdown = [
-        {"name": k.replace("_", " ").title(), "score": v.get("score", 0)}
-        for k, v in risk.get("breakdown", {}).items()
-    ]
-
-    # Filters
-    def unicodename(c): return unicodedata.name(c, "UNKNOWN")
-    def ord_filter(c): return ord(c)
-    def format_codepoint(v): return f"{v:04X}"
-
-    env = jinja2.Environment(loader=jinja2.BaseLoader())
-    env.filters.update({
-        'unicodename': unicodename,
-        'ord': ord_filter,
-        'format_codepoint': format_codepoint
-    })
-
-    # ---------------- FINAL PROFESSIONAL TEMPLATE ----------------
-    template_str = r"""
-<!DOCTYPE html>
-<html lang="en">
-<head>
-    <meta charset="utf-8">
-    <title>PDF Ligature Stego Sniffer – Report</title>
-
-    <style>
-        :root {
-            --primary: #005f99;
-            --primary-light: #e8f4fb;
-            --danger: #d9534f;
-            --success: #5cb85c;
-            --warning: #e0a800;
-            --bg: #f3f6fa;
-        }
-
-        body {
-            font-family: "Inter", "Segoe UI", Arial, sans-serif;
-            background: var(--bg);
-            margin: 0;
-            padding: 0;
-        }
-
-        .container {
-            max-width: 1000px;
-            margin: 2em auto;
-            background: #fff;
-            padding: 2.5em 3em;
-            border-radius: 14px;
-            box-shadow: 0 6px 20px rgba(0,0,0,0.12);
-        }
-
-        h1 {
-            text-align: center;
-            color: var(--primary);
-            margin-bottom: 1em;
-        }
-
-        h2 {
-            color: var(--primary);
-            border-left: 5px solid var(--primary);
-            padding-left: 10px;
-            margin-top: 2em;
-        }
-
-        .summary-banner {
-            display: grid;
-            grid-template-columns: repeat(auto-fit, minmax(230px, 1fr));
-            gap: 1em;
-            background: var(--primary-light);
-            padding: 1.4em 1.8em;
-            border-radius: 10px;
-            margin-bottom: 2em;
-        }
-
-        .stat {
-            font-size: 1.1em;
-            font-weight: 600;
-            color: var(--primary);
-        }
-
-        .badge {
-            padding: 4px 10px;
-            border-radius: 12px;
-            color: white;
-            font-weight: bold;
-        }
-
-        .badge.high { background: #c82333; }
-        .badge.medium { background: #e0a800; }
-        .badge.low { background: #2d8f4e; }
-
-        .card {
-            background: #fafafa;
-            border-radius: 12px;
-            padding: 1.7em 2em;
-            margin-top: 1.8em;
-            border-left: 5px solid var(--primary-light);
-        }
-
-        table {
-            width: 100%;
-            border-collapse: collapse;
-            margin-top: 1em;
-        }
-        th {
-            background: var(--primary-light);
-            padding: 8px;
-            color: var(--primary);
-        }
-        td {
-            background: #fff;
-            padding: 8px;
-            border-bottom: 1px solid #eee;
-        }
-        tr:nth-child(even) td { background: #f8fbff; }
-
-        .heatmap-img {
-            width: 100%;
-            border-radius: 10px;
-            margin-top: 1em;
-        }
-
-        .invisible-char {
-            background: #fff3cd;
-            padding: 3px 6px;
-            border-radius: 4px;
-            font-weight: bold;
-            color: var(--danger);
-        }
-
-        .suspicious {
-            color: var(--danger);
-            font-weight: 600;
-        }
-    </style>
-</head>
-
-<body>
-<div class="container">
-
-    <h1>🔍 PDF Ligature Stego Sniffer – Report</h1>
-
-    <!-- Summary Block -->
-    <div class="summary-banner">
-        <div class="stat">📝 <b>Total Characters:</b> {{total_chars}}</div>
-        <div class="stat">🔤 <b>Fonts Used:</b> {{fonts_used}}</div>
-        <div class="stat">🚩 <b>Suspicious Characters:</b> {{suspicious_count}}</div>
-        <div class="stat">⚠️ <b>Risk Level:</b>
-            <span class="badge {% if risk_level == 'HIGH' %}high{% elif risk_level == 'MEDIUM' %}medium{% else %}low{% endif %}">
-                {{risk_level}}
-            </span>
-        </div>
-    </div>
-
-    <!-- General Info -->
-    <div class="card">
-        <h2>General Information</h2>
-        <ul>
-            <li><b>Mixed Scripts Detected:</b> {{mixed_scripts_hint}}</li>
-            <li><b>Zero-width Characters:</b> {{zero_width_count}}</li>
-            <li><b>RTL Marks:</b> {{rtl_marks_count}}</li>
-        </ul>
-    </div>
-
-    <!-- Risk Assessment -->
-    <div class="card">
-        <h2>Risk Assessment</h2>
-        <p><b>Total Score:</b> {{total_score}} / 100</p>
-        <ul>
-            {% for factor in score_breakdown %}
-            <li><b>{{factor.name}}:</b> {{factor.score}} points</li>
-            {% endfor %}
-        </ul>
-    </div>
-
-    <!-- Byte-Level Object Forensics -->
-    <div class="card">
-        <h2>Byte-Level Object Forensics</h2>
-        {% if suspicious_objects %}
-            <ul>
-            {% for obj in suspicious_objects %}
-                <li>
-                    <b>Object #{{obj.object_number}}</b>
-                    <pre>{{obj.preview}}</pre>
-                </li>
-            {% endfor %}
-            </ul>
-        {% else %}
-            <p style="color:var(--success);"><b>No suspicious PDF objects detected.</b></p>
-        {% endif %}
-    </div>
-
-    <!-- Heatmap -->
-    <div class="card">
-        <h2>Suspicious Character Heatmap</h2>
-        {% if heatmap_b64 %}
-            <img class="heatmap-img" src="data:image/png;base64,{{heatmap_b64}}">
-        {% else %}
-            <p>No suspicious characters found.</p>
-        {% endif %}
-    </div>
-
-    <!-- Font Character Table -->
-    <div class="card">
-        <h2>Font–Character Usage</h2>
-        {% if font_characters %}
-            {% for font, chars in font_characters.items() %}
-            <h3>{{font}}</h3>
-            <table>
-                <tr><th>Character</th><th>Count</th></tr>
-                {% for char, count in chars.items() %}
-                <tr>
-                    <td>
-                        {% set cp = char|ord|format_codepoint %}
-                        {% set uname = char|unicodename %}
-                        {% if uname.startswith("ARABIC") or uname.startswith("LATIN") or uname.startswith("DIGIT") %}
-                            {{char}} [U+{{cp}} {{uname}}]
-                        {% else %}
-                            <span class="invisible-char">U+{{cp}} {{uname}}</span>
-                        {% endif %}
-                    </td>
-                    <td>{{count}}</td>
-                </tr>
-                {% endfor %}
-            </table>
-            <p><b>Unique Characters:</b> {{chars|length}}</p>
-            {% endfor %}
-        {% else %}
-            <p>No font data available.</p>
-        {% endif %}
-    </div>
-
-    <!-- Suspicious Characters -->
-    <div class="card">
-        <h2>Suspicious Characters</h2>
-        {% if suspicious %}
-            <ul>
-                {% for s in suspicious %}
-                <li class="suspicious">Page {{s.page}}:
-                    <b>{{s.codepoint}}</b> ({{s.name}}) — Font: {{s.fontname}}, Pos: {{s.position}}
-                </li>
-                {% endfor %}
-            </ul>
-        {% else %}
-            <p style="color:var(--success);"><b>No suspicious characters detected.</b></p>
-        {% endif %}
-    </div>
-
-       
-</div>
-</body>
-</html>
-"""
-
-    template = env.from_string(template_str)
-    return template.render(
-        total_chars=summary["total_chars"],
-        fonts_used=", ".join([f[0] for f in summary.get("fonts_used_top", [])]),
-        mixed_scripts_hint=summary["mixed_scripts_hint"],
-        zero_width_count=summary["zero_width_count"],
-        rtl_marks_count=summary["rtl_marks_count"],
-        suspicious_count=summary["suspicious_count"],
-        total_score=risk.get("total_score", 0),
-        risk_level=risk.get("risk_level", "Unknown"),
-        score_breakdown=score_breakdown,
-        suspicious=suspicious,
-        font_characters=font_characters,
-        heatmap_b64=heatmap_b64,
-        suspicious_objects=suspicious_objects or [],
-
-    )
+    # templates/stego_report.html, compiled once per process (core/report.py)
+    from core.report import render_report
+    return render_report(result, heatmap_b64, suspicious_objects)
+
+def html_report_bytes(result, heatmap_b64=None, suspicious_objects=None):
+    # UTF-8 report for st.download_button, which keeps its own copy of the
+    # bytes; streaming into the buffer skips the intermediate str
+    from core.report import write_report
+    buf = io.BytesIO()
+    write_report(buf, result, heatmap_b64, suspicious_objects)
+    return buf.getvalue()
 
 # -------------------------------------------------------
 # --------------------- Main Logic ----------------------
 # -------------------------------------------------------
 
 if uploaded_file:
-    with tempfile.NamedTemporaryFile(delete=False, suffix=".pdf") as tmp_pdf:
-        tmp_pdf.write(uploaded_file.read())
-        pdf_path = tmp_pdf.name
-
     st.success("✅ PDF uploaded successfully!")
 
-    result = analyze_pdf(pdf_path)
+    # One session shared by the analysis and the byte-level object scan,
+    # reading the upload's buffer in place (no temp file or extra copy);
+    # reruns and repeated uploads are served from the result cache
+    with PdfDocument(uploaded_file) as doc:
+        result = cached_analyze_pdf(doc)
+
+        # ALSO compute byte-level objects for this PDF
+        suspicious_objects = flag_suspicious_pdf_objects(doc)
+
     summary = result["summary"]
     risk = result.get("risk_score", {})
 
-    # ALSO compute byte-level objects for this PDF
-    suspicious_objects = flag_suspicious_pdf_objects(pdf_path)
-
     # Stat Cards
     st.markdown("<div class='sub-header'>📊 Quick PDF Summary</div>", unsafe_allow_html=True)
 
@@ -472,14 +186,12 @@ if uploaded_file:
     st.markdown("<div class='sub-header'>📥 Generate Full HTML Report</div>", unsafe_allow_html=True)
 
     heatmap_b64 = get_heatmap_base64(result.get("suspicious", []))
-    html_report = generate_html_report(result, heatmap_b64, suspicious_objects)
-
-    if st.button("Download HTML Report"):
-        b64 = base64.b64encode(html_report.encode()).decode()
-        st.markdown(
-            f'<a class="download-btn" href="data:text/html;base64,{b64}" download="pdf_stego_report.html">Download Report</a>',
-            unsafe_allow_html=True
-        )
+    st.download_button(
+        "Download HTML Report",
+        data=html_report_bytes(result, heatmap_b64, suspicious_objects),
+        file_name="pdf_stego_report.html",
+        mime="text/html",
+    )
 
 else:
     st.info("👆 Please upload a PDF file to begin analysis.")
@@ -1,81 +1,147 @@
+import argparse
 import json
-import sys
-from core.analyzer import analyze_pdf
-
-# Add PyMuPDF import for font info
-import fitz
+import os
+from core.analyzer import analyze_pdf, BACKENDS
+from core.document import PdfDocument
+from core.limits import add_limit_arguments, limited_analyze_pdf, limits_from_args
+from core.metrics import NULL_PROFILER, Profiler, to_prometheus
+from core.objscan import flag_suspicious_pdf_objects
+from core.streaming import StreamingAnalysis
 
 def print_pdf_fonts(pdf_path):
-    doc = fitz.open(pdf_path)
+    doc = PdfDocument.open(pdf_path)
     font_info = {}
-    for page in doc:
-        for f in page.get_fonts(full=True):
-            font_name = f[3]
-            font_type = f[6] if len(f) > 6 else "Unknown"
-            # Convert font_type to string for safe searching
-            is_embedded = ("Subset" in font_name) or ("Embedded" in str(font_type))
-            font_info[font_name] = {
-                "type": font_type,
-                "embedded": is_embedded
-            }
-    doc.close()
+    for f in doc.fonts():
+        # Keyed by xref so distinct subsets sharing a base name are all listed
+        font_info[f"{f['name']} [xref {f['xref']}]"] = {
+            "type": f["type"] or "Unknown",
+            "embedded": f["sha256"] is not None
+        }
+    if doc is not pdf_path:
+        doc.close()
     print("\n===== PDF FONT USAGE =====")
     for name, info in font_info.items():
         status = "Embedded (subset or full)" if info["embedded"] else "Not embedded"
         print(f"  - {name} ({info['type']}): {status}")
 
-def flag_suspicious_pdf_objects(pdf_path):
-    suspicious_objects = []
-    doc = fitz.open(pdf_path)
-    for obj_num in range(1, doc.xref_length()):
-        try:
-            obj_str = doc.xref_object(obj_num)
-            # Flag objects containing non-ASCII bytes or suspicious keywords
-            if any(b > 127 for b in obj_str.encode(errors='ignore')) or b'/JBIG2Decode' in obj_str.encode():
-                suspicious_objects.append({
-                    "object_number": obj_num,
-                    "preview": obj_str[:80]
-                })
-        except Exception:
-            continue
-    doc.close()
-    return suspicious_objects
-
 if __name__ == "__main__":
     # Accept path from command line or use default
-    if len(sys.argv) > 1:
-        path = sys.argv[1]
-    else:
-        path = "data/benign/sample.pdf"  # Default test file
-    
+    parser = argparse.ArgumentParser(description="PDF Ligature Stego Sniffer")
+    parser.add_argument("path", nargs="?", default="data/benign/sample.pdf",
+                        help="PDF to analyze (default: data/benign/sample.pdf)")
+    parser.add_argument("--backend", choices=sorted(BACKENDS), default="pdfminer",
+                        help="character extraction backend (default: pdfminer)")
+    parser.add_argument("--stream", action="store_true",
+                        help="analyze page by page with bounded memory, printing running results")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="processes for page-parallel extraction (default: 1)")
+    parser.add_argument("--triage", type=float, nargs="?", const=70, default=None, metavar="THRESHOLD",
+                        help="stop once the score is proven above/below THRESHOLD (default 70)")
+    parser.add_argument("--sample", type=int, nargs="?", const=50, default=None, metavar="PAGES",
+                        help="large documents: analyze the first/last pages plus PAGES stratified random pages "
+                             "(default 50), escalating to a full scan when the sample looks suspicious")
+    parser.add_argument("--page-cache", metavar="PATH", default=None,
+                        help="SQLite per-page cache; only new or edited pages are re-extracted")
+    parser.add_argument("--profile", action="store_true",
+                        help="record wall/CPU time, memory and item counts per stage")
+    parser.add_argument("--prometheus", metavar="PATH", default=None,
+                        help="with --profile, also write the stage metrics in Prometheus text format")
+    add_limit_arguments(parser)
+    args = parser.parse_args()
+    limits = limits_from_args(args)
+    path = args.path
+
     print(f"📄 Analyzing: {path}")
 
+    if not os.path.isfile(path):
+        print(f"❌ File not found: {path}")
+        print(f"💡 Usage: python run_analyzer.py <path_to_pdf>")
+        exit(1)
+
+    # One session shared by the font listing, object scan and analysis
+    doc = PdfDocument(path)
+
     # Print font usage summary before analysis
-    print_pdf_fonts(path)
+    print_pdf_fonts(doc)
+
+    profiler = Profiler() if args.profile else NULL_PROFILER
 
     # Print suspicious PDF objects (byte-level flags)
-    suspicious_objects = flag_suspicious_pdf_objects(path)
+    with profiler.stage("objscan") as items:
+        suspicious_objects = flag_suspicious_pdf_objects(doc)
+        items["flagged"] = len(suspicious_objects)
     print("\n===== SUSPICIOUS PDF OBJECTS (BYTE-LEVEL) =====")
     if suspicious_objects:
         for obj in suspicious_objects:
-            print(f"Object #{obj['object_number']}: {obj['preview']}")
+            marks = ", ".join("/" + k for k in obj["keywords"])
+            print(f"Object #{obj['object_number']}: {obj['preview']}" + (f"  [{marks}]" if marks else ""))
         print(f"Total suspicious objects: {len(suspicious_objects)}")
     else:
         print("✅ No suspicious PDF objects detected.")
 
+    page_cache = None
+    if args.page_cache:
+        from core.page_cache import PageCache
+        page_cache = PageCache(args.page_cache)
+
     try:
-        with open(path, "rb") as f:
-            result = analyze_pdf(f)
-    except FileNotFoundError:
-        print(f"❌ File not found: {path}")
-        print(f"💡 Usage: python run_analyzer.py <path_to_pdf>")
-        exit(1)
+        if limits:
+            # Budgets are enforced in a worker process that is killed on overrun
+            result = limited_analyze_pdf(path, limits, backend=args.backend, triage=args.triage,
+                                         sample=args.sample, streaming=args.stream, page_cache_path=args.page_cache,
+                                         profile=args.profile or None)
+            if result["status"] != "ok":
+                print(f"\n❌ Analysis stopped ({result['status']}): {result['error']}")
+                doc.close()
+                exit(1)
+        elif args.triage is not None:
+            result = analyze_pdf(doc, backend=args.backend, triage=args.triage, profile=profiler)
+        elif args.sample is not None:
+            result = analyze_pdf(doc, backend=args.backend, sample=args.sample, profile=profiler)
+        elif args.stream:
+            stream = StreamingAnalysis(doc, backend=args.backend, page_cache=page_cache)
+            print("\n===== PAGE-BY-PAGE SCAN =====")
+            with profiler.stage("streaming") as items:
+                for partial in stream:
+                    running = partial["risk_score"]
+                    print(
+                        f"Page {partial['page']}: {partial['page_summary']['total_chars']} chars, "
+                        f"{len(partial['suspicious'])} suspicious | running score "
+                        f"{running['total_score']} ({running['risk_level']})"
+                    )
+                items["pages"] = stream.pages
+                items["chars"] = stream.total_chars
+            result = stream.result()
+            if profiler.enabled:
+                result["metrics"] = profiler.as_dict()
+        else:
+            result = analyze_pdf(doc, backend=args.backend, workers=args.workers, page_cache=page_cache,
+                                 profile=profiler)
     except Exception as e:
         print(f"❌ Error analyzing PDF: {e}")
         import traceback
         traceback.print_exc()
         exit(1)
 
+    triage = result.get("triage")
+    if triage:
+        print("\n===== TRIAGE =====")
+        print(f"Decision: {triage['decision']} {triage['threshold']} "
+              f"(score bounds {triage['score_bounds'][0]}–{triage['score_bounds'][1]}, "
+              f"stopped at {triage['stage']}, {triage['pages_analyzed']}/{triage['page_count']} pages)")
+
+    sampling = result.get("sampling")
+    if sampling:
+        print("\n===== PAGE SAMPLING =====")
+        print(f"Pages analyzed: {sampling['pages_analyzed']}/{sampling['page_count']} "
+              f"(coverage {sampling['coverage']:.1%})")
+        if sampling["escalated"]:
+            print(f"Escalated to a full scan: sample density {sampling['sample_density_pct']}% "
+                  f">= {sampling['escalate_density_pct']}%")
+        else:
+            print(f"Confidence: {sampling['confidence']:.1%} of catching hidden characters on "
+                  f">= {sampling['min_fraction']:.0%} of pages (sample density {sampling['sample_density_pct']}%)")
+
     # ---------------------------
     # PDF Summary Section
     # ---------------------------
@@ -95,7 +161,8 @@ if __name__ == "__main__":
             factor_display = factor.replace("_", " ").title()
             print(f"  • {factor_display}: {data.get('score', 0)} points")
             if "count" in data:
-                print(f"    └─ {data['count']} occurrence(s)")
+                estimated = " (estimated from sample)" if data.get("estimated") else ""
+                print(f"    └─ {data['count']} occurrence(s){estimated}")
             if "density_pct" in data:
                 print(f"    └─ Density: {data['density_pct']}%")
             if "detected" in data:
@@ -103,6 +170,24 @@ if __name__ == "__main__":
             if "fonts" in data:
                 print(f"    └─ Flagged fonts: {', '.join(data['fonts'])}")
 
+    # ---------------------------
+    # Incremental Updates
+    # ---------------------------
+    revisions = result.get("revisions", {})
+    if revisions.get("count", 1) > 1 or revisions.get("trailing_bytes"):
+        print("\n===== INCREMENTAL UPDATES =====")
+        print(f"Revisions: {revisions['count']}  Trailing bytes after last %%EOF: {revisions['trailing_bytes']}")
+        for rev in revisions["breakdown"]:
+            label = "base" if rev["revision"] == 0 else f"update {rev['revision']}"
+            print(f"  • {label} [bytes {rev['start']}-{rev['end']}]: "
+                  f"{rev['objects_changed']} object(s), pages {rev['pages_touched'] or '-'}, "
+                  f"{rev['suspicious_count']} suspicious char(s)")
+            for obj in rev["flagged_objects"]:
+                marks = ", ".join("/" + k for k in obj["keywords"]) or "non-ASCII"
+                print(f"    └─ Object #{obj['object_number']}: {marks}")
+    elif "error" in revisions:
+        print(f"\n⚠️ {revisions['error']}")
+
     # ---------------------------
     # Suspicious Unicode Report
     # ---------------------------
@@ -128,7 +213,9 @@ if __name__ == "__main__":
         print("\n===== FONT GLYPH REPORT =====")
         for f in fonts_report:
             name = f.get("font_name", "N/A")
-            glyphs = f.get("glyph_count", "N/A")
+            glyphs = f.get("glyph_count")
+            if glyphs is None:
+                glyphs = "N/A"
             arabic_g = f.get("arabic_glyphs", "—")
             latin_g = f.get("latin_glyphs", "—")
             flag = f.get("flag", "")
@@ -153,5 +240,24 @@ if __name__ == "__main__":
                 print(f"  '{printable}': {count}")
             print(f"  Unique characters: {len(chars)}")
 
+    # ---------------------------
+    # Stage Metrics
+    # ---------------------------
+    metrics = result.get("metrics")
+    if metrics:
+        print("\n===== STAGE METRICS =====")
+        for stage, m in metrics["stages"].items():
+            py_peak = f"{m['py_peak_kb']} KiB" if m["py_peak_kb"] is not None else "n/a"
+            counts = ", ".join(f"{k}={v}" for k, v in m["items"].items())
+            print(f"  • {stage:<11} wall {m['wall_s']:.3f}s | cpu {m['cpu_s']:.3f}s | "
+                  f"py peak {py_peak} | rss {m['rss_peak_kb']} KiB" + (f" | {counts}" if counts else ""))
+        total = metrics["total"]
+        print(f"  Total: wall {total['wall_s']:.3f}s, cpu {total['cpu_s']:.3f}s")
+        if args.prometheus:
+            with open(args.prometheus, "w", encoding="utf-8") as f:
+                f.write(to_prometheus([({"document": os.path.basename(path), "backend": args.backend}, metrics)]))
+            print(f"  Prometheus metrics written to {args.prometheus}")
+
+    doc.close()
     print("\n" + "="*60)
     print("✅ Analysis complete!")
\ No newline at end of file
@@ -0,0 +1,43 @@
+import argparse
+import asyncio
+import sys
+from core.analyzer import BACKENDS
+from core.limits import add_limit_arguments, limits_from_args
+from core.service import DEFAULT_MAX_UPLOAD, DEFAULT_QUEUE_SIZE, serve
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Long-running HTTP service: POST a PDF to /scan and get the analysis as JSON"
+    )
+    parser.add_argument("--host", default="127.0.0.1", help="bind address (default: 127.0.0.1)")
+    parser.add_argument("--port", type=int, default=8088, help="port (default: 8088)")
+    parser.add_argument("--workers", type=int, default=None, help="warm worker processes (default: CPU count)")
+    parser.add_argument("--queue", type=int, default=DEFAULT_QUEUE_SIZE,
+                        help=f"uploads allowed to wait before answering 503 (default: {DEFAULT_QUEUE_SIZE})")
+    parser.add_argument("--timeout", type=float, default=None, help="per-document timeout in seconds")
+    parser.add_argument("--max-upload", type=int, default=DEFAULT_MAX_UPLOAD,
+                        help=f"largest accepted upload in bytes (default: {DEFAULT_MAX_UPLOAD})")
+    parser.add_argument("--backend", choices=sorted(BACKENDS), default="pdfminer",
+                        help="character extraction backend (default: pdfminer)")
+    parser.add_argument("--triage", type=float, nargs="?", const=70, default=None, metavar="THRESHOLD",
+                        help="early-exit mode: only decide whether the score reaches THRESHOLD (default 70)")
+    parser.add_argument("--cache", metavar="DIR", default=None,
+                        help="result cache directory shared by all workers (default: no cache)")
+    parser.add_argument("--font-cache", metavar="PATH", default=None,
+                        help="SQLite font-report cache shared by all workers (default: no cache)")
+    parser.add_argument("--page-cache", metavar="PATH", default=None,
+                        help="SQLite per-page character cache shared by all workers (default: no cache)")
+    add_limit_arguments(parser)
+    args = parser.parse_args()
+
+    print(f"🚀 Serving on http://{args.host}:{args.port} (POST /scan, GET /health)", file=sys.stderr)
+    try:
+        asyncio.run(serve(
+            args.host, args.port, max_upload=args.max_upload,
+            workers=args.workers, queue_size=args.queue, timeout=args.timeout,
+            backend=args.backend, triage=args.triage, cache_dir=args.cache,
+            font_cache_path=args.font_cache, page_cache_path=args.page_cache,
+            limits=limits_from_args(args),
+        ))
+    except KeyboardInterrupt:
+        pass
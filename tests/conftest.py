@@ -0,0 +1,74 @@
+# tests/conftest.py
+import os
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+def write_pdf(path: str, objects) -> str:
+    """
+    Minimal PDF from raw object bodies (object n is objects[n - 1]; object
+    1 must be the catalog), with a correct xref table.
+    """
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(out))
+        out += b"%d 0 obj\n" % number + body + b"\nendobj\n"
+    start = len(out)
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    out += b"".join(b"%010d 00000 n \n" % offset for offset in offsets)
+    out += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, start)
+    with open(path, "wb") as f:
+        f.write(out)
+    return path
+
+def pdf_stream(data: bytes, entries: bytes = b"") -> bytes:
+    return b"<< /Length %d %s>>\nstream\n" % (len(data), entries) + data + b"\nendstream"
+
+@pytest.fixture
+def untyped_font_pdf(tmp_path):
+    """
+    One page drawing "Hello" with a Helvetica font dictionary that has no
+    /Type key and whose Differences map 'e' to U+200B and 'l' to U+202E.
+    Also carries an inline Courier font, a Times-Roman font used only
+    inside a Form XObject, and a Symbol font no page references.
+    """
+    content = b"BT /F1 24 Tf 72 700 Td (Hello) Tj ET q /X1 Do Q BT /F3 12 Tf 72 500 Td (inline) Tj ET"
+    form = b"BT /F2 12 Tf 72 600 Td (form) Tj ET"
+    return write_pdf(str(tmp_path / "untyped_font.pdf"), [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        b"<< /Type /Pages /Kids [3 0 R] /Count 1 >>",
+        b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] /Resources << /Font << /F1 4 0 R"
+        b" /F3 << /Type /Font /Subtype /Type1 /BaseFont /Courier >> >> /XObject << /X1 6 0 R >> >>"
+        b" /Contents 5 0 R >>",
+        b"<< /Subtype /Type1 /BaseFont /Helvetica /Encoding << /Differences [101 /uni200B 108 /uni202E] >> >>",
+        pdf_stream(content),
+        pdf_stream(form, b"/Type /XObject /Subtype /Form /BBox [0 0 612 792] /Resources << /Font << /F2 7 0 R >> >> "),
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Times-Roman >>",
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Symbol >>",
+    ])
+
+@pytest.fixture(scope="session")
+def multipage_pdf(tmp_path_factory):
+    """12-page synthetic Urdu/Latin document with injected invisible marks (bench.corpus)."""
+    from bench.corpus import build_pdf, bundled_fonts
+
+    path = str(tmp_path_factory.mktemp("corpus") / "multipage.pdf")
+    build_pdf(path, bundled_fonts()[0], pages=12, lines=20, rate=0.02, seed=1)
+    return path
+
+def comparable(result):
+    """An analyze_pdf result with its CharTables as bytes, for equality checks."""
+    from core.chartable import CharTable
+
+    if isinstance(result, CharTable):
+        return result.to_bytes()
+    if isinstance(result, dict):
+        return {k: comparable(v) for k, v in result.items() if k != "metrics"}
+    if isinstance(result, (list, tuple)):
+        return type(result)(comparable(v) for v in result)
+    return result
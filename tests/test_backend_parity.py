@@ -0,0 +1,52 @@
+# tests/test_backend_parity.py
+"""
+The pymupdf extraction backend must yield the same records as pdfminer
+on the bundled sample PDFs.
+"""
+import os
+from collections import Counter, defaultdict
+
+import pytest
+
+from core.analyzer import iter_pdf_pages
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SAMPLES = ("test.pdf", "urdu_compare_report.pdf")
+
+# Points; MuPDF and pdfminer round glyph advances slightly differently
+BBOX_TOLERANCE = 0.05
+
+def _pages(name, backend):
+    return list(iter_pdf_pages(os.path.join(ROOT, name), backend))
+
+def _keys(table):
+    return Counter((r["char"], r["fontname"], round(r["size"], 3)) for r in table)
+
+def _boxes(table):
+    # The top edge is left out: pdfminer puts it at bottom + font size,
+    # MuPDF at the font's ascender, so it differs by design
+    boxes = defaultdict(list)
+    for r in table:
+        boxes[(r["char"], r["fontname"])].append((r["x0"], r["y0"], r["x1"]))
+    return boxes
+
+@pytest.mark.parametrize("name", SAMPLES)
+def test_same_chars_per_page(name):
+    pdfminer, pymupdf = _pages(name, "pdfminer"), _pages(name, "pymupdf")
+    assert len(pdfminer) == len(pymupdf)
+    for page_no, (expected, actual) in enumerate(zip(pdfminer, pymupdf), start=1):
+        assert _keys(actual) == _keys(expected), f"page {page_no}"
+
+@pytest.mark.parametrize("name", SAMPLES)
+def test_bboxes_within_tolerance(name):
+    for expected, actual in zip(_pages(name, "pdfminer"), _pages(name, "pymupdf")):
+        candidates = _boxes(actual)
+        for key, boxes in _boxes(expected).items():
+            remaining = candidates[key]
+            for box in boxes:
+                # Reading order differs between the backends; pair each
+                # glyph with the closest unmatched one of the same char/font
+                distances = [max(abs(a - b) for a, b in zip(box, other)) for other in remaining]
+                best = min(range(len(remaining)), key=distances.__getitem__)
+                assert distances[best] <= BBOX_TOLERANCE, f"{key} at {box}"
+                remaining.pop(best)
@@ -0,0 +1,62 @@
+# tests/test_batch.py
+"""
+run_batch reports a worker that dies, at start-up or mid-document, as a
+"crash" record and carries on with the rest of the batch;
+limited_analyze_pdf returns the same record instead of raising.
+"""
+import multiprocessing
+import os
+import signal
+
+import pytest
+
+import core.analyzer
+import core.warm
+from core.batch import run_batch
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SAMPLE = os.path.join(ROOT, "test.pdf")
+
+# Workers pick up the patches below only when forked from this process
+pytestmark = pytest.mark.skipif(multiprocessing.get_start_method() != "fork", reason="needs fork")
+
+def _kill_self(*args, **kwargs):
+    os.kill(os.getpid(), signal.SIGKILL)
+
+def _copies(tmp_path, names):
+    with open(SAMPLE, "rb") as f:
+        data = f.read()
+    paths = []
+    for name in names:
+        path = tmp_path / name
+        path.write_bytes(data)
+        paths.append(str(path))
+    return paths
+
+def test_worker_killed_mid_document(tmp_path, monkeypatch):
+    analyze_pdf = core.analyzer.analyze_pdf
+
+    def dies_on_crash_pdf(source, **options):
+        if os.path.basename(source).startswith("crash"):
+            _kill_self()
+        return analyze_pdf(source, **options)
+
+    monkeypatch.setattr(core.analyzer, "analyze_pdf", dies_on_crash_pdf)
+    paths = _copies(tmp_path, ["a.pdf", "crash.pdf", "b.pdf", "c.pdf"])
+    records = {os.path.basename(r["path"]): r for r in run_batch(paths, workers=2)}
+    assert records["crash.pdf"]["status"] == "crash"
+    assert [records[n]["status"] for n in ("a.pdf", "b.pdf", "c.pdf")] == ["ok"] * 3
+
+def test_worker_killed_during_start_up(tmp_path, monkeypatch):
+    monkeypatch.setattr(core.warm, "warm_up", _kill_self)
+    paths = _copies(tmp_path, ["a.pdf", "b.pdf", "c.pdf"])
+    records = list(run_batch(paths, workers=2))
+    assert sorted(os.path.basename(r["path"]) for r in records) == ["a.pdf", "b.pdf", "c.pdf"]
+    assert {r["status"] for r in records} == {"crash"}
+
+def test_limited_analysis_worker_killed_during_start_up(monkeypatch):
+    from core.limits import Limits, limited_analyze_pdf
+
+    monkeypatch.setattr(core.warm, "warm_up", _kill_self)
+    record = limited_analyze_pdf(SAMPLE, Limits(max_pages=10))
+    assert record["status"] == "crash" and record["path"] == SAMPLE
@@ -0,0 +1,33 @@
+# tests/test_document_fonts.py
+"""
+PdfDocument.fonts() lists the fonts pages reference, like PyMuPDF's
+per-page get_fonts() did, without its per-page cost.
+"""
+import os
+
+import pytest
+
+from core.document import PdfDocument
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def _page_fonts(path):
+    import fitz
+
+    with fitz.open(path) as doc:
+        return {(xref, basefont) for page in doc for xref, _ext, _type, basefont, *_ in page.get_fonts(full=True)}
+
+@pytest.mark.parametrize("name", ["test.pdf", "urdu_compare_report.pdf"])
+def test_inventory_matches_get_fonts(name):
+    path = os.path.join(ROOT, name)
+    with PdfDocument(path) as doc:
+        assert {(f["xref"], f["name"]) for f in doc.fonts()} == _page_fonts(path)
+
+def test_untyped_inline_and_form_fonts_are_listed(untyped_font_pdf):
+    with PdfDocument(untyped_font_pdf) as doc:
+        inventory = {(f["xref"], f["name"]) for f in doc.fonts()}
+    assert inventory == _page_fonts(untyped_font_pdf)
+    assert (4, "Helvetica") in inventory  # no /Type key
+    assert (0, "Courier") in inventory  # inline dictionary
+    assert (7, "Times-Roman") in inventory  # Form XObject resources
+    assert "Symbol" not in {name for _xref, name in inventory}  # referenced by no page
@@ -0,0 +1,75 @@
+# tests/test_font_report.py
+"""
+The lazy font parser (maxp plus raw cmap) must count the same glyphs as a
+full fontTools parse, and cached reports must equal fresh ones.
+"""
+import os
+from io import BytesIO
+
+import pytest
+
+from bench.corpus import bundled_fonts
+import core.analyzer
+from core.analyzer import _ARABIC_RANGES, _LATIN_RANGES, font_glyph_report, inspect_font_glyphs
+from core.document import PdfDocument
+from core.font_cache import FontReportCache
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SAMPLES = ("test.pdf", "urdu_compare_report.pdf")
+
+def _programs():
+    for path in bundled_fonts():
+        with open(path, "rb") as f:
+            yield os.path.basename(path), f.read()
+    for name in SAMPLES:
+        with PdfDocument(os.path.join(ROOT, name)) as doc:
+            for font in doc.fonts():
+                if font["content"]:
+                    yield f"{name}:{font['name']}", font["content"]
+
+def _eager_report(data):
+    from fontTools.ttLib import TTFont
+
+    font = TTFont(BytesIO(data))
+    cmap = font.getBestCmap() or {}
+
+    def gids(ranges):
+        ids = {font.getGlyphID(cmap[c]) for c in cmap if any(lo <= c <= hi for lo, hi in ranges)}
+        return ids - {0}
+
+    arabic = gids(_ARABIC_RANGES)
+    return len(font.getGlyphOrder()), len(arabic), len(gids(_LATIN_RANGES) - arabic)
+
+PROGRAMS = list(_programs())
+
+@pytest.mark.parametrize("name,data", PROGRAMS, ids=[name for name, _data in PROGRAMS])
+def test_lazy_matches_eager_parse(name, data):
+    report = font_glyph_report(data)
+    if report["glyph_count"] is None:
+        pytest.skip(f"not an sfnt font: {report['flag']}")
+    assert (report["glyph_count"], report["arabic_glyphs"], report["latin_glyphs"]) == _eager_report(data)
+
+def test_unparseable_font_is_reported():
+    assert font_glyph_report(b"not a font")["flag"].startswith("error: ")
+
+@pytest.mark.parametrize("preload", [False, True])
+def test_cached_reports_equal_fresh(tmp_path, preload):
+    path = os.path.join(ROOT, "urdu_compare_report.pdf")
+    fresh = inspect_font_glyphs(path)
+    cache = FontReportCache(str(tmp_path / "fonts.sqlite"))
+    assert inspect_font_glyphs(path, cache) == fresh
+    if preload:
+        assert cache.preload(f"{core.analyzer.ANALYZER_VERSION}:") == len(cache)
+    assert inspect_font_glyphs(path, cache) == fresh
+    embedded = sum(r["glyph_count"] is not None for r in fresh)
+    assert cache.stats()["hits"] == cache.stats()["misses"] == embedded
+    cache.close()
+
+def test_analyzer_version_keys_reports(tmp_path, monkeypatch):
+    path = os.path.join(ROOT, "test.pdf")
+    cache = FontReportCache(str(tmp_path / "fonts.sqlite"))
+    inspect_font_glyphs(path, cache)
+    monkeypatch.setattr(core.analyzer, "ANALYZER_VERSION", "next")
+    inspect_font_glyphs(path, cache)
+    assert cache.stats()["hits"] == 0 and len(cache) == cache.stats()["misses"] == 2
+    cache.close()
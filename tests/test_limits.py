@@ -0,0 +1,80 @@
+# tests/test_limits.py
+"""
+Budgets stop a document with LimitExceeded (in process) or a "limit"
+record (in a worker), naming the budget and the stage that hit it.
+"""
+import multiprocessing
+import os
+
+import pytest
+
+from core.analyzer import analyze_pdf
+from core.limits import LimitExceeded, Limits, StageReporter, job_deadline, limited_analyze_pdf
+from core.metrics import Profiler
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SAMPLE = os.path.join(ROOT, "urdu_compare_report.pdf")
+
+def test_check():
+    limits = Limits(max_chars=10)
+    limits.check("max_chars", 10)
+    limits.check("max_pages", 10**9)  # disabled budget
+    with pytest.raises(LimitExceeded) as e:
+        limits.check("max_chars", 11, "extraction")
+    assert e.value.record_fields() == {"budget": "max_chars", "limit": 10, "stage": "extraction"}
+    assert str(e.value) == "max_chars exceeded (11 > 10) in stage extraction"
+    assert not Limits() and Limits(max_pages=1)
+
+@pytest.mark.parametrize("limits,budget,stage", [
+    (Limits(max_pages=1), "max_pages", "open"),
+    (Limits(max_objects=5), "max_objects", "open"),
+    (Limits(max_font_bytes=100), "max_font_bytes", "fonts"),
+])
+@pytest.mark.parametrize("mode", [{}, {"streaming": True}, {"triage": 70}, {"sample": 1}])
+def test_document_budgets_in_every_mode(limits, budget, stage, mode):
+    with pytest.raises(LimitExceeded) as e:
+        analyze_pdf(SAMPLE, limits=limits, **mode)
+    assert (e.value.budget, e.value.stage) == (budget, stage)
+
+@pytest.mark.parametrize("mode,stage", [
+    ({}, "extraction"), ({"streaming": True}, "streaming"), ({"triage": 70}, "triage"), ({"sample": 1}, "sampling"),
+])
+def test_char_budget_in_every_mode(mode, stage):
+    with pytest.raises(LimitExceeded) as e:
+        analyze_pdf(SAMPLE, limits=Limits(max_chars=100), **mode)
+    assert (e.value.budget, e.value.stage) == ("max_chars", stage)
+
+def test_generous_limits_change_nothing():
+    limits = Limits(max_pages=10, max_chars=10**6, max_objects=10**4, max_font_bytes=10**8)
+    result = analyze_pdf(SAMPLE, limits=limits)
+    assert result["summary"] == analyze_pdf(SAMPLE)["summary"]
+
+def test_worker_reports_limit_record():
+    record = limited_analyze_pdf(SAMPLE, Limits(max_chars=100))
+    assert record["status"] == "limit"
+    assert (record["budget"], record["limit"], record["stage"]) == ("max_chars", 100, "extraction")
+
+def test_worker_stage_timeout():
+    record = limited_analyze_pdf(SAMPLE, Limits(stage_timeout=0.001))
+    assert record["status"] == "limit" and record["budget"] == "stage_timeout"
+    assert record["stage"] is not None
+
+def test_worker_within_limits_is_ok():
+    record = limited_analyze_pdf(SAMPLE, Limits(max_pages=10, stage_timeout=60))
+    assert record["status"] == "ok"
+    assert record["summary"] == analyze_pdf(SAMPLE)["summary"]
+
+def test_stage_reporter_announces_and_records():
+    parent, child = multiprocessing.Pipe()
+    reporter = StageReporter(child, Profiler(trace_memory=False))
+    for name in ("extraction", "fonts"):
+        with reporter.stage(name) as items:
+            items["n"] = 1
+    assert [parent.recv(), parent.recv()] == [("stage", "extraction"), ("stage", "fonts")]
+    assert not parent.poll()
+    assert list(reporter.as_dict()["stages"]) == ["extraction", "fonts"]
+
+def test_job_deadline_takes_the_earlier_budget():
+    assert job_deadline(100.0, 100.0, None, None) == (None, "timeout")
+    assert job_deadline(100.0, 150.0, 60, Limits(stage_timeout=5)) == (155.0, "stage_timeout")
+    assert job_deadline(100.0, 158.0, 60, Limits(stage_timeout=5)) == (160.0, "timeout")
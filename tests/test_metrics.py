@@ -0,0 +1,51 @@
+# tests/test_metrics.py
+"""
+profile=True records every analysis stage without changing the result.
+"""
+import os
+import tracemalloc
+
+import pytest
+
+from conftest import comparable
+from core.analyzer import analyze_pdf
+from core.metrics import Profiler, to_prometheus
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SAMPLE = os.path.join(ROOT, "urdu_compare_report.pdf")
+
+def test_profile_records_stages_without_changing_the_result():
+    plain = analyze_pdf(SAMPLE)
+    profiled = analyze_pdf(SAMPLE, profile=True)
+    assert "metrics" not in plain
+    assert comparable(profiled) == comparable(plain)
+
+    stages = profiled["metrics"]["stages"]
+    assert list(stages) == ["extraction", "stats", "fonts", "risk", "revisions"]
+    assert stages["extraction"]["items"]["chars"] == plain["summary"]["total_chars"]
+    assert stages["stats"]["items"]["suspicious"] == len(plain["suspicious"])
+    total = profiled["metrics"]["total"]
+    assert total["wall_s"] == pytest.approx(sum(s["wall_s"] for s in stages.values()), abs=1e-5)
+    assert not tracemalloc.is_tracing()
+
+@pytest.mark.parametrize("mode,stage", [
+    ({"streaming": True}, "streaming"), ({"triage": 70}, "triage"), ({"sample": 1}, "sampling"),
+])
+def test_modes_record_their_stage(mode, stage):
+    stages = analyze_pdf(SAMPLE, profile=True, **mode)["metrics"]["stages"]
+    assert stage in stages and stages[stage]["items"]["pages"] >= 1
+
+def test_repeated_stage_accumulates():
+    profiler = Profiler(trace_memory=False)
+    for n in (2, 3):
+        with profiler.stage("pages") as items:
+            items["pages"] = n
+    stage = profiler.as_dict()["stages"]["pages"]
+    assert stage["items"] == {"pages": 5} and stage["py_peak_kb"] is None
+
+def test_prometheus_labels_every_stage():
+    metrics = analyze_pdf(SAMPLE, profile=Profiler(trace_memory=False))["metrics"]
+    text = to_prometheus([({"document": 'a "b".pdf'}, metrics)])
+    for stage in metrics["stages"]:
+        assert f'stego_sniffer_stage_wall_seconds{{document="a \\"b\\".pdf",stage="{stage}"}}' in text
+    assert 'item="chars"' in text
@@ -0,0 +1,59 @@
+# tests/test_objscan.py
+"""
+Object and raw-byte keyword scanning: names match only on PDF name
+boundaries, hits map back to their enclosing object, and every input
+form (path, bytes, memoryview) gives the same answer.
+"""
+import os
+
+import pytest
+
+from conftest import pdf_stream, write_pdf
+from core.document import PdfDocument
+from core.objscan import flag_suspicious_pdf_objects, scan_file, scan_object, scan_raw
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+@pytest.fixture
+def indicator_pdf(tmp_path):
+    """
+    Object 3 opens JavaScript, object 4 only has /JSON (not /JS) and
+    object 5 names /Launch inside uncompressed stream data.
+    """
+    return write_pdf(str(tmp_path / "indicators.pdf"), [
+        b"<< /Type /Catalog /Pages 2 0 R /OpenAction 3 0 R >>",
+        b"<< /Type /Pages /Kids [] /Count 0 >>",
+        b"<< /S /JavaScript /JS (app.alert(1)) >>",
+        b"<< /Type /JSON /Data (x) >>",
+        pdf_stream(b"% /Launch hidden in stream data"),
+    ])
+
+def test_name_boundaries():
+    assert scan_object("<< /JSON 1 /JS (x) /JavaScriptX 2 >>")["keywords"] == ["JS"]
+    assert scan_object("<</JavaScript/JS(x)>>")["keywords"] == ["JavaScript", "JS"]
+    assert scan_object("<< /Title (café) >>") == {"non_ascii": True, "keywords": []}
+
+def test_flags_objects(indicator_pdf):
+    flagged = {o["object_number"]: o for o in flag_suspicious_pdf_objects(indicator_pdf)}
+    assert flagged[1]["keywords"] == ["OpenAction"]
+    assert flagged[3]["keywords"] == ["JavaScript", "JS"]
+    assert sorted(flagged) == [1, 3]
+
+def test_raw_scan_maps_hits_to_objects(indicator_pdf):
+    with open(indicator_pdf, "rb") as f:
+        data = f.read()
+    hits = [(h["keyword"], h["object_number"]) for h in scan_raw(data)]
+    assert hits == [("OpenAction", 1), ("JavaScript", 3), ("JS", 3), ("Launch", 5)]
+    for hit in scan_raw(data):
+        assert data[hit["offset"]:].startswith(b"/" + hit["keyword"].encode())
+
+@pytest.mark.parametrize("name", ["test.pdf", "urdu_compare_report.pdf"])
+def test_input_forms_agree(name, indicator_pdf):
+    for path in (os.path.join(ROOT, name), indicator_pdf):
+        with open(path, "rb") as f:
+            data = f.read()
+        expected = scan_raw(data)
+        assert scan_raw(memoryview(data)) == expected
+        assert scan_file(path) == expected
+        with PdfDocument(data) as doc:
+            assert scan_file(doc) == expected
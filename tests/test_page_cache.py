@@ -0,0 +1,109 @@
+# tests/test_page_cache.py
+"""
+PageCache serves unchanged pages from SQLite and re-extracts only the
+pages whose content or resources changed.
+"""
+import itertools
+import os
+import pickle
+
+import pytest
+
+import core.analyzer
+from core.analyzer import extract_char_table
+from core.document import PdfDocument
+from core.page_cache import PageCache, extract_char_table_cached
+
+@pytest.fixture
+def three_pages(tmp_path):
+    import fitz
+
+    path = str(tmp_path / "three.pdf")
+    doc = fitz.open()
+    for text in ("first page", "second page", "third page"):
+        doc.new_page().insert_text((72, 72), text)
+    doc.save(path)
+    doc.close()
+    return path
+
+@pytest.fixture
+def cache(tmp_path):
+    cache = PageCache(str(tmp_path / "pages.sqlite"))
+    yield cache
+    cache.close()
+
+def _extract(path, cache, backend="pdfminer"):
+    with PdfDocument(path) as doc:
+        return extract_char_table_cached(doc, backend, cache)
+
+def _edit_second_page(path):
+    import fitz
+
+    doc = fitz.open(path)
+    doc[1].insert_text((72, 120), "added later")
+    doc.saveIncr()
+    doc.close()
+
+def test_hits_equal_fresh_extraction(three_pages, cache):
+    fresh = extract_char_table(three_pages).to_bytes()
+    assert _extract(three_pages, cache).to_bytes() == fresh
+    assert _extract(three_pages, cache).to_bytes() == fresh
+    assert cache.stats()["hits"] == 3 and cache.stats()["misses"] == 3
+
+def test_only_changed_pages_are_extracted(three_pages, cache):
+    _extract(three_pages, cache)
+    _edit_second_page(three_pages)
+
+    cache.hits = cache.misses = 0
+    table = _extract(three_pages, cache)
+    assert cache.stats()["misses"] == 1 and cache.stats()["hits"] == 2
+    assert table.to_bytes() == extract_char_table(three_pages).to_bytes()
+
+def test_short_backend_leaves_pages_empty_and_uncached(three_pages, cache, monkeypatch):
+    full = core.analyzer.BACKENDS["pdfminer"]
+    monkeypatch.setitem(core.analyzer.BACKENDS, "pdfminer",
+                        lambda pdf_file, pages=None: itertools.islice(full(pdf_file, pages), 1))
+    table = _extract(three_pages, cache)
+    assert set(table.page) == {1}
+    assert len(cache) == 1
+
+    monkeypatch.setitem(core.analyzer.BACKENDS, "pdfminer", full)
+    assert _extract(three_pages, cache).to_bytes() == extract_char_table(three_pages).to_bytes()
+
+def test_unreadable_rows_are_misses(three_pages, cache):
+    class Planted:
+        def __reduce__(self):
+            return (os.system, ("exit 1",))
+
+    _extract(three_pages, cache)
+    cache._conn.execute("UPDATE page_tables SET tbl = ?", (pickle.dumps(Planted()),))
+    cache._conn.commit()
+    cache.hits = cache.misses = 0
+    assert _extract(three_pages, cache).to_bytes() == extract_char_table(three_pages).to_bytes()
+    assert cache.stats()["misses"] == 3
+
+def test_revision_history_reuses_unchanged_pages(three_pages, monkeypatch):
+    prior = extract_char_table(three_pages)
+    _edit_second_page(three_pages)
+    full = core.analyzer.BACKENDS["pdfminer"]
+    asked = []
+
+    def recording(pdf_file, pages=None):
+        asked.append(pages)
+        return full(pdf_file, pages)
+
+    monkeypatch.setitem(core.analyzer.BACKENDS, "pdfminer", recording)
+    with PdfDocument(three_pages) as doc:
+        history = doc.revisions()
+        table = history.char_table("pdfminer", len(history) - 2, prior)
+    assert [list(p) for p in asked] == [[1]]
+    assert table.to_bytes() == extract_char_table(three_pages).to_bytes()
+
+def test_revision_history_short_backend(three_pages, monkeypatch):
+    prior = extract_char_table(three_pages)
+    _edit_second_page(three_pages)
+    monkeypatch.setitem(core.analyzer.BACKENDS, "pdfminer", lambda pdf_file, pages=None: iter(()))
+    with PdfDocument(three_pages) as doc:
+        history = doc.revisions()
+        table = history.char_table("pdfminer", len(history) - 2, prior)
+    assert set(table.page) == {1, 3}
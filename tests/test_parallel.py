@@ -0,0 +1,19 @@
+# tests/test_parallel.py
+"""
+Page-parallel extraction must not change analyze_pdf's result.
+"""
+import pytest
+
+from conftest import comparable
+from core.analyzer import analyze_pdf
+
+@pytest.mark.parametrize("backend", ["pdfminer", "pymupdf"])
+def test_workers_match_serial(multipage_pdf, backend):
+    serial = analyze_pdf(multipage_pdf, backend=backend, workers=1)
+    assert serial["summary"]["total_chars"] > 0
+    assert comparable(analyze_pdf(multipage_pdf, backend=backend, workers=3)) == comparable(serial)
+
+def test_workers_match_serial_from_bytes(multipage_pdf):
+    with open(multipage_pdf, "rb") as f:
+        data = f.read()
+    assert comparable(analyze_pdf(data, workers=3)) == comparable(analyze_pdf(multipage_pdf, workers=1))
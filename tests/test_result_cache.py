@@ -0,0 +1,63 @@
+# tests/test_result_cache.py
+"""
+ResultCache hits must equal a fresh analysis, and entries must stop
+matching once ANALYZER_VERSION or a result-changing option changes.
+"""
+import os
+import time
+
+import pytest
+
+import core.cache
+from conftest import comparable
+from core.analyzer import analyze_pdf
+from core.cache import ResultCache, cached_analyze_pdf
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SAMPLE = os.path.join(ROOT, "test.pdf")
+
+@pytest.fixture
+def cache(tmp_path):
+    return ResultCache(str(tmp_path / "results"))
+
+def test_hit_equals_fresh_analysis(cache):
+    fresh = analyze_pdf(SAMPLE)
+    cached_analyze_pdf(SAMPLE, cache)
+    hit = cached_analyze_pdf(SAMPLE, cache)
+    assert cache.stats()["hits"] == 1
+    assert comparable(hit) == comparable(fresh)
+
+def test_analyzer_version_invalidates(cache, monkeypatch):
+    cached_analyze_pdf(SAMPLE, cache)
+    monkeypatch.setattr(core.cache, "ANALYZER_VERSION", "next")
+    cached_analyze_pdf(SAMPLE, cache)
+    assert cache.stats()["hits"] == 0 and cache.stats()["misses"] == 2
+
+def test_options_key_entries(cache):
+    cached_analyze_pdf(SAMPLE, cache)
+    cached_analyze_pdf(SAMPLE, cache, workers=2)  # does not change the result
+    cached_analyze_pdf(SAMPLE, cache, backend="pymupdf")
+    assert cache.stats()["hits"] == 1 and cache.stats()["misses"] == 2
+
+def test_evicts_least_recently_used(tmp_path):
+    cache = ResultCache(str(tmp_path / "results"))
+    cache.put("old", {"value": "x" * 1000})
+    cache.put("new", {"value": "y" * 1000})
+    past = time.time() - 60
+    os.utime(cache._path("old"), (past, past))
+    cache.max_bytes = 1500
+    cache.evict()
+    assert cache.peek("old") is None and cache.peek("new") is not None
+
+def test_malformed_entry_is_a_miss(cache):
+    cache.put("k", {"value": 1})
+    with open(cache._path("k"), "ab") as f:
+        f.write(b"junk")
+    assert cache.get("k") is None
+
+def test_refuses_shared_directory(tmp_path):
+    directory = tmp_path / "shared"
+    directory.mkdir()
+    os.chmod(directory, 0o777)
+    with pytest.raises(PermissionError):
+        ResultCache(str(directory))
@@ -0,0 +1,66 @@
+# tests/test_sampling.py
+"""
+Page sampling: stratified indices, the hypergeometric confidence, and
+samples that cover (or escalate to) every page matching a full analysis.
+"""
+import math
+
+import pytest
+
+from conftest import comparable
+from core.analyzer import analyze_pdf
+from core.document import PdfDocument
+from core.sampling import detection_confidence, sample_page_indices, sampled_analyze_pdf
+
+def _unsampled(result):
+    result = comparable(result)
+    for key in ("sampling", "partial"):
+        result.pop(key, None)
+    result["risk_score"].pop("sampling", None)
+    return result
+
+def _sha256(path):
+    with PdfDocument(path) as doc:
+        return doc.sha256()
+
+def test_indices_cover_edges_and_every_stratum():
+    indices = sample_page_indices(1000, 20, 5, seed="abc")
+    assert indices == sorted(set(indices))
+    assert indices[:5] == [0, 1, 2, 3, 4] and indices[-5:] == [995, 996, 997, 998, 999]
+    interior = indices[5:-5]
+    assert len(interior) == 20
+    assert [(i - 5) * 20 // 990 for i in interior] == list(range(20))
+    assert sample_page_indices(1000, 20, 5, seed="abc") == indices
+    assert sample_page_indices(30, 20, 5, seed="abc") == list(range(30))
+
+@pytest.mark.parametrize("population,drawn,fraction", [(100, 10, 0.01), (990, 50, 0.01), (500, 40, 0.05)])
+def test_confidence_is_hypergeometric(population, drawn, fraction):
+    affected = math.ceil(fraction * population)
+    expected = 1 - math.comb(population - affected, drawn) / math.comb(population, drawn)
+    assert detection_confidence(population, drawn, fraction) == pytest.approx(expected, abs=1e-4)
+
+def test_confidence_edge_cases():
+    assert detection_confidence(100, 100, 0.01) == 1.0
+    assert detection_confidence(100, 0, 0.01) == 0.0
+    assert detection_confidence(100, 99, 0.01) == 0.99
+
+def test_full_coverage_equals_unsampled(multipage_pdf):
+    sampled = analyze_pdf(multipage_pdf, sample=50)
+    assert sampled["partial"] is False
+    assert sampled["sampling"]["coverage"] == 1.0 and sampled["sampling"]["confidence"] == 1.0
+    assert _unsampled(sampled) == _unsampled(analyze_pdf(multipage_pdf))
+
+def test_escalation_equals_unsampled(multipage_pdf):
+    sampled = sampled_analyze_pdf(multipage_pdf, sample_pages=2, edge_pages=1)
+    assert sampled["sampling"]["escalated"] and not sampled["partial"]
+    assert _unsampled(sampled) == _unsampled(analyze_pdf(multipage_pdf))
+
+def test_partial_sample_reads_only_the_sampled_pages(multipage_pdf):
+    result = sampled_analyze_pdf(multipage_pdf, sample_pages=2, edge_pages=1, escalate_density=100)
+    sampling = result["sampling"]
+    assert result["partial"] and not sampling["escalated"]
+    assert (sampling["pages_analyzed"], sampling["page_count"]) == (4, 12)
+    # Seeded with the document hash, as analyze_pdf does
+    pages = sample_page_indices(12, 2, 1, seed=_sha256(multipage_pdf))
+    assert sorted(set(result["characters"].page)) == [i + 1 for i in pages]
+    assert sampling["confidence"] == detection_confidence(10, 2, sampling["min_fraction"])
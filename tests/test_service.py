@@ -0,0 +1,89 @@
+# tests/test_service.py
+"""
+ScanService admission (503 once every worker and queue slot is taken,
+decided before the upload is read), upload size limits and timeouts.
+"""
+import asyncio
+import os
+
+from core.service import QueueFull, ScanService, _handle
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def _sample():
+    with open(os.path.join(ROOT, "test.pdf"), "rb") as f:
+        return f.read()
+
+def _run(coro):
+    return asyncio.run(asyncio.wait_for(coro, 120))
+
+async def _started(**options):
+    service = ScanService(**options)
+    await service.start()
+    return service
+
+async def _request(port: int, head: bytes) -> bytes:
+    """Send request headers only and return the whole response."""
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    writer.write(head)
+    await writer.drain()
+    response = await reader.read()
+    writer.close()
+    return response
+
+def test_burst_fills_workers_then_queue():
+    async def main():
+        service = await _started(workers=1, queue_size=1)
+        try:
+            data = _sample()
+            outcomes = await asyncio.gather(
+                *(service.scan(f"doc{i}.pdf", data) for i in range(5)), return_exceptions=True,
+            )
+        finally:
+            await service.close()
+        return outcomes, service
+
+    outcomes, service = _run(main())
+    assert [o["status"] for o in outcomes if isinstance(o, dict)] == ["ok", "ok"]
+    assert sum(isinstance(o, QueueFull) for o in outcomes) == 3
+    assert service.stats()["rejected"] == 3 and service.accepted == 0
+
+def test_http_limits_answer_before_the_body():
+    async def main():
+        service = await _started(workers=1, queue_size=0)
+        server = await asyncio.start_server(lambda r, w: _handle(service, 1000, r, w), "127.0.0.1", 0)
+        port = server.sockets[0].getsockname()[1]
+        try:
+            too_big = await _request(port, b"POST /scan HTTP/1.1\r\nContent-Length: 1001\r\n\r\n")
+            service.reserve()  # the only worker is taken
+            busy = await _request(port, b"POST /scan HTTP/1.1\r\nContent-Length: 1000\r\n\r\n")
+            service.release()
+            return too_big, busy, service.accepted
+        finally:
+            server.close()
+            await service.close()
+
+    too_big, busy, accepted = _run(main())
+    assert too_big.startswith(b"HTTP/1.1 413 ")
+    assert busy.startswith(b"HTTP/1.1 503 ") and b"Retry-After: 1\r\n" in busy
+    assert accepted == 0
+
+def test_timeout_replaces_the_worker():
+    async def main():
+        service = await _started(workers=1, timeout=0.001)
+        try:
+            data = _sample()
+            worker = service.pool[0]
+            timed_out = await service.scan("slow.pdf", data)
+            replaced = service.pool[0] is not worker and not worker.process.is_alive()
+            service.timeout = None
+            # The killed job's record must not answer this one
+            after = await service.scan("next.pdf", data)
+        finally:
+            await service.close()
+        return timed_out, replaced, after
+
+    timed_out, replaced, after = _run(main())
+    assert timed_out["status"] == "timeout" and timed_out["path"] == "slow.pdf"
+    assert replaced
+    assert after["status"] == "ok" and after["path"] == "next.pdf"
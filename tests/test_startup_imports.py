@@ -0,0 +1,41 @@
+# tests/test_startup_imports.py
+"""
+Heavy dependencies stay out of `import core.analyzer` and out of the
+--summary-only path (see bench/startup.py), and that lighter path still
+reports what the full analysis does.
+"""
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+from bench.startup import DEFAULT_PDF, heavy_modules, import_profile
+from core.analyzer import analyze_pdf
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def test_import_core_analyzer_loads_no_heavy_dependency():
+    modules = import_profile(["-c", "import core.analyzer"])
+    assert "core.analyzer" in modules
+    assert heavy_modules(modules) == []
+
+def test_summary_only_does_not_load_fonttools():
+    assert os.path.isfile(DEFAULT_PDF)
+    modules = import_profile(["-m", "core.analyzer", DEFAULT_PDF, "--summary-only"])
+    assert "core.analyzer" in modules
+    assert "fontTools" not in heavy_modules(modules)
+
+@pytest.mark.parametrize("backend", ["pdfminer", "pymupdf"])
+def test_summary_only_matches_full_analysis(multipage_pdf, backend):
+    out = subprocess.run(
+        [sys.executable, "-m", "core.analyzer", multipage_pdf, "--summary-only", "--backend", backend],
+        cwd=ROOT, capture_output=True, text=True, check=True,
+    ).stdout
+    summary = json.loads(out[out.index("{"):])
+    result = analyze_pdf(multipage_pdf, backend=backend)
+    expected = json.loads(json.dumps({**result["summary"], "suspicious_count": len(result["suspicious"])}))
+    # The full summary adds the font fields --summary-only skips
+    assert summary == {k: expected[k] for k in summary}
+    assert set(expected) - set(summary) == {"fonts_checked", "fonts_flags"}
@@ -0,0 +1,57 @@
+# tests/test_table_stats.py
+"""
+The fused table_stats() pass must agree with a plain per-character
+reference for every detector it replaces.
+"""
+import os
+from collections import Counter
+
+import pytest
+
+from core.analyzer import extract_char_table, table_stats
+from core.unicode_flags import ARABIC, LATIN, RTL_MARK, SUSPICIOUS, ZERO_WIDTH, classify
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def _reference(records):
+    font_counts, font_characters = Counter(), {}
+    suspicious, zero_width, rtl_marks, present = [], 0, 0, 0
+    for r in records:
+        flags = classify(ord(r["char"]))
+        present |= flags
+        zero_width += bool(flags & ZERO_WIDTH)
+        rtl_marks += bool(flags & RTL_MARK)
+        font_counts[r["fontname"]] += 1
+        chars = font_characters.setdefault(r["fontname"], {})
+        chars[r["char"]] = chars.get(r["char"], 0) + 1
+        if flags & SUSPICIOUS:
+            suspicious.append((r["page"], r["char"], r["fontname"], (r["x0"], r["y0"])))
+    return {
+        "total_chars": len(records),
+        "zero_width_count": zero_width,
+        "rtl_marks_count": rtl_marks,
+        "fonts": dict(font_counts),
+        "mixed_scripts_hint": bool(present & ARABIC) and bool(present & LATIN),
+        "suspicious": suspicious,
+        "font_characters": font_characters,
+    }
+
+@pytest.fixture(params=["test.pdf", "urdu_compare_report.pdf", "multipage"])
+def records(request, multipage_pdf):
+    path = multipage_pdf if request.param == "multipage" else os.path.join(ROOT, request.param)
+    return list(extract_char_table(path))
+
+def test_matches_per_character_reference(records):
+    stats, expected = table_stats(records), _reference(records)
+    summary = stats["summary"]
+    assert summary["total_chars"] == stats["total_chars"] == expected["total_chars"]
+    assert summary["zero_width_count"] == expected["zero_width_count"]
+    assert summary["rtl_marks_count"] == expected["rtl_marks_count"]
+    assert summary["mixed_scripts_hint"] == expected["mixed_scripts_hint"]
+    assert dict(summary["fonts_used_top"]) == dict(Counter(expected["fonts"]).most_common(8))
+    assert stats["font_characters"] == expected["font_characters"]
+    assert stats["suspicious_count"] == len(expected["suspicious"])
+    assert [(s["page"], s["char"], s["fontname"], s["position"]) for s in stats["suspicious"]] == expected["suspicious"]
+
+def test_multipage_fixture_has_marks(multipage_pdf):
+    assert table_stats(extract_char_table(multipage_pdf))["suspicious_count"] > 0
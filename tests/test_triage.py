@@ -0,0 +1,68 @@
+# tests/test_triage.py
+"""
+Triage may only stop early when the risk score is proven to be on one
+side of the threshold; its decision must agree with the full analysis.
+"""
+import os
+
+import pytest
+
+from conftest import pdf_stream, write_pdf
+from core.analyzer import analyze_pdf
+from core.document import PdfDocument
+from core.triage import possible_flags, triage_pdf
+from core.unicode_flags import RTL_MARK, ZERO_WIDTH
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+@pytest.fixture
+def untyped_only_pdf(tmp_path):
+    """'Hello' in a Helvetica dictionary without /Type whose Differences yield U+200B and U+202E."""
+    return write_pdf(str(tmp_path / "untyped_only.pdf"), [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        b"<< /Type /Pages /Kids [3 0 R] /Count 1 >>",
+        b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] /Resources << /Font << /F1 4 0 R >> >>"
+        b" /Contents 5 0 R >>",
+        b"<< /Subtype /Type1 /BaseFont /Helvetica /Encoding << /Differences [101 /uni200B 108 /uni202E] >> >>",
+        pdf_stream(b"BT /F1 24 Tf 72 700 Td (Hello) Tj ET"),
+    ])
+
+def test_untyped_font_encoding_bounds_the_score(untyped_only_pdf):
+    with PdfDocument(untyped_only_pdf) as doc:
+        flags = possible_flags(doc)
+    assert flags is not None
+    assert flags & ZERO_WIDTH and flags & RTL_MARK
+
+def test_inline_font_is_unbounded(untyped_font_pdf):
+    with PdfDocument(untyped_font_pdf) as doc:
+        assert possible_flags(doc) is None
+
+@pytest.mark.parametrize("threshold", [20, 40, 70])
+def test_untyped_font_is_not_skipped(untyped_only_pdf, threshold):
+    score = analyze_pdf(untyped_only_pdf)["risk_score"]["total_score"]
+    result = triage_pdf(untyped_only_pdf, threshold=threshold)
+    assert result["triage"]["decision"] == ("above" if score >= threshold else "below")
+    lower, upper = result["triage"]["score_bounds"]
+    assert lower <= score <= upper
+
+@pytest.mark.parametrize("name", ["test.pdf", "urdu_compare_report.pdf"])
+@pytest.mark.parametrize("threshold", [5, 40, 70])
+def test_decision_agrees_with_full_analysis(name, threshold):
+    path = os.path.join(ROOT, name)
+    score = analyze_pdf(path)["risk_score"]["total_score"]
+    triage = triage_pdf(path, threshold=threshold)["triage"]
+    assert triage["decision"] == ("above" if score >= threshold else "below")
+    lower, upper = triage["score_bounds"]
+    assert lower <= score <= upper
+    assert triage["stage"] != "complete" or triage["pages_analyzed"] == triage["page_count"]
+
+@pytest.mark.parametrize("threshold,stage", [(40, "pages"), (70, "complete"), (95, "fonts")])
+def test_multipage_bounds_and_early_exit(multipage_pdf, threshold, stage):
+    score = analyze_pdf(multipage_pdf)["risk_score"]["total_score"]
+    triage = triage_pdf(multipage_pdf, threshold=threshold)["triage"]
+    assert triage["decision"] == ("above" if score >= threshold else "below")
+    lower, upper = triage["score_bounds"]
+    assert lower <= score <= upper
+    # Marks on the first page settle 40; 95 is out of reach from the fonts alone
+    assert triage["stage"] == stage
+    assert (triage["pages_analyzed"] < triage["page_count"]) == (stage != "complete")
@@ -0,0 +1,51 @@
+# tests/test_warm.py
+"""
+The warm worker keeps requests to its allowed options and serves its
+Unix socket to the owner only.
+"""
+import json
+import os
+import socket
+import stat
+import subprocess
+import sys
+import time
+
+import pytest
+
+import core.analyzer
+from core.warm import WarmWorker, submit
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SAMPLE = os.path.join(ROOT, "test.pdf")
+
+def test_request_options_are_filtered(monkeypatch):
+    seen = {}
+
+    def fake_analyze_pdf(path, **options):
+        seen.update(options)
+        return {"summary": {}}
+
+    monkeypatch.setattr(core.analyzer, "analyze_pdf", fake_analyze_pdf)
+    worker = WarmWorker()
+    request = {"path": SAMPLE, "options": {"backend": "pymupdf", "workers": 64, "cache_dir": "/tmp"}}
+    record = json.loads(worker.handle_line(json.dumps(request)))
+    assert record["status"] == "ok"
+    assert seen["backend"] == "pymupdf"
+    assert "workers" not in seen and "cache_dir" not in seen
+
+@pytest.mark.skipif(not hasattr(socket, "AF_UNIX"), reason="needs Unix sockets")
+def test_socket_is_private(tmp_path):
+    path = str(tmp_path / "warm.sock")
+    server = subprocess.Popen([sys.executable, "-m", "core.warm", "--socket", path], cwd=ROOT,
+                              stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        deadline = time.monotonic() + 60
+        while not os.path.exists(path):
+            assert server.poll() is None and time.monotonic() < deadline
+            time.sleep(0.05)
+        assert stat.S_IMODE(os.stat(path).st_mode) & 0o077 == 0
+        assert submit(path, SAMPLE, timeout=60)["status"] == "ok"
+    finally:
+        server.terminate()
+        server.wait()